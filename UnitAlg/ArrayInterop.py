@@ -0,0 +1,118 @@
+from typing import Any, Optional, Tuple, Type, TypeVar
+import numpy as np
+
+class ArrayInterop():
+	'''
+	Lets numpy take UnitAlg types directly, through the array protocol.
+
+	np.asarray views the type's own buffer (read only for types that cache
+	values derived from it), so lists of them convert without iterating
+	their elements in python. Ufuncs run on the raw buffers and return the
+	UnitAlg type when the result has its shape, while array types keep
+	deferring to their own (reflected) operators, so np.add(a, b) is a + b.
+	'''
+	__slots__ = ()
+
+	#shape of the buffer, -1 for any length:
+	_array_shape:Tuple[int,...] = ()
+	#return read only views from np.asarray, for types caching values derived from their buffer:
+	_array_readonly:bool = False
+	#have ufuncs matching an operator call the operator instead:
+	_ufunc_operators:bool = False
+
+	T = TypeVar('T', bound='ArrayInterop')
+	@classmethod
+	def from_buffer(cls:Type[T], buffer:Any) -> T:
+		'''
+		Wraps a float64 buffer (a numpy array, or anything with the buffer protocol) without copying,
+		so writes through either are seen by both.
+
+		Derived values cached from the buffer (like a Quaternion's matrix) are not
+		updated by writes made to it from outside. The scalar backend always copies.
+		'''
+		array = buffer if isinstance(buffer, np.ndarray) else np.frombuffer(buffer, dtype=np.float64)
+		if array.dtype != np.float64:
+			raise ValueError("from_buffer needs a float64 buffer, got {}".format(array.dtype))
+		view = array.reshape(cls._array_shape)
+		if view.size > 0 and not np.may_share_memory(view, array):
+			raise ValueError("buffer with shape {} and strides {} can't be viewed as {} without copying".format(array.shape, array.strides, cls._array_shape))
+		return cls._from_np(view)
+
+	def _array_buffer(self) -> np.ndarray:
+		return self._value
+
+	def _array_written(self, buffer:np.ndarray) -> None:
+		''' Called after a ufunc wrote into buffer (from _array_buffer) through out= '''
+		pass
+
+	def _array_wrap(self:T, result:np.ndarray) -> Optional[T]:
+		''' Returns result as this type if it has this type's shape '''
+		shape = self._array_shape
+		if result.ndim == len(shape) and all(s == -1 or s == r for s, r in zip(shape, result.shape)):
+			return type(self)._from_np(result)
+		return None
+
+	def __array__(self, dtype:Optional[np.dtype]=None, copy:Optional[bool]=None) -> np.ndarray:
+		buffer = self._array_buffer()
+		if copy:
+			return np.array(buffer, dtype=dtype, copy=True)
+		array = np.asarray(buffer, dtype=dtype)
+		if self._array_readonly and array is buffer:
+			array = array.view()
+			array.flags.writeable = False
+		return array
+
+	def __array_ufunc__(self, ufunc:np.ufunc, method:str, *inputs:Any, **kwargs:Any) -> Any:
+		if method == '__call__' and not kwargs and ufunc in _operators and any(getattr(x, '_ufunc_operators', False) for x in inputs):
+			result = _call_operator(_operators[ufunc], inputs)
+			if result is not NotImplemented:
+				return result
+
+		raw_inputs = tuple(x._array_buffer() if isinstance(x, ArrayInterop) else x for x in inputs)
+		outs = kwargs.get('out')
+		if outs is not None:
+			kwargs['out'] = tuple(o._array_buffer() if isinstance(o, ArrayInterop) else o for o in outs)
+		result = getattr(ufunc, method)(*raw_inputs, **kwargs)
+
+		if outs is not None:
+			for o, buffer in zip(outs, kwargs['out']):
+				if isinstance(o, ArrayInterop):
+					o._array_written(buffer)
+			results = tuple(o if isinstance(o, ArrayInterop) else r for o, r in zip(outs, result if isinstance(result, tuple) else (result,)))
+			return results if isinstance(result, tuple) else results[0]
+
+		candidates = [x for x in inputs if isinstance(x, ArrayInterop)]
+		def wrap(r:Any) -> Any:
+			if isinstance(r, np.ndarray) and r.dtype == np.float64:
+				for c in candidates:
+					wrapped = c._array_wrap(r)
+					if wrapped is not None:
+						return wrapped
+			return r
+		if isinstance(result, tuple):
+			return tuple(wrap(r) for r in result)
+		return wrap(result)
+
+#the operator each ufunc matches, and its reflection:
+_operators = {
+	np.add:('__add__', '__radd__'),
+	np.subtract:('__sub__', '__rsub__'),
+	np.multiply:('__mul__', '__rmul__'),
+	np.true_divide:('__truediv__', '__rtruediv__'),
+	np.matmul:('__matmul__', '__rmatmul__'),
+	np.negative:('__neg__', None),
+}
+
+def _call_operator(names:Tuple[str,Optional[str]], inputs:Tuple[Any,...]) -> Any:
+	''' Does what python does for a binary (or unary) operator on inputs '''
+	forward, reflected = names
+	if len(inputs) == 1:
+		return getattr(inputs[0], forward)() if hasattr(inputs[0], forward) else NotImplemented
+	a, b = inputs
+	if isinstance(a, ArrayInterop) and hasattr(a, forward):
+		result = getattr(a, forward)(b)
+		if result is not NotImplemented:
+			return result
+	if isinstance(b, ArrayInterop) and type(b) is not type(a) and hasattr(b, reflected):
+		return getattr(b, reflected)(a)
+	return NotImplemented
@@ -0,0 +1,38 @@
+from enum import Enum
+from typing import Dict, Type
+
+class Backend(Enum):
+	'''How new Vector3's and Quaternion's store their components.'''
+	numpy=0
+	scalar=1
+	@staticmethod
+	def set(backend: 'Backend', cls: Type=None) -> None:
+		'''
+		Sets the backend for all BaseVectors, or only for cls (and its subclasses).
+		
+		Per type settings take precedence over the global one.
+		'''
+		from .BaseVector import BaseVector
+		#the scalar types register themselves in scalar_types when imported, which UnitAlg does lazily:
+		from . import ScalarVector3, ScalarQuaternion
+		(BaseVector if cls is None else cls).backend = backend
+		
+		#types only pay for a python level __new__ once they have been switched:
+		for vector_type in scalar_types:
+			if vector_type.backend is Backend.scalar:
+				vector_type.__new__ = staticmethod(_backend_new)
+			elif '__new__' in vector_type.__dict__:
+				#deleting __new__ would leave cpython calling object.__new__ with our init args
+				vector_type.__new__ = staticmethod(_numpy_new)
+
+scalar_types:Dict[Type,Type] = {}
+'''Maps each numpy backed type to its scalar backed subclass.'''
+
+def _numpy_new(cls, *args, **kwargs):
+	return object.__new__(cls)
+
+def _backend_new(cls, *args, **kwargs):
+	scalar_type = scalar_types.get(cls)
+	if scalar_type is not None and cls.backend is Backend.scalar:
+		cls = scalar_type
+	return object.__new__(cls)
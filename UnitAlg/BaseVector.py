@@ -1,7 +1,7 @@
 from UnitAlg.CoordinateFrame import *
-from numpy.core.numeric import isclose
-from UnitAlg.Convertable import Convertable
-from numpy.lib.arraysetops import isin
+from UnitAlg.Backend import Backend
+from UnitAlg.Convertable import Convertable, ConversionTable
+from UnitAlg.ArrayInterop import ArrayInterop
 from UnitAlg.helpers.classproperty import all_true
 from UnitAlg.helpers import *
 from typing import Any, Iterator, Tuple, Type, Union, List, TypeVar, overload
@@ -9,11 +9,15 @@ import numpy as np
 import math
 
 T=TypeVar('T')
-class BaseVector(Convertable):
-	to_conversions = {}
-	from_conversions = {}
+class BaseVector(Convertable, ArrayInterop):
+	__slots__ = ('_value',)
+	to_conversions = ConversionTable()
+	from_conversions = ConversionTable()
+	bulk_from_conversions = ConversionTable()
 	
 	coordinate_frame = CoordinateFrame.Normal_Math
+	backend = Backend.numpy
+	_is_scalar = False
 	
 	rtol=1e-12
 	atol=1e-11
@@ -21,10 +25,10 @@ class BaseVector(Convertable):
 	T = TypeVar('T', bound='BaseVector')
 	@classmethod
 	def from_other(cls:Type[T], obj:Any) -> T:
-		return cls.from_conversions[type(obj)](obj)
+		return cls._from(obj)
 	
 	def to_other(self, new_type:Type[T]) -> T:
-		return self.to_conversions[new_type](new_type)
+		return self.to(new_type)
 	
 	#----Main Properties----
 	@property
@@ -62,10 +66,40 @@ class BaseVector(Convertable):
 		newArr._value = value
 		return newArr
 	
+	@classmethod
+	def _from_components(cls:Type[T], values:Tuple[float,...]) -> T:
+		''' Creates a vector of the current backend from a tuple of floats '''
+		newVec = cls.__new__(cls)
+		newVec._set_components(values)
+		return newVec
+	
+	def _components(self) -> List[float]:
+		''' Returns the components as python floats '''
+		return self._value.tolist()
+	
+	def _set_components(self, values:Tuple[float,...]) -> None:
+		self._value = np.array(values, dtype=np.float64)
+	
+	def _assign(self, values:Tuple[float,...]) -> None:
+		''' Writes values into this vector, keeping its buffer '''
+		self._value[:] = values
+
+	def _array_written(self, buffer:np.ndarray) -> None:
+		#(the scalar backend's buffer is a copy, and quaternions drop their cache)
+		self._assign(tuple(buffer.tolist()))
+	
 	#----Functions----
 	@classproperty
 	def frame() -> DirectionMap:
 		return frame_directions[BaseVector.coordinate_frame]
+	
+	@staticmethod
+	def _frame_constants() -> FrameConstants:
+		''' Returns the cached constants of the current coordinate frame '''
+		constants = FrameConstants.current
+		if constants.frame is not BaseVector.coordinate_frame:
+			constants = FrameConstants.rebuild(BaseVector.coordinate_frame)
+		return constants
 		
 	@property
 	def sq_magnitude(self) -> float:
@@ -75,15 +109,20 @@ class BaseVector(Convertable):
 	@property
 	def magnitude(self) -> float:
 		''' Returns the length of this vector '''
-		return np.linalg.norm(self.value)
+		return math.sqrt(self.sq_magnitude)
 
-	def normalize(self) -> None:
+	def normalize(self:T, out:T=None) -> T:
 		'''
 		Makes this vector have a magnitude of 1 with same direction as before
-		Note: this function will change the current vector.  Use normalized if change is undesired
+		Note: this function will change the current vector (or out when given).  Use normalized if change is undesired
 		'''
-		self.value = self.value / self.magnitude
 		#TODO: handle 0 magnitude through a abstract method in both normalize functions
+		target = self if out is None else out
+		if target._is_scalar:
+			target._assign(self.normalized._components())
+		else:
+			np.divide(self._value, self.magnitude, out=target._value)
+		return target
 	
 	@staticmethod
 	def sq_distance(v1:T, v2:T) -> float:
@@ -101,12 +140,12 @@ class BaseVector(Convertable):
 		Returns the unit vector for current vector
 		Note: this function does NOT affect the current vector.  Use normalize function if change is desired.
 		'''
-		return type(self)(self._value / self.magnitude)
+		return type(self)._from_np(self._value / self.magnitude)
 	
 	def __eq__(self:T,other:T) -> bool:
 		return all(np.isclose(self._value, other._value, rtol=self.rtol, atol=self.atol))
 	def __ne__(self:T,other:T) -> bool:
-		return any(not np.isclose(v1,v2, rtol=self.rtol, atol=self.atol) for v1,v2 in zip(self._value, other._value))
+		return not self == other
 		
 	def __getitem__(self, index:int)->float:
 		return self._value[index]
@@ -119,4 +158,8 @@ class BaseVector(Convertable):
 		return len(self._value)
 	
 	def __hash__(self) -> int:
+		'''
+		Hashes the exact values, so vectors that are == within tolerance can
+		hash differently. De-duplicate with Vector3Array.weld instead of a set.
+		'''
 		return hash(tuple(self._value))
\ No newline at end of file
@@ -0,0 +1,174 @@
+from UnitAlg.BaseVector import BaseVector
+from UnitAlg.ArrayInterop import ArrayInterop
+from UnitAlg.helpers import *
+from typing import Any, Iterator, List, Sequence, Type, TypeVar, Union, overload
+import numpy as np
+
+class BaseVectorArray(ArrayInterop):
+	'''
+	A batch of BaseVectors stored as one contiguous (N,width) float64 buffer.
+
+	Int indexing returns a (copied) element, indexing with a slice
+	or mask returns an array of the same type.
+	'''
+	element_type:Type[BaseVector] = BaseVector
+	width:int = 0
+
+	rtol=BaseVector.rtol
+	atol=BaseVector.atol
+
+	#ndarray + Vector3Array still uses our reflected operators:
+	_ufunc_operators = True
+
+	T = TypeVar('T', bound='BaseVectorArray')
+	@overload
+	def __init__(self, arr:Union[np.ndarray, List[List[Union[float,int]]]]) -> None: ...
+	@overload
+	def __init__(self, vectors:Sequence[BaseVector]) -> None: ...
+
+	def __init__(self, values) -> None:
+		if isinstance(values, BaseVectorArray):
+			self.value = values._value
+		elif isinstance(values, np.ndarray):
+			self.value = values
+		elif isinstance(values, (list, tuple)):
+			if len(values) > 0 and isinstance(values[0], BaseVector):
+				arr = np.empty((len(values), self.width), dtype=np.float64)
+				for i, v in enumerate(values):
+					arr[i] = v._value
+				self._value = arr
+			elif len(values) > 0 and not isinstance(values[0], (list, tuple, np.ndarray, int, float)):
+				self._value = type(self).from_other(values)._value
+			else:
+				self.value = values
+		else:
+			raise ValueError("init can only take a (N,{0}) numpy array, a list of {0} element lists, or a list of {1}'s, not {2}".format(self.width, self.element_type.__name__, type(values)))
+
+	#----Main Properties----
+	@property
+	def value(self) -> np.ndarray:
+		return np.array(self._value)
+	@value.setter
+	def value(self, value:Union[np.ndarray, List[List[float]]]) -> None:
+		arr = np.array(value, dtype=np.float64, order='C')
+		if arr.ndim == 1 and arr.shape[0] == 0:
+			arr = arr.reshape((0,self.width))
+		if arr.ndim != 2 or arr.shape[1] != self.width:
+			raise ValueError("invalid array shape {}, expected shape (N,{})".format(arr.shape, self.width))
+		self._value = arr
+
+	@property
+	def x(self) -> np.ndarray:
+		''' View of the x column '''
+		return self._value[:,0]
+	@x.setter
+	def x(self, x:Union[np.ndarray,float]) -> None:
+		self._value[:,0] = x
+
+	@property
+	def y(self) -> np.ndarray:
+		''' View of the y column '''
+		return self._value[:,1]
+	@y.setter
+	def y(self, y:Union[np.ndarray,float]) -> None:
+		self._value[:,1] = y
+
+	@property
+	def z(self) -> np.ndarray:
+		''' View of the z column '''
+		return self._value[:,2]
+	@z.setter
+	def z(self, z:Union[np.ndarray,float]) -> None:
+		self._value[:,2] = z
+
+	#----Casting----
+	@classmethod
+	def _from_np(cls:Type[T], value:np.ndarray) -> T:
+		newArr = cls.__new__(cls)
+		newArr._value = value
+		return newArr
+
+	@classmethod
+	def from_other(cls:Type[T], objects:Sequence[Any]) -> T:
+		'''
+		Converts a sequence of other types' objects (all of one type) in one call,
+		with element_type's bulk conversion for their type if it has one, or
+		else its from conversion for each object.
+		'''
+		if len(objects) == 0:
+			return cls._from_np(np.empty((0,cls.width), dtype=np.float64))
+		t = type(objects[0])
+		bulk = cls.element_type.bulk_from_conversions.lookup(t)
+		if bulk is not None:
+			arr = np.asarray(bulk(objects), dtype=np.float64)
+			if arr.shape != (len(objects), cls.width):
+				raise ValueError("bulk conversion of {} returned shape {}, expected ({},{})".format(t.__name__, arr.shape, len(objects), cls.width))
+			return cls._from_np(arr)
+		conversion = cls.element_type.from_conversions.lookup(t)
+		if conversion is None:
+			raise KeyError("Invalid type passed or you need to supply a from conversion function for this type!", t)
+		arr = np.empty((len(objects), cls.width), dtype=np.float64)
+		for i, o in enumerate(objects):
+			arr[i] = conversion(o)._value
+		return cls._from_np(arr)
+
+	def to_list(self) -> List[BaseVector]:
+		return [self.element_type._from_np(v) for v in np.array(self._value)]
+
+	#----Functions----
+	@property
+	def sq_magnitude(self) -> np.ndarray:
+		''' Returns squared length of each vector '''
+		return np.einsum('ij,ij->i', self._value, self._value)
+
+	@property
+	def magnitude(self) -> np.ndarray:
+		''' Returns the length of each vector '''
+		return np.sqrt(self.sq_magnitude)
+
+	def normalize(self) -> None:
+		'''
+		Makes every vector have a magnitude of 1 with same direction as before
+		Note: this function will change the current vectors.  Use normalized if change is undesired
+		'''
+		self._value /= self.magnitude[:,None]
+
+	@property
+	def normalized(self:T) -> T:
+		'''
+		Returns the unit vectors for the current vectors
+		Note: this function does NOT affect the current vectors.  Use normalize function if change is desired.
+		'''
+		return type(self)._from_np(self._value / self.magnitude[:,None])
+
+	def isclose(self, other:Union['BaseVectorArray',BaseVector]) -> np.ndarray:
+		''' Returns a (N,) mask of which vectors are equal to other '''
+		return np.all(np.isclose(self._value, other._value, rtol=self.rtol, atol=self.atol), axis=-1)
+
+	#----Operators----
+	def __eq__(self, other:'BaseVectorArray') -> bool:
+		if not isinstance(other, BaseVectorArray):
+			return NotImplemented
+		return self._value.shape == other._value.shape and bool(np.all(self.isclose(other)))
+	def __ne__(self, other:'BaseVectorArray') -> bool:
+		return not self == other
+
+	def __getitem__(self, index:Union[int,slice,np.ndarray,List[int]]):
+		if isinstance(index, (int, np.integer)):
+			return self.element_type._from_np(np.array(self._value[index]))
+		return type(self)._from_np(self._value[index])
+	def __setitem__(self, index:Union[int,slice,np.ndarray], value:Union[BaseVector,'BaseVectorArray',np.ndarray]) -> None:
+		if isinstance(value, (BaseVector, BaseVectorArray)):
+			value = value._value
+		self._value[index] = value
+
+	def __iter__(self) -> Iterator[BaseVector]:
+		for i in range(len(self._value)):
+			yield self[i]
+	def __len__(self) -> int:
+		return len(self._value)
+
+	def __str__(self) -> str:
+		return '{}({})'.format(type(self).__name__, self._value.tolist())
+	def __repr__(self) -> str:
+		return self.__str__()
@@ -1,23 +1,86 @@
-from typing import Any, Type, TypeVar
+from typing import Any, Callable, Dict, Optional, Sequence, Type, TypeVar
+from operator import attrgetter
+from itertools import chain
+import numpy as np
+
+class ConversionTable(dict):
+	'''
+	A dict of type -> conversion function, that also finds the function
+	registered for the closest base class of a type (through its mro).
+
+	Lookups are cached per type, and the cache is dropped whenever the table changes.
+	'''
+	def __init__(self, *args, **kwargs) -> None:
+		super().__init__(*args, **kwargs)
+		self._cache:Dict[type, Optional[Callable]] = {}
+
+	def lookup(self, t:type) -> Optional[Callable]:
+		''' Returns the conversion for t or its closest base class, or None '''
+		try:
+			return self._cache[t]
+		except KeyError:
+			pass
+		conversion = None
+		for base in t.__mro__:
+			if base in self:
+				conversion = dict.__getitem__(self, base)
+				break
+		self._cache[t] = conversion
+		return conversion
+
+	def __setitem__(self, key:type, value:Callable) -> None:
+		super().__setitem__(key, value)
+		self._cache.clear()
+	def __delitem__(self, key:type) -> None:
+		super().__delitem__(key)
+		self._cache.clear()
+	def update(self, *args, **kwargs) -> None:
+		super().update(*args, **kwargs)
+		self._cache.clear()
+	def setdefault(self, key:type, default:Callable=None) -> Callable:
+		self._cache.clear()
+		return super().setdefault(key, default)
+	def pop(self, key:type, *default) -> Callable:
+		self._cache.clear()
+		return super().pop(key, *default)
+	def popitem(self) -> Any:
+		self._cache.clear()
+		return super().popitem()
+	def clear(self) -> None:
+		super().clear()
+		self._cache.clear()
 
 class Convertable():
-	to_conversions = {}
-	from_conversions = {}
-	
+	__slots__ = ()
+	to_conversions = ConversionTable()
+	from_conversions = ConversionTable()
+	#type -> function of a sequence of that type to a (N,width) array, see bulk_attributes:
+	bulk_from_conversions = ConversionTable()
+
 	T = TypeVar("T", bound='Convertable')
 	@classmethod
 	def _from(cls:Type[T], original:Any) -> T:
-		try:
-			conversion = cls.from_conversions[type(original)]
-			return conversion(original)
-		except:
+		conversion = cls.from_conversions.lookup(type(original))
+		if conversion is None:
 			raise KeyError("Invalid type passed or you need to supply a from conversion function for this type!", type(original))
-	
+		return conversion(original)
+
 	K = TypeVar("K")
 	def to(self, other:Type[K]) -> K:
-		try:
-			conversion = self.to_conversions[other]
-			return conversion(self)
-		except:
+		conversion = self.to_conversions.get(other)
+		if conversion is None:
 			raise KeyError("You need to supply a conversion function for this type!", other)
-			
\ No newline at end of file
+		return conversion(self)
+
+def bulk_attributes(*names:str) -> Callable[[Sequence[Any]],np.ndarray]:
+	'''
+	Returns a bulk conversion reading the named attributes (dotted names
+	reach into nested ones) of every object into one (N,len(names)) array.
+
+	eg: Vector3.bulk_from_conversions[PointMsg] = bulk_attributes('x', 'y', 'z')
+	'''
+	get = attrgetter(*names)
+	def convert(objects:Sequence[Any]) -> np.ndarray:
+		values = map(get, objects) if len(names) == 1 else chain.from_iterable(map(get, objects))
+		return np.fromiter(values, dtype=np.float64, count=len(objects)*len(names)).reshape((len(objects), len(names)))
+	return convert
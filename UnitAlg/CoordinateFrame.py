@@ -1,6 +1,7 @@
 from enum import Enum
-from typing import Dict, Tuple, Union
+from typing import Any, Dict, Tuple, Union
 import numpy as np
+import math
 
 Number = Union[float,int]
 TupleVec3 = Tuple[Number,Number,Number]
@@ -16,6 +17,12 @@ class CoordinateFrame(Enum):
 		'''Sets the coordinate frame for all BaseVectors'''
 		from .BaseVector import BaseVector
 		BaseVector.coordinate_frame = frame
+		FrameConstants.rebuild(frame)
+	
+	@staticmethod
+	def conversion(frame1:'CoordinateFrame', frame2:'CoordinateFrame') -> 'FrameConversion':
+		'''Returns the precomputed conversion from frame1's coordinates to frame2's'''
+		return frame_conversions[(frame1, frame2)]
 
 class Directions(Enum):
 	left=1
@@ -76,4 +83,103 @@ frame_directions = {
 		Directions.forward:(0,0,1),
 		Directions.up:(0,-1,0),
 	})
-}
\ No newline at end of file
+}
+
+class FrameConstants():
+	'''
+	The constant vectors (directions, zero, one and infinities) of one
+	coordinate frame, as float tuples and read only numpy arrays.
+	
+	Vector3's constants copy these rather than building and validating
+	a new vector on every access. CoordinateFrame.set rebuilds current.
+	'''
+	current:'FrameConstants' = None
+	
+	def __init__(self, frame:CoordinateFrame) -> None:
+		self.frame = frame
+		directions = frame_directions[frame]
+		self.tuples:Dict[str, Tuple[float,float,float]] = {
+			direction.name:tuple(float(v) for v in directions[direction]) for direction in Directions
+		}
+		#(column, sign) of each direction, for reading them out of rotation matrices:
+		self.axes:Dict[str, Tuple[int,float]] = {}
+		for name, values in self.tuples.items():
+			column = int(np.argmax(np.abs(values)))
+			self.axes[name] = (column, values[column])
+		
+		self.tuples['zero'] = (0.0, 0.0, 0.0)
+		self.tuples['one'] = (1.0, 1.0, 1.0)
+		self.tuples['positive_infinity'] = (math.inf, math.inf, math.inf)
+		self.tuples['negative_infinity'] = (-math.inf, -math.inf, -math.inf)
+		
+		self.arrays:Dict[str, np.ndarray] = {}
+		for name, values in self.tuples.items():
+			arr = np.array(values, dtype=np.float64)
+			arr.flags.writeable = False
+			self.arrays[name] = arr
+	
+	@staticmethod
+	def rebuild(frame:CoordinateFrame) -> 'FrameConstants':
+		FrameConstants.current = FrameConstants(frame)
+		return FrameConstants.current
+
+FrameConstants.rebuild(CoordinateFrame.Normal_Math)
+
+class FrameConversion():
+	'''
+	The change of coordinates between two frames. Frames only differ by
+	a signed permutation of their axes, so converting is done by indexing
+	and sign flips rather than matrix products:
+	
+		converted[...,i] = signs[i] * values[...,permutation[i]]
+	
+	Methods take numpy arrays, or UnitAlg arrays (returning the same type).
+	'''
+	def __init__(self, frame1:CoordinateFrame, frame2:CoordinateFrame) -> None:
+		self.frame1 = frame1
+		self.frame2 = frame2
+		#coordinates in frame1 -> world -> coordinates in frame2:
+		self.matrix = frame_directions[frame2].rotation_matrix() @ frame_directions[frame1].rotation_matrix().T
+		self.matrix.flags.writeable = False
+		self.permutation = np.argmax(np.abs(self.matrix), axis=1)
+		self.signs = self.matrix[np.arange(3), self.permutation]
+		self.determinant = float(round(np.linalg.det(self.matrix)))
+		
+		self._permutation4 = np.append(self.permutation, 3)
+		self._signs4 = np.append(self.signs, 1.0)
+		#q's vector part is a pseudovector, so also flips with a handedness change:
+		self._quaternion_signs = np.append(self.signs*self.determinant, 1.0)
+		self._pose_signs = self._signs4[:,None] * self._signs4[None,:]
+	
+	@property
+	def mat(self) -> np.ndarray:
+		'''The 4x4 conversion matrix'''
+		m = np.identity(4)
+		m[0:3,0:3] = self.matrix
+		return m
+	
+	def points(self, points:Any) -> Any:
+		'''Converts (...,3) points or directions'''
+		return _convert(points, lambda p: p[...,self.permutation] * self.signs)
+	
+	def quaternions(self, quaternions:Any) -> Any:
+		'''Converts (...,4) x,y,z,w quaternions'''
+		return _convert(quaternions, lambda q: q[...,self._permutation4] * self._quaternion_signs)
+	
+	def poses(self, poses:Any) -> Any:
+		'''Converts (...,4,4) matrices, ie: C*pose*C^-1'''
+		p = self._permutation4
+		return _convert(poses, lambda m: m[...,p[:,None],p[None,:]] * self._pose_signs)
+
+def _convert(values:Any, convert) -> Any:
+	if isinstance(values, np.ndarray):
+		return convert(values)
+	if hasattr(values, '_mat'):
+		return type(values)._from_np(convert(values._mat))
+	if hasattr(values, '_value'):
+		return type(values)._from_np(convert(values._value))
+	return convert(np.asarray(values, dtype=np.float64))
+
+frame_conversions:Dict[Tuple[CoordinateFrame,CoordinateFrame], FrameConversion] = {
+	(frame1, frame2):FrameConversion(frame1, frame2) for frame1 in CoordinateFrame for frame2 in CoordinateFrame
+}
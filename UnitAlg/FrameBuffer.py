@@ -0,0 +1,191 @@
+from UnitAlg.QuaternionArray import QuaternionArray
+from UnitAlg.TransformArray import TransformArray
+from typing import Dict, Hashable, List, Tuple, overload
+import numpy as np
+
+from UnitAlg import Transform, TransformKind
+
+class _Edge():
+	'''
+	Time stamped poses of a child frame in its parent frame, kept in a
+	ring buffer that is written twice (at i and i+capacity) so the
+	samples in it are always one contiguous, time sorted slice.
+	'''
+	def __init__(self, parent:Hashable, capacity:int) -> None:
+		self.parent = parent
+		self.capacity = capacity
+		self.static = False
+		self.times = np.empty(2*capacity, dtype=np.float64)
+		self.translations = np.empty((2*capacity,3), dtype=np.float64)
+		self.rotations = np.empty((2*capacity,4), dtype=np.float64)
+		self.head = 0
+		self.count = 0
+
+	def insert(self, times:np.ndarray, translations:np.ndarray, rotations:np.ndarray) -> None:
+		if len(times) == 0:
+			return
+		if np.any(np.diff(times) < 0) or (self.count > 0 and times[0] < self.times[self.head-1+self.capacity]):
+			raise ValueError("samples must be added in time order")
+		#only the newest capacity samples would survive:
+		times, translations, rotations = times[-self.capacity:], translations[-self.capacity:], rotations[-self.capacity:]
+		slots = (self.head + np.arange(len(times))) % self.capacity
+		for offset in (0, self.capacity):
+			self.times[slots+offset] = times
+			self.translations[slots+offset] = translations
+			self.rotations[slots+offset] = rotations
+		self.head = int(slots[-1]+1) % self.capacity
+		self.count = min(self.count + len(times), self.capacity)
+
+	def window(self) -> slice:
+		start = (self.head - self.count) % self.capacity
+		return slice(start, start+self.count)
+
+	def sample(self, times:np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+		''' Returns the (M,3) translations and (M,4) rotations interpolated at times '''
+		window = self.window()
+		if self.static:
+			return self.translations[window][[0]*len(times)], self.rotations[window][[0]*len(times)]
+		stamps = self.times[window]
+		if self.count == 0 or np.any(times < stamps[0]) or np.any(times > stamps[-1]):
+			raise ValueError("lookup would extrapolate, edge to {} only has samples in [{}, {}]".format(
+				self.parent, stamps[0] if self.count else None, stamps[-1] if self.count else None))
+		if self.count == 1:
+			return self.translations[window][[0]*len(times)], self.rotations[window][[0]*len(times)]
+
+		i1 = np.clip(np.searchsorted(stamps, times, side='right'), 1, self.count-1)
+		i0 = i1-1
+		span = stamps[i1] - stamps[i0]
+		factor = np.divide(times - stamps[i0], span, out=np.zeros_like(times), where=span > 0)
+		translations = self.translations[window]
+		rotations = self.rotations[window]
+		t0 = translations[i0]
+		return t0 + (translations[i1] - t0)*factor[:,None], QuaternionArray.slerp(
+			QuaternionArray._from_np(rotations[i0]), QuaternionArray._from_np(rotations[i1]), factor)._value
+
+class FrameBuffer():
+	'''
+	A tree of named coordinate frames, storing each frame's time stamped
+	pose relative to its parent, tf style.
+
+	lookup(target, source, times) returns the transforms that take
+	points in source coordinates to target coordinates at each time,
+	interpolating every edge between its bracketing samples (translation
+	lerp, rotation slerp). Paths between frame pairs are found once and
+	cached until the tree changes.
+	'''
+	def __init__(self, capacity:int=1000) -> None:
+		self.capacity = capacity
+		self._edges:Dict[Hashable,_Edge] = {}
+		self._paths:Dict[Tuple[Hashable,Hashable], Tuple[List[_Edge], List[_Edge]]] = {}
+
+	#----Functions----
+	@overload
+	def set(self, parent:Hashable, child:Hashable, time:float, transform:Transform) -> None: ...
+	@overload
+	def set(self, parent:Hashable, child:Hashable, time:np.ndarray, transform:TransformArray) -> None: ...
+	def set(self, parent, child, time, transform) -> None:
+		'''
+		Records child's pose in parent's frame (rigid, scale is dropped) at time,
+		or one pose per time when given arrays of times and a TransformArray.
+		Samples of an edge must arrive in time order.
+		'''
+		edge = self._edge(parent, child)
+		if edge.static:
+			raise ValueError("{} -> {} is static".format(parent, child))
+		times = np.atleast_1d(np.asarray(time, dtype=np.float64))
+		if isinstance(transform, Transform):
+			transform = TransformArray._from_np(transform._mat[None])
+		edge.insert(times, transform.translation._value, transform.rotation._value)
+
+	def set_static(self, parent:Hashable, child:Hashable, transform:Transform) -> None:
+		''' Records child's pose in parent's frame, for all time. '''
+		edge = self._edge(parent, child)
+		edge.static = True
+		edge.count = 0
+		edge.insert(np.zeros(1), transform.translation._value[None], transform.rotation._value[None])
+
+	def _edge(self, parent:Hashable, child:Hashable) -> _Edge:
+		edge = self._edges.get(child)
+		if edge is None or edge.parent != parent:
+			p = parent
+			while p is not None:
+				if p == child:
+					raise ValueError("{} can not be a child of its own descendant {}".format(child, parent))
+				p = self._edges[p].parent if p in self._edges else None
+			edge = _Edge(parent, self.capacity)
+			self._edges[child] = edge
+			self._paths.clear()
+		return edge
+
+	def _path(self, target:Hashable, source:Hashable) -> Tuple[List[_Edge], List[_Edge]]:
+		'''
+		Returns the edges from the common ancestor down to target and down to source.
+		'''
+		path = self._paths.get((target, source))
+		if path is None:
+			def ancestors(frame:Hashable) -> List[Hashable]:
+				frames = [frame]
+				while frames[-1] in self._edges:
+					frames.append(self._edges[frames[-1]].parent)
+				return frames
+			up_target = ancestors(target)
+			up_source = ancestors(source)
+			common = set(up_target)
+			for i, frame in enumerate(up_source):
+				if frame in common:
+					break
+			else:
+				raise ValueError("{} and {} are not connected".format(target, source))
+			j = up_target.index(frame)
+			path = (
+				[self._edges[f] for f in reversed(up_target[:j])],
+				[self._edges[f] for f in reversed(up_source[:i])])
+			self._paths[(target, source)] = path
+		return path
+
+	@overload
+	def lookup(self, target:Hashable, source:Hashable, time:float) -> Transform: ...
+	@overload
+	def lookup(self, target:Hashable, source:Hashable, time:np.ndarray) -> TransformArray: ...
+	def lookup(self, target, source, time):
+		'''
+		Returns the transform(s) from source coordinates to target coordinates at time(s).
+		'''
+		times = np.atleast_1d(np.asarray(time, dtype=np.float64))
+		to_target, to_source = self._path(target, source)
+		common_target, common_source = _compose((to_target, to_source), times)
+		#inverse(common->target) * (common->source), both rigid:
+		rotation = np.swapaxes(common_target[:,0:3,0:3], 1, 2)
+		result = np.array(common_source)
+		result[:,0:3,:] = rotation @ common_source[:,0:3,:]
+		result[:,0:3,3] -= (rotation @ common_target[:,0:3,3,None])[:,:,0]
+		if np.ndim(time) == 0:
+			return Transform._from_np(result[0], TransformKind.rigid)
+		return TransformArray._from_np(result)
+
+def _compose(paths:Tuple[List[_Edge],...], times:np.ndarray) -> List[np.ndarray]:
+	'''
+	Chains each path's edges (parent to child order) at each time into (M,4,4)
+	matrices, building every edge's matrices in one batch.
+	'''
+	edges = [edge for path in paths for edge in path]
+	if edges:
+		samples = [edge.sample(times) for edge in edges]
+		mats = TransformArray.TR(
+			np.concatenate([t for t, q in samples]),
+			QuaternionArray._from_np(np.concatenate([q for t, q in samples])))._mat.reshape(len(edges), len(times), 4, 4)
+	results = []
+	start = 0
+	for path in paths:
+		if len(path) == 0:
+			results.append(np.broadcast_to(_identity, (len(times),4,4)))
+			continue
+		result = mats[start]
+		for i in range(start+1, start+len(path)):
+			result = result @ mats[i]
+		results.append(result)
+		start += len(path)
+	return results
+
+#shared, never written to:
+_identity = np.identity(4)
@@ -1,28 +1,9 @@
-from typing import List, Union, overload, Tuple
-from UnitAlg import Vector3, Quaternion, Ray
-from multipledispatch import dispatch
+from typing import List, Optional, Union, overload, Tuple
+from UnitAlg import Vector3, Vector3Array, Ray
 import numpy as np
+import math
 
 class Plane():
-	@dispatch(Vector3,Vector3)
-	def __dispatch_init__(self, position:Vector3, normal:Vector3) -> None:
-		self.position = position
-		self.normal = normal
-	@dispatch(Vector3,Vector3,Vector3)
-	def __dispatch_init__(self, p1:Vector3, p2:Vector3, p3:Vector3) -> None:
-		self.position = p1
-		self.normal = Vector3.cross((p2-p1).normalized, (p3-p1).normalized)
-	@dispatch((float,int), (float,int), (float,int))
-	def __dispatch_init__(self, x_coefficient:Union[float,int], y_coefficient:Union[float,int], z_offset:Union[float,int]) -> None:
-		'''#using ax + by + c = z method:'''
-		self._a = x_coefficient
-		self._b = y_coefficient
-		self._c = z_offset
-		p1 = Vector3([0,0,z_offset])
-		p2 = Vector3([100,0, x_coefficient*100 + z_offset])
-		p3 = Vector3([0, 100, y_coefficient*100 + z_offset])
-		self.__dispatch_init__(p1, p2, p3)
-	
 	@overload
 	def __init__(self, position:Vector3, normal:Vector3) -> None:
 		'''
@@ -52,16 +33,72 @@ class Plane():
 		'''
 		...
 	def __init__(self, *args) -> None:
-		self._a:float = None
-		self._b:float = None
-		self._c:float = None
-		if len(args)==1 and isinstance(args[0], list):
-			points = args[0]
-			coefficients = Plane.fit_coefficients(points)
-			self.__init__(*coefficients)
+		if len(args) == 2:
+			self._set(args[0], args[1])
+		elif len(args) == 3 and isinstance(args[0], Vector3):
+			self._set_points(*args)
+		elif len(args) == 3:
+			self._set_coefficients(*args)
+		elif len(args) == 1 and isinstance(args[0], list):
+			self._set_coefficients(*Plane.fit_coefficients(args[0]))
 		else:
-			self.__dispatch_init__(*args)
-	
+			raise ValueError("Plane takes (position, normal), (p1, p2, p3), (a, b, c) or a list of points")
+
+	def _set(self, position:Vector3, normal:Vector3, a:float=None, b:float=None, c:float=None) -> None:
+		self._position = position
+		self._normal = normal
+		self._a:float = a
+		self._b:float = b
+		self._c:float = c
+
+	def _set_points(self, p1:Vector3, p2:Vector3, p3:Vector3) -> None:
+		x, y, z = p1._components()
+		ux, uy, uz = p2._components()
+		vx, vy, vz = p3._components()
+		ux, uy, uz = ux-x, uy-y, uz-z
+		vx, vy, vz = vx-x, vy-y, vz-z
+		#the cross of the normalized edges:
+		scale = math.sqrt((ux*ux + uy*uy + uz*uz) * (vx*vx + vy*vy + vz*vz))
+		scale = 1.0/scale if scale > 0 else math.nan
+		self._set(p1, Vector3._from_components(((uy*vz - uz*vy)*scale, (uz*vx - ux*vz)*scale, (ux*vy - uy*vx)*scale)))
+
+	def _set_coefficients(self, a:Union[float,int], b:Union[float,int], c:Union[float,int]) -> None:
+		#using ax + by + c = z, the normal is the cross of the unit slopes (1,0,a) and (0,1,b):
+		scale = 1.0 / (math.sqrt(1.0 + a*a) * math.sqrt(1.0 + b*b))
+		self._set(Vector3._from_components((0.0, 0.0, float(c))), Vector3._from_components((-a*scale, -b*scale, scale)), a, b, c)
+
+	@classmethod
+	def from_point_normal(cls, position:Vector3, normal:Vector3) -> 'Plane':
+		''' Creates a plane with a position and normal. '''
+		plane = cls.__new__(cls)
+		plane._set(position, normal)
+		return plane
+
+	@classmethod
+	def from_points(cls, p1:Vector3, p2:Vector3, p3:Vector3) -> 'Plane':
+		''' Creates a plane through 3 positions, at p1. '''
+		plane = cls.__new__(cls)
+		plane._set_points(p1, p2, p3)
+		return plane
+
+	@classmethod
+	def from_coefficients(cls, a:Union[float,int], b:Union[float,int], c:Union[float,int]) -> 'Plane':
+		'''
+		Creates the plane z = ax + by + c.
+
+		Note: this only works if it is not perpendicular to the xy plane.
+		'''
+		plane = cls.__new__(cls)
+		plane._set_coefficients(a, b, c)
+		return plane
+
+	@classmethod
+	def from_arrays(cls, position:np.ndarray, normal:np.ndarray) -> 'Plane':
+		''' Creates a plane from a position and normal of 3 floats each, without copying them (on the numpy backend). '''
+		plane = cls.__new__(cls)
+		plane._set(Vector3._from_np(position), Vector3._from_np(normal))
+		return plane
+
 	#----Main Properties----
 	@property
 	def position(self) -> Vector3:
@@ -97,56 +134,54 @@ class Plane():
 		return self._c
 		
 	@staticmethod
-	#from https://math.stackexchange.com/questions/99299/best-fitting-plane-given-a-set-of-points (use the pretty graph one)
-	def fit_coefficients(points:List[Vector3]) -> Tuple[float,float,float]:
+	def fit_coefficients(points:Union[List[Vector3],Vector3Array,np.ndarray]) -> Tuple[float,float,float]:
 		'''
-		Find the coefficents of a plane given a list of points.
+		Find the coefficents of a plane given a list of points,
+		by least squares fitting z = ax + by + c.
 		
 		Note, this only works with planes that are not
-		perpendicular to the x,y plane.
-		'''
-		tmp_A = []
-		tmp_b = []
-		for point in points:
-			tmp_A.append([*point[0:2], 1])
-			tmp_b.append(point[2])
-		b = np.matrix(tmp_b).T
-		A = np.matrix(tmp_A)
-
-		fit = (A.T * A).I * A.T * b
-		#errors = b - A * fit
-		#residual = np.linalg.norm(errors)
-
-		return tuple(np.array(fit)[:,0]) #, errors, residual
+		perpendicular to the x,y plane, see fit for those.
+		'''
+		points = points._value if isinstance(points, Vector3Array) else Vector3Array(points)._value
+		A = np.ones((len(points),3))
+		A[:,0:2] = points[:,0:2]
+		fit = np.linalg.lstsq(A, points[:,2], rcond=None)[0]
+		return tuple(fit.tolist())
+	
+	@staticmethod
+	def fit(points:Union[List[Vector3],Vector3Array,np.ndarray]) -> 'Plane':
+		'''
+		Total least squares fit of a plane to points, which (unlike
+		fit_coefficients) also works for planes perpendicular to the x,y plane.
+		
+		See PlaneArray.fit to fit many groups of points at once.
+		'''
+		from UnitAlg.PlaneArray import PlaneArray
+		points = points if isinstance(points, (Vector3Array, np.ndarray)) else Vector3Array(points)
+		return PlaneArray.fit(points)[0][0]
 		
 	#----Functions----
 	def raycast(self,ray:Ray) -> Tuple[bool, Vector3]:
-		denom = Vector3.dot(ray.direction,self.normal)
-		if denom > 0:
-			p0 = self.position - ray.origin
-			t = Vector3.dot(self.normal, p0)/denom
-			return t >= 0, ray.origin + ray.direction*t
-		elif denom == 0:
+		ox, oy, oz = ray.origin._components()
+		dx, dy, dz = ray.direction._components()
+		nx, ny, nz = self._normal._components()
+		denom = dx*nx + dy*ny + dz*nz
+		if denom == 0:
 			return False, None
-		else:
-			negNormal = -self.normal
-			denom = Vector3.dot(negNormal, ray.direction)
-			p0 = self.position - ray.origin
-			t = Vector3.dot(p0, negNormal)/denom
-			return t >= 0, ray.origin + ray.direction * t	
+		px, py, pz = self._position._components()
+		t = ((px-ox)*nx + (py-oy)*ny + (pz-oz)*nz)/denom
+		return t >= 0, Vector3._from_components((ox + dx*t, oy + dy*t, oz + dz*t))
+	
+	def raycast_all(self, origins:Union[np.ndarray,Vector3Array], directions:Union[np.ndarray,Vector3Array]) -> Tuple[np.ndarray,np.ndarray,np.ndarray]:
+		'''
+		raycast for N rays at once, returning (N,) hit masks, (N,) t and (N,3) points.
+		
+		See PlaneArray.raycast to cast against many planes.
+		'''
+		from UnitAlg.PlaneArray import PlaneArray
+		hits, t, points = PlaneArray._from_np(self.position._value[None,:], self.normal._value[None,:]).raycast(origins, directions)
+		return hits[:,0], t[:,0], points[:,0]
 
-	@dispatch(Vector3)
-	def _reflect(self, direction:Vector3) -> Vector3:
-		incoming_angle = Vector3.angle(direction,self.normal)
-		if incoming_angle != 0:
-			rotation_axis = Vector3.cross(direction, self.normal)
-			rotation = Quaternion.from_angle_axis(2*incoming_angle, rotation_axis)
-			return rotation*direction
-		else:
-			return direction
-	@dispatch(Ray)
-	def _reflect(self, ray:Ray) -> Ray:
-		return Ray(self.raycast(ray), self._reflect(ray.direction))
 	@overload
 	def reflect(self, direction:Vector3) -> Vector3: 
 		'''
@@ -154,12 +189,26 @@ class Plane():
 		'''
 		...
 	@overload
-	def reflect(self, ray:Ray) -> Ray:
+	def reflect(self, ray:Ray) -> Optional[Ray]:
+		'''
+		Reflect ray off a plane, at an angle equal to incoming angle, and an origin at the intersection position.
+
+		Returns None if the ray does not hit the plane.
 		'''
-		Reflect ray off a plane, at an angle equal to incoming angle, and an origin at the intersection position. '''
 		...
-	def reflect(self,*args):
-		return self._reflect(*args)
+	def reflect(self, direction:Union[Vector3,Ray]) -> Union[Vector3,Ray,None]:
+		if isinstance(direction, Ray):
+			hit, point = self.raycast(direction)
+			if not hit:
+				return None
+			return Ray(point, self._reflect(direction.direction))
+		return self._reflect(direction)
+	def _reflect(self, direction:Vector3) -> Vector3:
+		x, y, z = direction._components()
+		nx, ny, nz = self._normal._components()
+		#remove the normal component twice:
+		scale = 2 * (x*nx + y*ny + z*nz) / (nx*nx + ny*ny + nz*nz)
+		return Vector3._from_components((x - nx*scale, y - ny*scale, z - nz*scale))
 		
 	#----Operators-----
 	def __str__(self) -> str:
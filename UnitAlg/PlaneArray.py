@@ -0,0 +1,135 @@
+from UnitAlg.Vector3Array import Vector3Array
+from typing import Iterator, List, Sequence, Tuple, Union, overload
+import numpy as np
+
+from UnitAlg import Vector3, Plane
+
+class PlaneArray():
+	'''
+	A batch of Plane's stored as contiguous (M,3) position and normal buffers.
+
+	Raycasts broadcast N rays against all M planes in single numpy calls.
+	'''
+	@overload
+	def __init__(self, positions:Union[Vector3Array,np.ndarray], normals:Union[Vector3Array,np.ndarray]) -> None: ...
+	@overload
+	def __init__(self, planes:Sequence[Plane]) -> None: ...
+
+	def __init__(self, *args) -> None:
+		if len(args) == 1 and isinstance(args[0], (list, tuple)) and all(isinstance(p, Plane) for p in args[0]):
+			planes = args[0]
+			self._positions = np.array([p.position._value for p in planes], dtype=np.float64).reshape((len(planes),3))
+			self._normals = np.array([p.normal._value for p in planes], dtype=np.float64).reshape((len(planes),3))
+		elif len(args) == 2:
+			self.positions = args[0]
+			self.normals = args[1]
+			if self._positions.shape != self._normals.shape:
+				raise ValueError("positions and normals must have the same shape, got {} and {}".format(self._positions.shape, self._normals.shape))
+		else:
+			raise ValueError("init can only take a list of Plane's or (M,3) positions and normals, and nothing else.")
+
+	#----Main Properties----
+	@property
+	def positions(self) -> Vector3Array:
+		return Vector3Array._from_np(np.array(self._positions))
+	@positions.setter
+	def positions(self, positions:Union[Vector3Array,np.ndarray]) -> None:
+		self._positions = Vector3Array(positions)._value
+
+	@property
+	def normals(self) -> Vector3Array:
+		return Vector3Array._from_np(np.array(self._normals))
+	@normals.setter
+	def normals(self, normals:Union[Vector3Array,np.ndarray]) -> None:
+		self._normals = Vector3Array(normals)._value
+
+	#----Casting----
+	@classmethod
+	def _from_np(cls, positions:np.ndarray, normals:np.ndarray) -> 'PlaneArray':
+		newArr = cls.__new__(cls)
+		newArr._positions = positions
+		newArr._normals = normals
+		return newArr
+
+	def to_list(self) -> List[Plane]:
+		return [self[i] for i in range(len(self))]
+
+	@staticmethod
+	def fit(points:Union[Vector3Array,np.ndarray], labels:np.ndarray=None) -> Tuple['PlaneArray',np.ndarray,np.ndarray]:
+		'''
+		Total least squares fit of a plane to each group of points, all groups at once.
+
+		Returns (planes, residuals, groups) where planes are positioned at each
+		group's centroid, residuals are the (G,) rms distances of the points from
+		their plane and groups are the sorted unique labels the rows belong to.
+		Without labels all points are one group. Vertical planes are handled
+		fine, normals point to Vector3.up's side where there is one.
+		'''
+		points = Vector3Array._buffer(points)
+		if labels is None:
+			groups = np.zeros(1, dtype=np.int64)
+			starts = np.zeros(1, dtype=np.int64)
+			counts = np.array([len(points)])
+		else:
+			order = np.argsort(labels, kind='stable')
+			points = points[order]
+			groups, starts, counts = np.unique(np.asarray(labels)[order], return_index=True, return_counts=True)
+
+		positions = np.add.reduceat(points, starts, axis=0) / counts[:,None]
+		centered = points - np.repeat(positions, counts, axis=0)
+		#the normal is the last right singular vector of each group's centered points.
+		#Groups are padded with zero rows (which change no singular vectors) to the next
+		#power of two, at least 3, and each of those sizes is decomposed in one batch:
+		normals = np.empty((len(groups),3))
+		smallest = np.empty(len(groups))
+		sizes = np.maximum(1 << np.ceil(np.log2(np.maximum(counts, 1))).astype(np.int64), 3)
+		for size in np.unique(sizes):
+			members = np.flatnonzero(sizes == size)
+			member_counts = counts[members]
+			rows = np.arange(member_counts.sum()) - np.repeat(np.cumsum(member_counts) - member_counts, member_counts)
+			batch = np.zeros((len(members), size, 3))
+			batch[np.repeat(np.arange(len(members)), member_counts), rows] = centered[np.repeat(starts[members], member_counts) + rows]
+			_, values, vectors = np.linalg.svd(batch, full_matrices=False)
+			normals[members] = vectors[:,-1,:]
+			smallest[members] = values[:,-1]
+		normals *= np.where(normals @ Vector3.up._value < 0, -1.0, 1.0)[:,None]
+		residuals = smallest / np.sqrt(counts)
+		return PlaneArray._from_np(positions, np.ascontiguousarray(normals)), residuals, groups
+
+	#----Functions----
+	def raycast(self, origins:Union[Vector3Array,Vector3,np.ndarray], directions:Union[Vector3Array,Vector3,np.ndarray]) -> Tuple[np.ndarray,np.ndarray,np.ndarray]:
+		'''
+		Casts N rays against every plane, returning (N,M) hit masks,
+		(N,M) distances t along each ray (in units of its direction) and
+		(N,M,3) hit points.
+
+		Same results as Plane.raycast: rays parallel to a plane miss with
+		t and point nan, planes behind a ray's origin miss but still
+		report their (negative) t and point.
+		'''
+		o = Vector3Array._buffer(origins)
+		d = Vector3Array._buffer(directions)
+		denom = d @ self._normals.T
+		#n . (p - o), subtracting first so far away planes and origins keep their precision:
+		numer = np.einsum('mk,nmk->nm', self._normals, self._positions[None,:,:] - o[:,None,:])
+		parallel = denom == 0
+		t = np.divide(numer, denom, out=np.full(np.broadcast(numer, denom).shape, np.nan), where=~parallel)
+		points = o[:,None,:] + d[:,None,:]*t[:,:,None]
+		return t >= 0, t, points
+
+	#----Operators----
+	def __getitem__(self, index:Union[int,slice,np.ndarray]) -> Union[Plane,'PlaneArray']:
+		if isinstance(index, (int, np.integer)):
+			return Plane(Vector3(self._positions[index]), Vector3(self._normals[index]))
+		return PlaneArray._from_np(self._positions[index], self._normals[index])
+
+	def __iter__(self) -> Iterator[Plane]:
+		for i in range(len(self)):
+			yield self[i]
+	def __len__(self) -> int:
+		return len(self._positions)
+
+	def __str__(self) -> str:
+		return 'PlaneArray({} planes)'.format(len(self))
+	def __repr__(self) -> str:
+		return self.__str__()
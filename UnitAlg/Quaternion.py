@@ -1,15 +1,23 @@
 from UnitAlg.BaseVector import BaseVector
+from UnitAlg.Convertable import ConversionTable
 from UnitAlg.helpers import *
 from typing import Any, Union, List, Tuple, overload
 import numpy as np
 import math
-from multipledispatch import dispatch
 
 from UnitAlg import Vector3
 
+_conjugate_signs = np.array((-1.0,-1.0,-1.0,1.0))
+
 class Quaternion(BaseVector):
-	to_conversions = {}
-	from_conversions = {}
+	#cached derived values (angle/axis, rotation matrix, inverse), as python floats.
+	#None whenever the components change:
+	__slots__ = ('_derived',)
+	to_conversions = ConversionTable()
+	from_conversions = ConversionTable()
+	bulk_from_conversions = ConversionTable()
+	_array_shape = (4,)
+	_array_readonly = True
 	
 	@overload
 	def __init__(self, x:Union[float,int], y:Union[float,int], z:Union[float,int], w:Union[float,int]) -> None: ...
@@ -19,7 +27,7 @@ class Quaternion(BaseVector):
 	def __init__(self, arr:Any) -> None: ... 
 	
 	def __init__(self, x_other,y=None,z=None,w=None) -> None:
-		self._derived_updated = False
+		self._derived = None
 		if y is None:
 			if isinstance(x_other, (list, tuple)):
 				if len(x_other) == 4:
@@ -87,11 +95,10 @@ class Quaternion(BaseVector):
 		'''
 		Use degrees for the angle
 		'''
-		q = Quaternion(*(axis.normalized._value*np.sin(angle/2)), np.cos(angle/2))
-		q.normalize
-		q._angle = angle
-		q._axis = axis
-		q._derived_updated = True
+		axis = axis.normalized._components()
+		s = math.sin(angle/2)
+		q = Quaternion(axis[0]*s, axis[1]*s, axis[2]*s, math.cos(angle/2))
+		q._derived = {'angle_axis':(angle, tuple(axis))}
 		return q
 	
 	@staticmethod
@@ -117,56 +124,149 @@ class Quaternion(BaseVector):
 			cy*cxcz + sy*sxsz
 		])
 	
+	#----Casting----
+	@classmethod
+	def _from_np(cls, value:np.ndarray) -> 'Quaternion':
+		q = super()._from_np(value)
+		q._derived = None
+		return q
+	
+	def _set_components(self, values:Tuple[float,...]) -> None:
+		self._value = np.array(values, dtype=np.float64)
+		self._derived = None
+	
+	def _assign(self, values:Tuple[float,...]) -> None:
+		self._value[:] = values
+		self._derived = None
+	
 	#----Main Properties----
+	@property
+	def value(self) -> np.ndarray:
+		return np.array(self._value)
+	@value.setter
+	def value(self, value:Union[np.ndarray, List[float]]) -> None:
+		self._value = np.array(value, dtype=np.float64)
+		self._derived = None
+	
+	@property
+	def x(self) -> float:
+		return float(self._value[0])
+	@x.setter
+	def x(self, x:float) -> None:
+		self._value[0] = x
+		self._derived = None
+	
+	@property
+	def y(self) -> float:
+		return float(self._value[1])
+	@y.setter
+	def y(self, y:float) -> None:
+		self._value[1] = y
+		self._derived = None
+	
+	@property
+	def z(self) -> float:
+		return float(self._value[2])
+	@z.setter
+	def z(self, z:float) -> None:
+		self._value[2] = z
+		self._derived = None
+	
 	@property
 	def w(self) -> float:
 		return float(self._value[3])
 	@w.setter
 	def w(self, w:float) -> None:
 		self._value[3] = w
-		self._derived_updated = False
+		self._derived = None
 
 	#----Derived Properties----
-	def _ensure_derived(self) -> None:
+	def _ensure_derived(self) -> Tuple[float,Tuple[float,float,float]]:
 		'''
 		Calculates derived properties like angle and axis,
 		keeping them for performance of recal.
 		'''
-		#https://www.euclideanspace.com/maths/geometry/rotations/conversions/quaternionToAngle/index.htm
-		if not self._derived_updated:
-			_w = self.w
-			if _w > 1: self.normalize()
-			self._angle = 2 * math.acos(_w)
-			s = math.sqrt(1-_w*_w)
-			if s < epsilon:
-				self._axis = Vector3(*(self._value[0:3]))
-			else:
-				self._axis = Vector3(*(self._value[0:3]))/s
-			self._derived_updated = True
+		derived = self._derived
+		if derived is None:
+			derived = self._derived = {}
+		angle_axis = derived.get('angle_axis')
+		if angle_axis is None:
+			#https://www.euclideanspace.com/maths/geometry/rotations/conversions/quaternionToAngle/index.htm
+			x, y, z, w = self._components()
+			if w > 1:
+				self.normalize()
+				return self._ensure_derived()
+			s = math.sqrt(1-w*w)
+			if s > epsilon:
+				x, y, z = x/s, y/s, z/s
+			angle_axis = derived['angle_axis'] = (2 * math.acos(w), (x, y, z))
+		return angle_axis
 	
 	@property
 	def angle(self) -> float:
-		self._ensure_derived()
-		return self._angle
+		return self._ensure_derived()[0]
 
 	@property
 	def axis(self) -> Vector3:
-		self._ensure_derived()
-		return self._axis
+		return Vector3._from_components(self._ensure_derived()[1])
 
 	@property
 	def angle_axis(self) -> Tuple[float,Vector3]:
-		self._ensure_derived()
-		return self.angle, self._axis
+		angle, axis = self._ensure_derived()
+		return angle, Vector3._from_components(axis)
+	
+	def _matrix(self) -> Tuple[float,...]:
+		''' Returns the cached row major 3x3 rotation matrix of this (unit) quaternion as 9 floats '''
+		derived = self._derived
+		if derived is None:
+			derived = self._derived = {}
+		m = derived.get('matrix')
+		if m is None:
+			qx, qy, qz, qw = self._components()
+			x = qx * 2.0
+			y = qy * 2.0
+			z = qz * 2.0
+			xx = qx * x
+			yy = qy * y
+			zz = qz * z
+			xy = qx * y
+			xz = qx * z
+			yz = qy * z
+			wx = qw * x
+			wy = qw * y
+			wz = qw * z
+			m = derived['matrix'] = (
+				1.0 - (yy + zz), xy - wz, xz + wy,
+				xy + wz, 1.0 - (xx + zz), yz - wx,
+				xz - wy, yz + wx, 1.0 - (xx + yy)
+			)
+		return m
+	
+	@property
+	def rotation_matrix(self) -> np.ndarray:
+		''' Returns the 3x3 rotation matrix of this (unit) quaternion '''
+		return np.array(self._matrix()).reshape(3,3)
 
 	def conjugate(self) -> 'Quaternion':
 		#from rospy tf.transformations
-		return Quaternion(np.array((-self._value[0], -self._value[1],
-						-self._value[2], self._value[3]), dtype=np.float64))
+		return Quaternion._from_np(self._value * _conjugate_signs)
 	@property
 	def inverse(self) -> 'Quaternion':
 		#from rospy tf.transformations
-		return Quaternion(self.conjugate()._value / np.dot(self._value, self._value))
+		derived = self._derived
+		if derived is None:
+			derived = self._derived = {}
+		inverse = derived.get('inverse')
+		if inverse is None:
+			x, y, z, w = self._components()
+			n = x*x + y*y + z*z + w*w
+			inverse = derived['inverse'] = (-x/n, -y/n, -z/n, w/n)
+		return Quaternion._from_components(inverse)
+	
+	def normalize(self, out:'Quaternion'=None) -> 'Quaternion':
+		target = BaseVector.normalize(self, out)
+		target._derived = None
+		return target
 
 	def eulers(self) -> Tuple[float,float,float]:
 		'''
@@ -174,7 +274,7 @@ class Quaternion(BaseVector):
 		
 		Result in radians about x,y,z (in that order).
 		'''
-		_x, _y, _z, _w = self._value
+		_x, _y, _z, _w = self._components()
 		test = _x*_y + _z*_w
 		near_point_5 = .5-epsilon
 		if test > near_point_5: #singularity at north pole
@@ -212,36 +312,59 @@ class Quaternion(BaseVector):
 	def __repr__(self) -> str:
 		return self.__str__()
 	
+	@staticmethod
+	def multiply(q1:'Quaternion', q2:'Quaternion', out:'Quaternion'=None) -> 'Quaternion':
+		'''
+		Hamilton product q1*q2, written into out when given (which may be q1 or q2).
+		'''
+		q1x,q1y,q1z,q1w = q1._components()
+		q2x,q2y,q2z,q2w = q2._components()
+		product = (
+			q1x*q2w + q1y*q2z - q1z*q2y + q1w*q2x,
+			-q1x*q2z + q1y*q2w + q1z*q2x + q1w*q2y,
+			q1x*q2y - q1y*q2x + q1z*q2w + q1w*q2z,
+			-q1x*q2x - q1y*q2y - q1z*q2z + q1w*q2w
+		)
+		if out is None:
+			return Quaternion._from_components(product)
+		out._assign(product)
+		return out
+	
+	def rotate(self, vector:Vector3, out:Vector3=None) -> Vector3:
+		'''
+		Rotates vector by this quaternion, written into out when given (which may be vector).
+		'''
+		derived = self._derived
+		m = None if derived is None else derived.get('matrix')
+		if m is None:
+			m = self._matrix()
+		m00, m01, m02, m10, m11, m12, m20, m21, m22 = m
+		vx, vy, vz = vector._components()
+		rotated = (
+			m00 * vx + m01 * vy + m02 * vz,
+			m10 * vx + m11 * vy + m12 * vz,
+			m20 * vx + m21 * vy + m22 * vz
+		)
+		if out is None:
+			return Vector3._from_components(rotated)
+		out._assign(rotated)
+		return out
+	
 	@overload
 	def __mul__(self,other:'Quaternion')->'Quaternion':...
 	@overload
 	def __mul__(self,other:Vector3)->Vector3:...
 	def __mul__(self,other):
 		if isinstance(other, Quaternion):
-			q1x,q1y,q1z,q1w = self._value
-			q2x,q2y,q2z,q2w = other._value
-			return Quaternion(
-				q1x*q2w + q1y*q2z - q1z*q2y + q1w*q2x,
-				-q1x*q2z + q1y*q2w + q1z*q2x + q1w*q2y,
-				q1x*q2y - q1y*q2x + q1z*q2w + q1w*q2z,
-				-q1x*q2x - q1y*q2y - q1z*q2z + q1w*q2w
-			)
-
+			return Quaternion.multiply(self, other)
 		elif isinstance(other, Vector3):
-			x = self._value[0] * 2.0
-			y = self._value[1] * 2.0
-			z = self._value[2] * 2.0
-			xx = self._value[0] * x
-			yy = self._value[1] * y
-			zz = self._value[2] * z
-			xy = self._value[0] * y
-			xz = self._value[0] * z
-			yz = self._value[1] * z
-			wx = self._value[3] * x
-			wy = self._value[3] * y
-			wz = self._value[3] * z
-			
-			_x = (1.0 - (yy + zz)) * other.x + (xy - wz) * other.y + (xz + wy) * other.z
-			_y = (xy + wz) * other.x + (1.0 - (xx + zz)) * other.y + (yz - wx) * other.z
-			_z = (xz - wy) * other.x + (yz + wx) * other.y + (1.0 - (xx + yy)) * other.z
-			return Vector3(_x,_y,_z)
+			return self.rotate(other)
+		return NotImplemented
+	def __imul__(self,other:'Quaternion')->'Quaternion':
+		if isinstance(other, Quaternion):
+			return Quaternion.multiply(self, other, out=self)
+		return NotImplemented
+	
+	def __setitem__(self, index:int, value:float) -> None:
+		self._value[index] = value
+		self._derived = None
@@ -0,0 +1,277 @@
+from UnitAlg.BaseVectorArray import BaseVectorArray
+from UnitAlg.Vector3Array import Vector3Array
+from UnitAlg.helpers import *
+from typing import Union, overload
+import numpy as np
+import math
+
+from UnitAlg import Vector3, Quaternion
+
+class QuaternionArray(BaseVectorArray):
+	'''
+	A batch of Quaternion's stored as one contiguous (N,4) float64 buffer (x,y,z,w).
+
+	Every function gives the same numbers as its Quaternion counterpart,
+	and accepts a single Quaternion anywhere a QuaternionArray is
+	expected (broadcast against all rows).
+	'''
+	element_type = Quaternion
+	width = 4
+	_array_shape = (-1,4)
+
+	@staticmethod
+	def identity(count:int) -> 'QuaternionArray':
+		value = np.zeros((count,4), dtype=np.float64)
+		value[:,3] = 1
+		return QuaternionArray._from_np(value)
+
+	@staticmethod
+	def from_angle_axis(angle:Union[float,np.ndarray], axis:Union[Vector3,Vector3Array,np.ndarray]) -> 'QuaternionArray':
+		'''
+		Angles in radians, axes are normalized before use.
+		'''
+		axis = Vector3Array._vectors(axis)
+		axis = axis / np.sqrt(np.einsum('...i,...i->...', axis, axis))[...,None]
+		half = np.asarray(angle, dtype=np.float64)/2
+		sin = np.sin(half)[...,None]
+		value = np.empty(np.broadcast(axis[...,0], half).shape + (4,), dtype=np.float64)
+		value[...,0:3] = axis*sin
+		value[...,3] = np.cos(half)
+		return QuaternionArray._from_np(np.atleast_2d(value))
+
+	@staticmethod
+	def from_euler(ax:Union[float,np.ndarray], ay:Union[float,np.ndarray], az:Union[float,np.ndarray]) -> 'QuaternionArray':
+		ax, ay, az = np.broadcast_arrays(
+			np.asarray(ax, dtype=np.float64)/2.0,
+			np.asarray(ay, dtype=np.float64)/2.0,
+			np.asarray(az, dtype=np.float64)/2.0)
+		cx = np.cos(ax)
+		sx = np.sin(ax)
+		cy = np.cos(ay)
+		sy = np.sin(ay)
+		cz = np.cos(az)
+		sz = np.sin(az)
+		cxcz = cx*cz
+		cxsz = cx*sz
+		sxcz = sx*cz
+		sxsz = sx*sz
+
+		return QuaternionArray._from_np(np.atleast_2d(np.stack((
+			cy*sxcz - sy*cxsz,
+			cy*sxsz + sy*cxcz,
+			cy*cxsz - sy*sxcz,
+			cy*cxcz + sy*sxsz
+		), axis=-1)))
+
+	@staticmethod
+	def from_rotation_matrix(m:np.ndarray) -> 'QuaternionArray':
+		''' Converts a (N,3,3) stack of rotation matrices, branching per matrix like Quaternion.from_rotation_matrix. '''
+		m = np.asarray(m, dtype=np.float64).reshape((-1,3,3))
+		m00, m11, m22 = m[:,0,0], m[:,1,1], m[:,2,2]
+		trace = m00 + m11 + m22
+
+		b0 = trace > 0
+		b1 = ~b0 & (m00 > m11) & (m00 > m22)
+		b2 = ~b0 & ~b1 & (m11 > m22)
+		b3 = ~(b0 | b1 | b2)
+
+		value = np.empty((len(m),4), dtype=np.float64)
+		r = m[b0]
+		s = 0.5 / np.sqrt(trace[b0] + 1)
+		value[b0] = np.stack((
+			(r[:,2,1] - r[:,1,2]) * s,
+			(r[:,0,2] - r[:,2,0]) * s,
+			(r[:,1,0] - r[:,0,1]) * s,
+			0.25 / s
+		), axis=-1)
+		r = m[b1]
+		s = 2 * np.sqrt(1 + r[:,0,0] - r[:,1,1] - r[:,2,2])
+		value[b1] = np.stack((
+			0.25 * s,
+			(r[:,0,1] + r[:,1,0]) / s,
+			(r[:,0,2] + r[:,2,0]) / s,
+			(r[:,2,1] - r[:,1,2]) / s
+		), axis=-1)
+		r = m[b2]
+		s = 2 * np.sqrt(1 + r[:,1,1] - r[:,0,0] - r[:,2,2])
+		value[b2] = np.stack((
+			(r[:,0,1] + r[:,1,0]) / s,
+			0.25 * s,
+			(r[:,1,2] + r[:,2,1]) / s,
+			(r[:,0,2] - r[:,2,0]) / s
+		), axis=-1)
+		r = m[b3]
+		s = 2 * np.sqrt(1 + r[:,2,2] - r[:,0,0] - r[:,1,1])
+		value[b3] = np.stack((
+			(r[:,0,2] + r[:,2,0]) / s,
+			(r[:,1,2] + r[:,2,1]) / s,
+			0.25 * s,
+			(r[:,1,0] - r[:,0,1]) / s
+		), axis=-1)
+		return QuaternionArray._from_np(value)
+
+	#----Main Properties----
+	@property
+	def w(self) -> np.ndarray:
+		''' View of the w column '''
+		return self._value[:,3]
+	@w.setter
+	def w(self, w:Union[np.ndarray,float]) -> None:
+		self._value[:,3] = w
+
+	#----Derived Properties----
+	@property
+	def angle(self) -> np.ndarray:
+		return 2 * np.arccos(np.clip(self._value[:,3], -1, 1))
+
+	@property
+	def rotation_matrix(self) -> np.ndarray:
+		''' Returns the (N,3,3) rotation matrices of these (unit) quaternions '''
+		q = self._value
+		x = q[:,0] * 2.0
+		y = q[:,1] * 2.0
+		z = q[:,2] * 2.0
+		xx = q[:,0] * x
+		yy = q[:,1] * y
+		zz = q[:,2] * z
+		xy = q[:,0] * y
+		xz = q[:,0] * z
+		yz = q[:,1] * z
+		wx = q[:,3] * x
+		wy = q[:,3] * y
+		wz = q[:,3] * z
+
+		m = np.empty((len(q),3,3), dtype=np.float64)
+		m[:,0,0] = 1.0 - (yy + zz)
+		m[:,0,1] = xy - wz
+		m[:,0,2] = xz + wy
+		m[:,1,0] = xy + wz
+		m[:,1,1] = 1.0 - (xx + zz)
+		m[:,1,2] = yz - wx
+		m[:,2,0] = xz - wy
+		m[:,2,1] = yz + wx
+		m[:,2,2] = 1.0 - (xx + yy)
+		return m
+
+	def conjugate(self) -> 'QuaternionArray':
+		value = np.array(self._value)
+		value[:,0:3] *= -1
+		return QuaternionArray._from_np(value)
+	@property
+	def inverse(self) -> 'QuaternionArray':
+		value = self.conjugate()._value
+		value /= self.sq_magnitude[:,None]
+		return QuaternionArray._from_np(value)
+
+	def eulers(self) -> np.ndarray:
+		'''
+		Calculates and returns the euler equivalent of these quaternions.
+
+		Result is (N,3) in radians about x,y,z (in that order).
+		'''
+		_x, _y, _z, _w = self._value.T
+		test = _x*_y + _z*_w
+		near_point_5 = .5-epsilon
+		north = test > near_point_5 #singularity at north pole
+		south = test < -near_point_5 #singularity at south pole
+
+		sqx = _x*_x
+		sqy = _y*_y
+		sqz = _z*_z
+		result = np.empty((len(self._value),3), dtype=np.float64)
+		result[:,0] = np.arctan2(2*_x*_w-2*_y*_z , 1 - 2*sqx - 2*sqz)
+		result[:,1] = np.arctan2(2*_y*_w-2*_x*_z , 1 - 2*sqy - 2*sqz)
+		result[:,2] = np.arcsin(np.clip(2*test, -1, 1))
+
+		poles = north | south
+		result[poles,0] = 0
+		result[poles,1] = np.where(north[poles], 2, -2) * np.arctan2(_x[poles], _w[poles])
+		result[poles,2] = np.where(north[poles], math.pi/2, -math.pi/2)
+		return result
+
+	@staticmethod
+	def _pairs(q1:Union['QuaternionArray',Quaternion], q2:Union['QuaternionArray',Quaternion], t:Union[float,np.ndarray]):
+		''' Broadcasts q1, q2 and t to (N,4), (N,4) and (N,), flipping q2 onto q1's side of the hypersphere. '''
+		t = np.asarray(t, dtype=np.float64)
+		a = np.atleast_2d(q1._value)
+		b = np.atleast_2d(q2._value)
+		count = np.broadcast(a[:,0], b[:,0], np.atleast_1d(t)).shape[0]
+		a = np.broadcast_to(a, (count,4))
+		t = np.broadcast_to(t, (count,))
+		dot = np.einsum('ij,ij->i', a, b)
+		#q and -q are the same rotation, so take the short way round:
+		b = np.where((dot < 0)[:,None], -b, b)
+		return a, b, t, np.abs(dot)
+
+	@staticmethod
+	def nlerp(q1:Union['QuaternionArray',Quaternion], q2:Union['QuaternionArray',Quaternion], t:Union[float,np.ndarray]) -> 'QuaternionArray':
+		'''
+		Normalized linear interpolation from q1 to q2 by t, along the shortest path.
+		
+		Any of q1, q2 and t can be single values, broadcast against the others.
+		'''
+		a, b, t, _ = QuaternionArray._pairs(q1, q2, t)
+		result = a + (b - a)*t[:,None]
+		return QuaternionArray._from_np(result / np.sqrt(np.einsum('ij,ij->i', result, result))[:,None])
+
+	@staticmethod
+	def slerp(q1:Union['QuaternionArray',Quaternion], q2:Union['QuaternionArray',Quaternion], t:Union[float,np.ndarray]) -> 'QuaternionArray':
+		'''
+		Spherical linear interpolation from unit q1 to unit q2 by t, along the
+		shortest path. Falls back to nlerp where they (nearly) match.
+		
+		Any of q1, q2 and t can be single values, broadcast against the others.
+		'''
+		a, b, t, dot = QuaternionArray._pairs(q1, q2, t)
+		angle = np.arccos(np.minimum(dot, 1))
+		sin = np.sin(angle)
+		near = sin < 1e-6
+		sin[near] = 1
+		w1 = np.where(near, 1-t, np.sin((1-t)*angle)/sin)
+		w2 = np.where(near, t, np.sin(t*angle)/sin)
+		result = a*w1[:,None] + b*w2[:,None]
+		return QuaternionArray._from_np(result / np.sqrt(np.einsum('ij,ij->i', result, result))[:,None])
+
+	@staticmethod
+	def multiply(q1:Union['QuaternionArray',Quaternion], q2:Union['QuaternionArray',Quaternion]) -> 'QuaternionArray':
+		''' Hamilton product of each pair, broadcasting single quaternions. '''
+		q1x,q1y,q1z,q1w = np.atleast_2d(q1._value).T
+		q2x,q2y,q2z,q2w = np.atleast_2d(q2._value).T
+		return QuaternionArray._from_np(np.stack((
+			q1x*q2w + q1y*q2z - q1z*q2y + q1w*q2x,
+			-q1x*q2z + q1y*q2w + q1z*q2x + q1w*q2y,
+			q1x*q2y - q1y*q2x + q1z*q2w + q1w*q2z,
+			-q1x*q2x - q1y*q2y - q1z*q2z + q1w*q2w
+		), axis=-1))
+
+	@staticmethod
+	def rotate(rotations:Union['QuaternionArray',Quaternion], vectors:Union[Vector3Array,Vector3,np.ndarray]) -> Vector3Array:
+		'''
+		Rotates vectors by rotations, one or many of each.
+
+		A single rotation is turned into one 3x3 matrix that is applied to all vectors.
+		'''
+		points = vectors._value if isinstance(vectors, (Vector3Array, Vector3)) else np.asarray(vectors, dtype=np.float64)
+		if isinstance(rotations, Quaternion):
+			#reuses the quaternion's cached matrix:
+			return Vector3Array._from_np(np.atleast_2d(points @ rotations.rotation_matrix.T))
+		if len(rotations) == 1:
+			m = rotations.rotation_matrix[0]
+			return Vector3Array._from_np(np.atleast_2d(points @ m.T))
+		return Vector3Array._from_np(np.einsum('nij,nj->ni', rotations.rotation_matrix, np.broadcast_to(points, (len(rotations),3))))
+
+	#----Operators----
+	@overload
+	def __mul__(self, other:Union['QuaternionArray',Quaternion]) -> 'QuaternionArray': ...
+	@overload
+	def __mul__(self, other:Union[Vector3Array,Vector3]) -> Vector3Array: ...
+	def __mul__(self, other):
+		if isinstance(other, (QuaternionArray, Quaternion)):
+			return QuaternionArray.multiply(self, other)
+		elif isinstance(other, (Vector3Array, Vector3)):
+			return QuaternionArray.rotate(self, other)
+		return NotImplemented
+	def __rmul__(self, other:Quaternion) -> 'QuaternionArray':
+		if isinstance(other, Quaternion):
+			return QuaternionArray.multiply(other, self)
+		return NotImplemented
@@ -0,0 +1,134 @@
+from typing import Iterator, List, Sequence, Tuple, Union, overload
+import numpy as np
+
+from UnitAlg.Range import Range
+
+class RangeArray():
+	'''
+	A batch of Range's stored as contiguous (N,) min and max buffers.
+
+	Every function gives the same numbers as its Range counterpart, and
+	accepts a single Range or value where an array is expected
+	(broadcast against all ranges).
+	'''
+	@overload
+	def __init__(self, mins:np.ndarray, maxs:np.ndarray) -> None: ...
+	@overload
+	def __init__(self, ranges:Sequence[Range]) -> None: ...
+
+	def __init__(self, *args) -> None:
+		if len(args) == 1 and isinstance(args[0], (list, tuple)) and all(isinstance(r, Range) for r in args[0]):
+			ranges = args[0]
+			self._mins = np.array([r.min for r in ranges], dtype=np.float64)
+			self._maxs = np.array([r.max for r in ranges], dtype=np.float64)
+		elif len(args) == 2:
+			self._mins = np.array(args[0], dtype=np.float64).reshape(-1)
+			self._maxs = np.array(args[1], dtype=np.float64).reshape(-1)
+			if self._mins.shape != self._maxs.shape:
+				raise ValueError("mins and maxs must have the same shape, got {} and {}".format(self._mins.shape, self._maxs.shape))
+		else:
+			raise ValueError("init can only take a list of Range's or (N,) mins and maxs, and nothing else.")
+
+	@classmethod
+	def from_point(cls, points:np.ndarray) -> 'RangeArray':
+		points = np.array(points, dtype=np.float64).reshape(-1)
+		return cls._from_np(points, np.array(points))
+
+	@classmethod
+	def from_center_delta(cls, centers:np.ndarray, deltas:Union[float,np.ndarray]) -> 'RangeArray':
+		centers, deltas = np.broadcast_arrays(np.asarray(centers, dtype=np.float64).reshape(-1), np.asarray(deltas, dtype=np.float64))
+		return cls._from_np(centers - deltas, centers + deltas)
+
+	#----Main Properties----
+	@property
+	def mins(self) -> np.ndarray:
+		return np.array(self._mins)
+	@mins.setter
+	def mins(self, mins:np.ndarray) -> None:
+		self._mins = np.array(mins, dtype=np.float64).reshape(-1)
+
+	@property
+	def maxs(self) -> np.ndarray:
+		return np.array(self._maxs)
+	@maxs.setter
+	def maxs(self, maxs:np.ndarray) -> None:
+		self._maxs = np.array(maxs, dtype=np.float64).reshape(-1)
+
+	@property
+	def range(self) -> np.ndarray:
+		return self._maxs - self._mins
+
+	#----Casting----
+	@classmethod
+	def _from_np(cls, mins:np.ndarray, maxs:np.ndarray) -> 'RangeArray':
+		newArr = cls.__new__(cls)
+		newArr._mins = mins
+		newArr._maxs = maxs
+		return newArr
+
+	def to_list(self) -> List[Range]:
+		return [self[i] for i in range(len(self))]
+
+	#----Functions----
+	def overlaps(self, other:Union['RangeArray',Range]) -> np.ndarray:
+		'''
+		Returns whether each range overlaps its paired range in other (or a single range).
+		'''
+		other_mins, other_maxs = _bounds(other)
+		return (self._mins <= other_maxs) & (self._maxs >= other_mins)
+
+	def overlapping(self, other:Union['RangeArray',Range]) -> 'RangeArray':
+		'''
+		Returns the overlapping range between each range and its pair in other
+		(or a single range), unless they do not overlap, in which case it is a
+		point still contained within this range but closest to the other.
+		'''
+		other_mins, other_maxs = _bounds(other)
+		above = self._mins > other_maxs
+		below = self._maxs < other_mins
+		mins = np.where(above, self._mins, np.where(below, self._maxs, np.maximum(self._mins, other_mins)))
+		maxs = np.where(above, self._mins, np.where(below, self._maxs, np.minimum(self._maxs, other_maxs)))
+		return RangeArray._from_np(mins, maxs)
+
+	def clamp(self, values:Union[float,np.ndarray]) -> np.ndarray:
+		'''
+		Clamps values into the ranges, along the last axis of values, so
+		(C,N) values clamp C configurations of N joints at once.
+		'''
+		return np.maximum(np.minimum(values, self._maxs), self._mins)
+
+	def contains(self, values:Union[float,np.ndarray]) -> np.ndarray:
+		'''
+		Returns whether each value is within its range (bounds included), along the last axis of values.
+		'''
+		values = np.asarray(values)
+		return (self._mins <= values) & (values <= self._maxs)
+
+	#----Operators----
+	def __mul__(self, value:Union[float,np.ndarray]) -> 'RangeArray':
+		return RangeArray._from_np(self._mins * value, self._maxs * value)
+	def __rmul__(self, value:Union[float,np.ndarray]) -> 'RangeArray':
+		return self * value
+	def __truediv__(self, value:Union[float,np.ndarray]) -> 'RangeArray':
+		return RangeArray._from_np(self._mins / value, self._maxs / value)
+
+	def __getitem__(self, index:Union[int,slice,np.ndarray]) -> Union[Range,'RangeArray']:
+		if isinstance(index, (int, np.integer)):
+			return Range(float(self._mins[index]), float(self._maxs[index]))
+		return RangeArray._from_np(self._mins[index], self._maxs[index])
+
+	def __iter__(self) -> Iterator[Range]:
+		for i in range(len(self)):
+			yield self[i]
+	def __len__(self) -> int:
+		return len(self._mins)
+
+	def __str__(self) -> str:
+		return 'RangeArray({} ranges)'.format(len(self))
+	def __repr__(self) -> str:
+		return self.__str__()
+
+def _bounds(other:Union[RangeArray,Range]) -> Tuple[np.ndarray,np.ndarray]:
+	if isinstance(other, Range):
+		return other.min, other.max
+	return other._mins, other._maxs
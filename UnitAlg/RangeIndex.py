@@ -0,0 +1,127 @@
+from typing import List, Sequence, Tuple, Union
+import numpy as np
+
+from UnitAlg.Range import Range
+from UnitAlg.RangeArray import RangeArray
+
+class RangeIndex():
+	'''
+	A sorted endpoint index over ranges for "which ranges overlap this
+	value or range" queries, many queries per call.
+
+	Ranges are split into classes of similar length (by power of two), and
+	kept sorted by min within each class. A range in a class can only reach
+	a query from mins within the class's longest length of it, so each class
+	is one pair of binary searches per query and few false candidates, even
+	when short and very long ranges are mixed.
+
+	Queries return range ids, the index of each range in the ranges the
+	index was built from.
+	'''
+	def __init__(self, ranges:Union[RangeArray,Sequence[Range]]) -> None:
+		if not isinstance(ranges, RangeArray):
+			ranges = RangeArray(list(ranges))
+		self._mins = np.array(ranges._mins)
+		self._maxs = np.array(ranges._maxs)
+		if np.any(self._mins > self._maxs):
+			raise ValueError("every range must have min <= max")
+		lengths = self._maxs - self._mins
+		classes = np.where(np.isinf(lengths), np.iinfo(np.int32).max, np.frexp(lengths)[1])
+		self._ids = np.argsort(classes, kind='stable')
+		starts = np.flatnonzero(np.diff(classes[self._ids])) + 1
+		starts = np.insert(starts, 0, 0) if len(self._ids) > 0 else starts
+		#every class is a pass over the queries, so merge small ones into longer ones:
+		self._class_bounds = []
+		for start, end in zip(starts, np.append(starts[1:], len(self._ids))):
+			if self._class_bounds and self._class_bounds[-1][1] - self._class_bounds[-1][0] < len(self._ids)//_merge_fraction:
+				start = self._class_bounds.pop()[0]
+			self._class_bounds.append((start, end))
+		#ids sorted by min within each class, the classes one after another:
+		self._ids = np.concatenate([self._ids[start:end][np.argsort(self._mins[self._ids[start:end]], kind='stable')] for start, end in self._class_bounds] or [self._ids])
+		self._sorted_mins = self._mins[self._ids]
+		self._reach = [lengths[self._ids[start:end]].max() for start, end in self._class_bounds]
+		#for counting:
+		self._all_mins = np.sort(self._mins)
+		self._all_maxs = np.sort(self._maxs)
+
+	#----Main Properties----
+	@property
+	def ranges(self) -> RangeArray:
+		return RangeArray._from_np(np.array(self._mins), np.array(self._maxs))
+
+	#----Functions----
+	def pairs(self, queries:Union[RangeArray,Range,float,np.ndarray]) -> Tuple[np.ndarray,np.ndarray]:
+		'''
+		Returns every (query index, range id) pair of overlapping query and
+		range, sorted by query then range id.
+
+		Queries are values (a float or array of them) or ranges (a Range or RangeArray).
+		'''
+		lows, highs = _query_bounds(queries)
+		query_index, ids = [], []
+		for (start, end), reach in zip(self._class_bounds, self._reach):
+			mins = self._sorted_mins[start:end]
+			firsts = np.searchsorted(mins, lows - reach, side='left')
+			counts = np.searchsorted(mins, highs, side='right') - firsts
+			counts = np.maximum(counts, 0)
+			#expand each [first, first+count) run of sorted ids:
+			total = int(counts.sum())
+			run_starts = np.cumsum(counts) - counts
+			positions = start + np.arange(total) - np.repeat(run_starts - firsts, counts)
+			class_query_index = np.repeat(np.arange(len(lows)), counts)
+			class_ids = self._ids[positions]
+			reaches = self._maxs[class_ids] >= lows[class_query_index]
+			query_index.append(class_query_index[reaches])
+			ids.append(class_ids[reaches])
+		query_index = np.concatenate(query_index) if query_index else np.empty(0, dtype=np.int64)
+		ids = np.concatenate(ids) if ids else np.empty(0, dtype=np.int64)
+		order = np.argsort(query_index * len(self._mins) + ids)
+		return query_index[order], ids[order]
+
+	def query(self, queries:Union[RangeArray,Range,float,np.ndarray]) -> Union[List[np.ndarray],np.ndarray]:
+		'''
+		Returns the sorted ids of the ranges overlapping each query, as a list
+		of arrays (or one array for a single value or Range).
+		'''
+		query_index, ids = self.pairs(queries)
+		result = np.split(ids, np.searchsorted(query_index, np.arange(1, len(_query_bounds(queries)[0]))))
+		if _is_single(queries):
+			return result[0]
+		return result
+
+	def count(self, queries:Union[RangeArray,Range,float,np.ndarray]) -> Union[np.ndarray,int]:
+		'''
+		Returns how many ranges overlap each query: those starting at or before
+		its max, less those ending before its min.
+		'''
+		lows, highs = _query_bounds(queries)
+		counts = np.searchsorted(self._all_mins, highs, side='right') - np.searchsorted(self._all_maxs, lows, side='left')
+		if _is_single(queries):
+			return int(counts[0])
+		return counts
+
+	#----Operators----
+	def __len__(self) -> int:
+		return len(self._mins)
+
+	def __str__(self) -> str:
+		return 'RangeIndex({} ranges)'.format(len(self))
+	def __repr__(self) -> str:
+		return self.__str__()
+
+def _is_single(queries:Union[RangeArray,Range,float,np.ndarray]) -> bool:
+	if isinstance(queries, (Range, RangeArray)):
+		return isinstance(queries, Range)
+	return np.ndim(queries) == 0
+
+def _query_bounds(queries:Union[RangeArray,Range,float,np.ndarray]) -> Tuple[np.ndarray,np.ndarray]:
+	''' (Q,) lows and highs of values or ranges '''
+	if isinstance(queries, Range):
+		return np.array([queries.min], dtype=np.float64), np.array([queries.max], dtype=np.float64)
+	if isinstance(queries, RangeArray):
+		return queries._mins, queries._maxs
+	values = np.asarray(queries, dtype=np.float64).reshape(-1)
+	return values, values
+
+#classes with fewer than 1/this of the ranges are merged into the next longer class:
+_merge_fraction = 16
@@ -0,0 +1,133 @@
+from UnitAlg.Vector3Array import Vector3Array
+from typing import Iterator, List, Sequence, Union, overload
+import numpy as np
+
+from UnitAlg import Vector3, Ray
+
+class RayArray():
+	'''
+	A batch of Ray's stored as contiguous (N,3) origin and direction buffers.
+
+	Every function gives the same numbers as its Ray counterpart, and
+	accepts a single Ray or Vector3 where an array is expected
+	(broadcast against all rows).
+	'''
+	@overload
+	def __init__(self, origins:Union[Vector3Array,np.ndarray], directions:Union[Vector3Array,np.ndarray]) -> None: ...
+	@overload
+	def __init__(self, rays:Sequence[Ray]) -> None: ...
+
+	def __init__(self, *args) -> None:
+		if len(args) == 1 and isinstance(args[0], (list, tuple)) and all(isinstance(r, Ray) for r in args[0]):
+			rays = args[0]
+			self._origins = np.array([r.origin._value for r in rays], dtype=np.float64).reshape((len(rays),3))
+			self._directions = np.array([r.direction._value for r in rays], dtype=np.float64).reshape((len(rays),3))
+		elif len(args) == 2:
+			self.origins = args[0]
+			self.directions = args[1]
+			if self._origins.shape != self._directions.shape:
+				raise ValueError("origins and directions must have the same shape, got {} and {}".format(self._origins.shape, self._directions.shape))
+		else:
+			raise ValueError("init can only take a list of Ray's or (N,3) origins and directions, and nothing else.")
+
+	#----Main Properties----
+	@property
+	def origins(self) -> Vector3Array:
+		return Vector3Array._from_np(np.array(self._origins))
+	@origins.setter
+	def origins(self, origins:Union[Vector3Array,np.ndarray]) -> None:
+		self._origins = Vector3Array(origins)._value
+
+	@property
+	def directions(self) -> Vector3Array:
+		return Vector3Array._from_np(np.array(self._directions))
+	@directions.setter
+	def directions(self, directions:Union[Vector3Array,np.ndarray]) -> None:
+		self._directions = Vector3Array(directions)._value
+
+	#----Casting----
+	@classmethod
+	def _from_np(cls, origins:np.ndarray, directions:np.ndarray) -> 'RayArray':
+		newArr = cls.__new__(cls)
+		newArr._origins = origins
+		newArr._directions = directions
+		return newArr
+
+	def to_list(self) -> List[Ray]:
+		return [self[i] for i in range(len(self))]
+
+	#----Functions----
+	def at(self, t:Union[float,np.ndarray]) -> Vector3Array:
+		'''
+		Returns the point on each ray at distance t, one t or one per ray.
+		'''
+		t = np.asarray(t, dtype=np.float64)
+		return Vector3Array._from_np(self._origins + self._directions * t[...,None])
+
+	def closest_point(self, points:Union[Vector3Array,Vector3,np.ndarray]) -> Vector3Array:
+		'''
+		Returns the closest point on each ray to each point (or to a single point).
+		'''
+		p = Vector3Array._buffer(points)
+		projection = np.einsum('ij,ij->i', p - self._origins, self._directions)
+		return Vector3Array._from_np(self._origins + self._directions * projection[:,None])
+
+	def skew_point(self, rays:Union['RayArray',Ray]) -> Vector3Array:
+		'''
+		Returns the closest point on each ray to its paired ray in rays (or to a single ray).
+
+		Rays that are (nearly) parallel to their pair return their origin.
+		'''
+		#source: https://en.wikipedia.org/wiki/Skew_lines#Nearest_points
+		if isinstance(rays, Ray):
+			other_origins, other_directions = rays.origin._value, rays.direction._value
+		elif len(rays) != len(self):
+			raise ValueError("skew_point needs one ray per ray ({}) or a single Ray, got {}".format(len(self), len(rays)))
+		else:
+			other_origins, other_directions = rays._origins, rays._directions
+		n = np.cross(self._directions, other_directions)
+		n2 = np.cross(other_directions, n)
+		parallel = np.einsum('ij,ij->i', n, n) < 0.000001
+		denom = np.einsum('ij,ij->i', self._directions, n2)
+		t = np.divide(np.einsum('ij,ij->i', other_origins - self._origins, n2), denom, out=np.zeros_like(denom), where=~parallel)
+		return Vector3Array._from_np(self._origins + self._directions * t[:,None])
+
+	def nearest_point(self, labels:np.ndarray=None) -> Vector3Array:
+		'''
+		Returns the least squares point nearest to all the rays (as lines),
+		or to each group of rays when given a label per ray, in sorted label order.
+
+		Triangulates a target seen from many cameras: minimizes the sum of
+		squared distances (I - d*d^T)(x - o) to every line, one 3x3 solve per group.
+		Groups whose rays are all parallel get the solution nearest the coordinate origin.
+		'''
+		d = self._directions / np.linalg.norm(self._directions, axis=1)[:,None]
+		#(I - d*d^T) per ray:
+		projectors = np.identity(3) - d[:,:,None]*d[:,None,:]
+		targets = np.einsum('nij,nj->ni', projectors, self._origins)
+		if labels is None:
+			a = projectors.sum(axis=0)[None]
+			b = targets.sum(axis=0)[None]
+		else:
+			order = np.argsort(labels, kind='stable')
+			starts = np.unique(np.asarray(labels)[order], return_index=True)[1]
+			a = np.add.reduceat(projectors[order], starts, axis=0)
+			b = np.add.reduceat(targets[order], starts, axis=0)
+		return Vector3Array._from_np(np.einsum('nij,nj->ni', np.linalg.pinv(a), b))
+
+	#----Operators----
+	def __getitem__(self, index:Union[int,slice,np.ndarray]) -> Union[Ray,'RayArray']:
+		if isinstance(index, (int, np.integer)):
+			return Ray(Vector3(self._origins[index]), Vector3(self._directions[index]))
+		return RayArray._from_np(self._origins[index], self._directions[index])
+
+	def __iter__(self) -> Iterator[Ray]:
+		for i in range(len(self)):
+			yield self[i]
+	def __len__(self) -> int:
+		return len(self._origins)
+
+	def __str__(self) -> str:
+		return 'RayArray({} rays)'.format(len(self))
+	def __repr__(self) -> str:
+		return self.__str__()
@@ -0,0 +1,140 @@
+from UnitAlg.Backend import scalar_types
+from UnitAlg.Quaternion import Quaternion
+from UnitAlg.helpers import divide
+from typing import Iterator, List, Tuple, Union
+import numpy as np
+import math
+
+class ScalarQuaternion(Quaternion):
+	'''
+	Quaternion that keeps its components as python floats and does its math
+	with the math module, converting to a numpy array only on demand.
+
+	Much cheaper than numpy for one off operations on single rotations.
+	Created by Quaternion(...) once Backend.set(Backend.scalar) (or
+	Backend.set(Backend.scalar, Quaternion)) has been called.
+	'''
+	__slots__ = ('_x','_y','_z','_w')
+	_is_scalar = True
+
+	def __init__(self, x_other, y=None, z=None, w=None) -> None:
+		self._derived = None
+		if y is not None and type(x_other) in _numbers and type(y) in _numbers and type(z) in _numbers and type(w) in _numbers:
+			self._x = float(x_other)
+			self._y = float(y)
+			self._z = float(z)
+			self._w = float(w)
+		else:
+			Quaternion.__init__(self, x_other, y, z, w)
+
+	#----Main Properties----
+	@property
+	def _value(self) -> np.ndarray:
+		return np.array((self._x, self._y, self._z, self._w))
+	@_value.setter
+	def _value(self, value:Union[np.ndarray, List[float]]) -> None:
+		if isinstance(value, np.ndarray):
+			value = value.tolist()
+		self._x, self._y, self._z, self._w = (float(v) for v in value)
+		self._derived = None
+
+	@property
+	def x(self) -> float:
+		return self._x
+	@x.setter
+	def x(self, x:float) -> None:
+		self._x = float(x)
+		self._derived = None
+
+	@property
+	def y(self) -> float:
+		return self._y
+	@y.setter
+	def y(self, y:float) -> None:
+		self._y = float(y)
+		self._derived = None
+
+	@property
+	def z(self) -> float:
+		return self._z
+	@z.setter
+	def z(self, z:float) -> None:
+		self._z = float(z)
+		self._derived = None
+
+	@property
+	def w(self) -> float:
+		return self._w
+	@w.setter
+	def w(self, w:float) -> None:
+		self._w = float(w)
+		self._derived = None
+
+	#----Casting----
+	@classmethod
+	def _from_components(cls, values:Tuple[float,float,float,float]) -> 'ScalarQuaternion':
+		newQ = object.__new__(cls)
+		newQ._x, newQ._y, newQ._z, newQ._w = values
+		newQ._derived = None
+		return newQ
+
+	def _components(self) -> Tuple[float,float,float,float]:
+		return (self._x, self._y, self._z, self._w)
+
+	def _set_components(self, values:Tuple[float,float,float,float]) -> None:
+		self._x, self._y, self._z, self._w = values
+		self._derived = None
+
+	_assign = _set_components
+
+	#----Functions----
+	@property
+	def sq_magnitude(self) -> float:
+		''' Returns squared length of this quaternion '''
+		return self._x*self._x + self._y*self._y + self._z*self._z + self._w*self._w
+
+	@property
+	def magnitude(self) -> float:
+		''' Returns the length of this quaternion '''
+		return math.sqrt(self.sq_magnitude)
+
+	@property
+	def normalized(self) -> 'ScalarQuaternion':
+		m = self.magnitude
+		return ScalarQuaternion._from_components((divide(self._x, m), divide(self._y, m), divide(self._z, m), divide(self._w, m)))
+
+	def conjugate(self) -> 'ScalarQuaternion':
+		return ScalarQuaternion._from_components((-self._x, -self._y, -self._z, self._w))
+	@property
+	def inverse(self) -> 'ScalarQuaternion':
+		n = self.sq_magnitude
+		return ScalarQuaternion._from_components((-self._x/n, -self._y/n, -self._z/n, self._w/n))
+
+	def __eq__(self, other:Quaternion) -> bool:
+		rtol, atol = self.rtol, self.atol
+		for a, b in zip((self._x, self._y, self._z, self._w), other._components()):
+			#same test as numpy.isclose
+			if a != b and not abs(a - b) <= atol + rtol*abs(b):
+				return False
+		return True
+	def __ne__(self, other:Quaternion) -> bool:
+		return not self == other
+
+	def __getitem__(self, index:int) -> float:
+		return (self._x, self._y, self._z, self._w)[index]
+	def __setitem__(self, index:int, value:float) -> None:
+		values = [self._x, self._y, self._z, self._w]
+		values[index] = float(value)
+		self._set_components(values)
+
+	def __iter__(self) -> Iterator[float]:
+		return iter((self._x, self._y, self._z, self._w))
+	def __len__(self) -> int:
+		return 4
+
+	def __hash__(self) -> int:
+		return hash((self._x, self._y, self._z, self._w))
+
+_numbers = (float, int)
+
+scalar_types[Quaternion] = ScalarQuaternion
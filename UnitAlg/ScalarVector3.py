@@ -0,0 +1,189 @@
+from UnitAlg.Backend import scalar_types
+from UnitAlg.Vector3 import Vector3
+from UnitAlg.helpers import divide
+from typing import Iterator, List, Tuple, Union
+import numpy as np
+import math
+
+class ScalarVector3(Vector3):
+	'''
+	Vector3 that keeps its components as python floats and does its math
+	with the math module, converting to a numpy array only on demand.
+
+	Much cheaper than numpy for one off operations on single vectors.
+	Created by Vector3(...) once Backend.set(Backend.scalar) (or
+	Backend.set(Backend.scalar, Vector3)) has been called.
+	'''
+	__slots__ = ('_x','_y','_z')
+	_is_scalar = True
+
+	def __init__(self, x_other, y=None, z=0) -> None:
+		if y is not None and type(x_other) in _numbers and type(y) in _numbers and type(z) in _numbers:
+			self._x = float(x_other)
+			self._y = float(y)
+			self._z = float(z)
+		else:
+			Vector3.__init__(self, x_other, y, z)
+
+	#----Main Properties----
+	@property
+	def _value(self) -> np.ndarray:
+		return np.array((self._x, self._y, self._z))
+	@_value.setter
+	def _value(self, value:Union[np.ndarray, List[float]]) -> None:
+		if isinstance(value, np.ndarray):
+			value = value.tolist()
+		self._x, self._y, self._z = (float(v) for v in value)
+
+	@property
+	def x(self) -> float:
+		return self._x
+	@x.setter
+	def x(self, x:float) -> None:
+		self._x = float(x)
+
+	@property
+	def y(self) -> float:
+		return self._y
+	@y.setter
+	def y(self, y:float) -> None:
+		self._y = float(y)
+
+	@property
+	def z(self) -> float:
+		return self._z
+	@z.setter
+	def z(self, z:float) -> None:
+		self._z = float(z)
+
+	#----Casting----
+	@classmethod
+	def _from_components(cls, values:Tuple[float,float,float]) -> 'ScalarVector3':
+		newVec = object.__new__(cls)
+		newVec._x, newVec._y, newVec._z = values
+		return newVec
+
+	def _components(self) -> Tuple[float,float,float]:
+		return (self._x, self._y, self._z)
+
+	def _set_components(self, values:Tuple[float,float,float]) -> None:
+		self._x, self._y, self._z = values
+
+	_assign = _set_components
+
+	#----Functions----
+	@property
+	def sq_magnitude(self) -> float:
+		''' Returns squared length of this vector '''
+		return self._x*self._x + self._y*self._y + self._z*self._z
+
+	@property
+	def magnitude(self) -> float:
+		''' Returns the length of this vector '''
+		return math.sqrt(self._x*self._x + self._y*self._y + self._z*self._z)
+
+	@property
+	def normalized(self) -> 'ScalarVector3':
+		m = self.magnitude
+		return ScalarVector3._from_components((divide(self._x, m), divide(self._y, m), divide(self._z, m)))
+
+	def __eq__(self, other:Vector3) -> bool:
+		rtol, atol = self.rtol, self.atol
+		for a, b in zip((self._x, self._y, self._z), other._components()):
+			#same test as numpy.isclose
+			if a != b and not abs(a - b) <= atol + rtol*abs(b):
+				return False
+		return True
+	def __ne__(self, other:Vector3) -> bool:
+		return not self == other
+
+	def __getitem__(self, index:int) -> float:
+		return (self._x, self._y, self._z)[index]
+	def __setitem__(self, index:int, value:float) -> None:
+		values = [self._x, self._y, self._z]
+		values[index] = float(value)
+		self._x, self._y, self._z = values
+
+	def __iter__(self) -> Iterator[float]:
+		return iter((self._x, self._y, self._z))
+	def __len__(self) -> int:
+		return 3
+
+	def __hash__(self) -> int:
+		return hash((self._x, self._y, self._z))
+
+	#----Operators----
+	def __add__(self, other:Vector3) -> Vector3:
+		if not isinstance(other, Vector3):
+			return NotImplemented
+		x, y, z = other._components()
+		return ScalarVector3._from_components((self._x + x, self._y + y, self._z + z))
+	def __iadd__(self, other:Vector3) -> Vector3:
+		if not isinstance(other, Vector3):
+			return NotImplemented
+		x, y, z = other._components()
+		self._x += x
+		self._y += y
+		self._z += z
+		return self
+	def __sub__(self, other:Vector3) -> Vector3:
+		if not isinstance(other, Vector3):
+			return NotImplemented
+		x, y, z = other._components()
+		return ScalarVector3._from_components((self._x - x, self._y - y, self._z - z))
+	def __isub__(self, other:Vector3) -> Vector3:
+		if not isinstance(other, Vector3):
+			return NotImplemented
+		x, y, z = other._components()
+		self._x -= x
+		self._y -= y
+		self._z -= z
+		return self
+
+	def __mul__(self, other:Union[float,int,Vector3]) -> Vector3:
+		if isinstance(other, (float,int)):
+			return ScalarVector3._from_components((self._x*other, self._y*other, self._z*other))
+		elif isinstance(other, Vector3):
+			x, y, z = other._components()
+			return ScalarVector3._from_components((self._x*x, self._y*y, self._z*z))
+		return NotImplemented
+	def __imul__(self, other:Union[float,int,Vector3]) -> Vector3:
+		if isinstance(other, (float,int)):
+			x = y = z = other
+		elif isinstance(other, Vector3):
+			x, y, z = other._components()
+		else:
+			return NotImplemented
+		self._x *= x
+		self._y *= y
+		self._z *= z
+		return self
+	def __rmul__(self, other:Union[float,int]) -> Vector3:
+		return self * other
+
+	def __rtruediv__(self, other:float) -> Vector3:
+		if math.isclose(other,0.0):
+			return ScalarVector3._from_components((math.nan, math.nan, math.nan))
+		return ScalarVector3._from_components((divide(other, self._x), divide(other, self._y), divide(other, self._z)))
+	def __truediv__(self, other:float) -> Vector3:
+		if math.isclose(other,0.0):
+			return ScalarVector3._from_components((math.nan, math.nan, math.nan))
+		return ScalarVector3._from_components((self._x/other, self._y/other, self._z/other))
+	def __itruediv__(self, other:float) -> Vector3:
+		if math.isclose(other,0.0):
+			self._x = self._y = self._z = math.nan
+		else:
+			self._x /= other
+			self._y /= other
+			self._z /= other
+		return self
+
+	def __neg__(self) -> Vector3:
+		return ScalarVector3._from_components((-self._x, -self._y, -self._z))
+
+	def __str__(self) -> str:
+		return str.format('({0}, {1}, {2})', self._x, self._y, self._z)
+
+_numbers = (float, int)
+
+scalar_types[Vector3] = ScalarVector3
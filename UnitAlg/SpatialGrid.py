@@ -0,0 +1,312 @@
+from UnitAlg.Vector3Array import Vector3Array
+from typing import List, Tuple, Union
+import numpy as np
+
+from UnitAlg import Vector3
+
+class SpatialGrid():
+	'''
+	A uniform grid over points for k nearest, radius and box queries.
+
+	Points are bucketed into cubic cells of cell_size, and kept as a
+	list of point ids sorted by cell, so finding a cell's points is a
+	binary search and queries for many points at once are a handful of
+	vectorized calls. Inserting merges into the sorted ids, removing only
+	marks points dead (compacting once half of them are), so both are
+	cheap to do incrementally.
+
+	Queries return point ids, the row each point had in the buffer the
+	grid was built from, continued by insert for points added later.
+	'''
+	def __init__(self, points:Union[Vector3Array,List[Vector3],np.ndarray]=None, cell_size:float=1.0) -> None:
+		if not cell_size > 0:
+			raise ValueError("cell_size must be positive, got {}".format(cell_size))
+		self.cell_size = float(cell_size)
+		self._points = np.empty((0,3), dtype=np.float64)
+		self._alive = np.empty(0, dtype=bool)
+		self._count = 0
+		#point ids sorted by the key of their cell, and those keys:
+		self._ids = np.empty(0, dtype=np.int64)
+		self._keys = np.empty(0, dtype=np.int64)
+		if points is not None:
+			self.insert(points)
+
+	#----Main Properties----
+	@property
+	def points(self) -> Vector3Array:
+		''' Every point ever inserted, by id (including removed ones) '''
+		return Vector3Array._from_np(np.array(self._points[:self._count]))
+
+	@property
+	def ids(self) -> np.ndarray:
+		''' Ids of the points currently in the grid '''
+		return np.flatnonzero(self._alive[:self._count])
+
+	#----Functions----
+	def insert(self, points:Union[Vector3Array,Vector3,List[Vector3],np.ndarray]) -> np.ndarray:
+		'''
+		Adds points to the grid, returning their ids.
+		'''
+		points = Vector3Array._buffer(points)
+		#validated before anything changes, so a rejected insert leaves the grid as it was:
+		keys = self._cell_keys(self._cells(points))
+		ids = np.arange(self._count, self._count + len(points))
+		if self._count + len(points) > len(self._points):
+			capacity = max(2*len(self._points), self._count + len(points))
+			for name in ('_points', '_alive'):
+				old = getattr(self, name)
+				new = np.zeros((capacity,)+old.shape[1:], dtype=old.dtype)
+				new[:self._count] = old[:self._count]
+				setattr(self, name, new)
+		self._points[ids] = points
+		self._alive[ids] = True
+		self._count += len(points)
+
+		order = np.argsort(keys, kind='stable')
+		keys, ids_sorted = keys[order], ids[order]
+		at = np.searchsorted(self._keys, keys, side='right')
+		self._keys = np.insert(self._keys, at, keys)
+		self._ids = np.insert(self._ids, at, ids_sorted)
+		return ids
+
+	def remove(self, ids:Union[int,np.ndarray]) -> None:
+		'''
+		Removes the points with ids from the grid.
+		'''
+		self._alive[np.asarray(ids)] = False
+		#drop dead ids from the sorted lists once they are most of them:
+		alive = self._alive[self._ids]
+		if np.count_nonzero(alive) < len(alive)//2:
+			self._ids = self._ids[alive]
+			self._keys = self._keys[alive]
+
+	def nearest(self, queries:Union[Vector3Array,Vector3,np.ndarray], k:int=1) -> Tuple[np.ndarray,np.ndarray]:
+		'''
+		Returns the ids of and distances to the k nearest points of each query,
+		as (Q,k) arrays sorted nearest first, or (k,) arrays for a single Vector3.
+
+		Missing neighbours (fewer than k points in the grid) have id -1 and distance inf.
+		'''
+		q = Vector3Array._buffer(queries)
+		ids = np.full((len(q),k), -1, dtype=np.int64)
+		distances = np.full((len(q),k), np.inf)
+		cells = self._cells(q)
+		remaining = np.arange(len(q))
+		living = self._ids[self._alive[self._ids]]
+		if len(living) > 0:
+			#how many cells each query is from the cells holding points, (rings smaller than that find nothing):
+			living_cells = self._cells(self._points[living])
+			gap = np.maximum(living_cells.min(axis=0) - cells, cells - living_cells.max(axis=0)).max(axis=1).clip(0)
+		ring = 1
+		while len(remaining) > 0 and len(living) > 0:
+			offsets = _cube(ring)
+			if len(offsets) >= len(living):
+				#the cube has more cells than there are points, so just check them all:
+				chunk = max(1, _max_pairs // len(living))
+				living_points = self._points[living].T.copy()
+				for start in range(0, len(remaining), chunk):
+					rows = remaining[start:start+chunk]
+					ids[rows], distances[rows] = _brute_force(q[rows], living, living_points, k)
+				break
+			reached = gap[remaining] <= ring
+			if not np.any(reached):
+				ring *= 2
+				continue
+			searched = remaining[reached]
+			found = np.zeros(len(searched), dtype=bool)
+			chunk = max(1, _max_pairs // len(offsets))
+			for start in range(0, len(searched), chunk):
+				rows = searched[start:start+chunk]
+				query_index, point_ids = self._candidates(cells[rows], offsets)
+				best_ids, best_distances = self._k_best(q, (rows[query_index], point_ids), k, rows)
+				#the cube holds every point within ring cells of the query, so
+				#the k best are final once the k-th is that close:
+				done = (best_ids[:,-1] >= 0) & (best_distances[:,-1] <= ring*self.cell_size)
+				ids[rows[done]] = best_ids[done]
+				distances[rows[done]] = best_distances[done]
+				found[start:start+chunk] = done
+			#(kept in order, _k_best needs its rows sorted)
+			reached[reached] = found
+			remaining = remaining[~reached]
+			ring *= 2
+		if isinstance(queries, Vector3):
+			return ids[0], distances[0]
+		return ids, distances
+
+	def radius(self, queries:Union[Vector3Array,Vector3,np.ndarray], radius:float) -> Union[List[np.ndarray],np.ndarray]:
+		'''
+		Returns the ids of the points within radius of each query, sorted nearest
+		first, as a list of arrays (or one array for a single Vector3).
+		'''
+		if not radius >= 0:
+			raise ValueError("radius must not be negative, got {}".format(radius))
+		q = Vector3Array._buffer(queries)
+		query_index, point_ids = self._box_candidates(q - radius, q + radius)
+		difference = self._points[point_ids] - q[query_index]
+		sq_distances = np.einsum('ij,ij->i', difference, difference)
+		inside = sq_distances <= radius*radius
+		query_index, point_ids, sq_distances = query_index[inside], point_ids[inside], sq_distances[inside]
+		order = np.lexsort((sq_distances, query_index))
+		result = np.split(point_ids[order], np.searchsorted(query_index[order], np.arange(1, len(q))))
+		if isinstance(queries, Vector3):
+			return result[0]
+		return result
+
+	def box(self, lows:Union[Vector3Array,Vector3,np.ndarray], highs:Union[Vector3Array,Vector3,np.ndarray]) -> Union[List[np.ndarray],np.ndarray]:
+		'''
+		Returns the ids of the points inside each axis aligned box (bounds included),
+		as a list of arrays (or one array for a single Vector3 pair).
+		'''
+		l = Vector3Array._buffer(lows)
+		h = Vector3Array._buffer(highs)
+		l, h = np.broadcast_arrays(l, h)
+		query_index, point_ids = self._box_candidates(l, h)
+		order = np.lexsort((point_ids, query_index))
+		result = np.split(point_ids[order], np.searchsorted(query_index[order], np.arange(1, len(l))))
+		if isinstance(lows, Vector3) and isinstance(highs, Vector3):
+			return result[0]
+		return result
+
+	def _cells(self, points:np.ndarray) -> np.ndarray:
+		return np.floor(points / self.cell_size).astype(np.int64)
+
+	@staticmethod
+	def _cell_keys(cells:np.ndarray) -> np.ndarray:
+		''' Packs (N,3) cell coordinates into one int64 each, 21 bits per axis '''
+		shifted = cells + _key_offset
+		if np.any(shifted < 0) or np.any(shifted >= 2*_key_offset):
+			raise ValueError("points are more than {} cells from the origin, use a bigger cell_size".format(_key_offset))
+		return (shifted[:,0] << 42) | (shifted[:,1] << 21) | shifted[:,2]
+
+	def _candidates(self, cells:np.ndarray, offsets:np.ndarray) -> Tuple[np.ndarray,np.ndarray]:
+		'''
+		Returns (query index, point id) pairs of the living points in cells+offsets of each query.
+		'''
+		neighbours = (cells[:,None,:] + offsets[None,:,:]).reshape(-1,3)
+		keys = self._cell_keys(neighbours)
+		starts = np.searchsorted(self._keys, keys, side='left')
+		counts = np.searchsorted(self._keys, keys, side='right') - starts
+		#expand each [start, start+count) run of sorted ids:
+		total = int(counts.sum())
+		run_starts = np.cumsum(counts) - counts
+		positions = np.arange(total) - np.repeat(run_starts - starts, counts)
+		query_index = np.repeat(np.arange(len(neighbours)) // len(offsets), counts)
+		point_ids = self._ids[positions]
+		alive = self._alive[point_ids]
+		return query_index[alive], point_ids[alive]
+
+	def _box_candidates(self, l:np.ndarray, h:np.ndarray) -> Tuple[np.ndarray,np.ndarray]:
+		'''
+		Returns (query index, point id) pairs of the living points inside each of the
+		(Q,3) boxes l to h (bounds included), in no particular order.
+
+		Boxes spanning fewer cells than there are points look up each of their
+		cells, bigger ones test every point, at most _max_pairs at a time.
+		'''
+		pairs = [(np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64))]
+		living = self._ids[self._alive[self._ids]]
+		if len(living) > 0:
+			living_points = self._points[living]
+			living_cells = self._cells(living_points)
+			#no need to look in cells past the points' bounds, (kept as floats until then, boxes may be huge):
+			low_cells = np.maximum(np.floor(l / self.cell_size), living_cells.min(axis=0))
+			high_cells = np.minimum(np.floor(h / self.cell_size), living_cells.max(axis=0))
+			dims = np.maximum(high_cells - low_cells + 1, 0)
+			sizes = np.prod(dims, axis=1)
+
+			looked_up = np.flatnonzero((sizes > 0) & (sizes < len(living)))
+			corners, box_dims, box_sizes = low_cells[looked_up].astype(np.int64), dims[looked_up].astype(np.int64), sizes[looked_up].astype(np.int64)
+			ends = np.cumsum(box_sizes)
+			start = 0
+			while start < len(looked_up):
+				end = max(start+1, int(np.searchsorted(ends, ends[start] - box_sizes[start] + _max_pairs, side='right')))
+				#every cell of these boxes, the i-th of a box at its low corner + unravel(i, dims):
+				counts = box_sizes[start:end]
+				box = np.repeat(np.arange(start, end), counts)
+				i = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+				yz = box_dims[box,1]*box_dims[box,2]
+				cells = np.stack([i // yz, (i % yz) // box_dims[box,2], i % box_dims[box,2]], axis=1) + corners[box]
+				cell_index, point_ids = self._candidates(cells, np.zeros((1,3), dtype=np.int64))
+				query_index = looked_up[box[cell_index]]
+				p = self._points[point_ids]
+				inside = np.all((p >= l[query_index]) & (p <= h[query_index]), axis=1)
+				pairs.append((query_index[inside], point_ids[inside]))
+				start = end
+
+			tested = np.flatnonzero(sizes >= len(living))
+			chunk = max(1, _max_pairs // len(living))
+			for start in range(0, len(tested), chunk):
+				boxes = tested[start:start+chunk]
+				inside = np.ones((len(boxes), len(living)), dtype=bool)
+				for axis in range(3):
+					inside &= (living_points[None,:,axis] >= l[boxes,axis,None]) & (living_points[None,:,axis] <= h[boxes,axis,None])
+				box_index, point_index = np.nonzero(inside)
+				pairs.append((boxes[box_index], living[point_index]))
+		return np.concatenate([query_index for query_index, _ in pairs]), np.concatenate([point_ids for _, point_ids in pairs])
+
+	def _k_best(self, q:np.ndarray, pairs:Tuple[np.ndarray,np.ndarray], k:int, rows:np.ndarray) -> Tuple[np.ndarray,np.ndarray]:
+		'''
+		Returns the (len(rows),k) ids and distances of the k closest of each row's
+		candidate pairs, which must come grouped by row in the order of rows.
+		'''
+		query_index, point_ids = pairs
+		ids = np.full((len(rows),k), -1, dtype=np.int64)
+		best = np.full((len(rows),k), np.inf)
+		if len(query_index) == 0:
+			return ids, best
+		difference = self._points[point_ids] - q[query_index]
+		distances = np.sqrt(np.einsum('ij,ij->i', difference, difference))
+		#sort by distance within each row's group with one float key, (much faster than a lexsort):
+		row = np.searchsorted(rows, query_index)
+		order = np.argsort(row * (distances.max()*2 + 1) + distances)
+		row, point_ids, distances = row[order], point_ids[order], distances[order]
+		#rank of each pair within its row:
+		starts = np.flatnonzero(np.diff(row, prepend=-1))
+		rank = np.arange(len(row)) - np.repeat(starts, np.diff(starts, append=len(row)))
+		keep = rank < k
+		ids[row[keep], rank[keep]] = point_ids[keep]
+		best[row[keep], rank[keep]] = distances[keep]
+		return ids, best
+
+	#----Operators----
+	def __getitem__(self, id:int) -> Vector3:
+		return Vector3(self._points[id])
+
+	def __contains__(self, id:int) -> bool:
+		return 0 <= id < self._count and bool(self._alive[id])
+
+	def __len__(self) -> int:
+		return int(np.count_nonzero(self._alive[:self._count]))
+
+	def __str__(self) -> str:
+		return 'SpatialGrid({} points, cell_size:{})'.format(len(self), self.cell_size)
+	def __repr__(self) -> str:
+		return self.__str__()
+
+_key_offset = 1 << 20
+#most (query, point) pairs, or (query, cell) pairs, checked at once:
+_max_pairs = 1 << 22
+
+def _brute_force(q:np.ndarray, candidates:np.ndarray, candidate_points:np.ndarray, k:int) -> Tuple[np.ndarray,np.ndarray]:
+	''' Returns the (Q,k) ids and distances of the k closest candidates (with (3,C) points) to each of q '''
+	sq_distances = np.zeros((len(q), len(candidates)))
+	for axis in range(3):
+		sq_distances += np.square(candidate_points[axis][None,:] - q[:,axis,None])
+	count = min(k, len(candidates))
+	if count < len(candidates):
+		closest = np.argpartition(sq_distances, count-1, axis=1)[:,:count]
+	else:
+		closest = np.broadcast_to(np.arange(count), (len(q),count))
+	closest_distances = np.take_along_axis(sq_distances, closest, axis=1)
+	order = np.argsort(closest_distances, axis=1, kind='stable')
+	ids = np.full((len(q),k), -1, dtype=np.int64)
+	distances = np.full((len(q),k), np.inf)
+	ids[:,:count] = candidates[np.take_along_axis(closest, order, axis=1)]
+	distances[:,:count] = np.sqrt(np.take_along_axis(closest_distances, order, axis=1))
+	return ids, distances
+
+def _cube(ring:int) -> np.ndarray:
+	''' Cell offsets of the (2*ring+1)^3 cube around a cell '''
+	r = np.arange(-ring, ring+1)
+	return np.stack(np.meshgrid(r, r, r, indexing='ij'), axis=-1).reshape(-1,3)
+
@@ -1,16 +1,59 @@
 from UnitAlg.helpers import *
 from typing import Union, List, overload
+from enum import IntEnum
 import numpy as np
 import numpy.linalg as LA
 import math
 
 from UnitAlg import Vector3, Quaternion
+from UnitAlg.BaseVector import BaseVector
+from UnitAlg.ArrayInterop import ArrayInterop
 from UnitAlg.CoordinateFrame import *
 
-class Transform():
+class TransformKind(IntEnum):
+	'''
+	What a Transform's matrix is known to hold, each kind including those before it.
+	
+	Set by the factories and setters and kept through products, so
+	inverse can use the closed form for the kind instead of a full 4x4 inverse.
+	'''
+	identity=0
+	translation=1
+	rigid=2 #orthonormal 3x3 (rotation or reflection) + translation
+	TRS=3 #3x3 with orthogonal columns (rotation * scale) + translation
+	affine=4 #any 3x3 + translation, bottom row 0,0,0,1
+	projective=5
+	
+	@staticmethod
+	def of_product(a:'TransformKind', b:'TransformKind') -> 'TransformKind':
+		''' The kind of a*b '''
+		#a scale followed by a rotation shears, so isn't TRS anymore:
+		if a is _TRS and (b is _rigid or b is _TRS):
+			return _affine
+		return a if a >= b else b
+	
+	@staticmethod
+	def of_matrix(mat:np.ndarray) -> 'TransformKind':
+		''' The most general kind a matrix could be, from its bottom row '''
+		if mat[3].tolist() == [0.0, 0.0, 0.0, 1.0]:
+			return _affine
+		return _projective
+
+#enum member lookups are slow, and kinds are checked on every product and inverse:
+_identity = TransformKind.identity
+_translation = TransformKind.translation
+_rigid = TransformKind.rigid
+_TRS = TransformKind.TRS
+_affine = TransformKind.affine
+_projective = TransformKind.projective
+
+class Transform(ArrayInterop):
 	rtol=1e-12
 	atol=1e-11
 	
+	_array_shape = (4,4)
+	_array_readonly = True
+	
 	@overload
 	def __init__(self, vec:Vector3, rot:Quaternion, scale:Vector3=Vector3(1,1,1)) -> None: ...
 	@overload
@@ -18,15 +61,15 @@ class Transform():
 	
 	def __init__(self, *args):
 		if len(args) == 0:
-			self.mat = np.identity(4)
+			self._set_identity()
 		elif len(args) == 1:
 			self.mat = args[0]
 		elif len(args) == 2:
-			self.mat = np.identity(4)
+			self._set_identity()
 			self.translation = args[0]
 			self.rotation = args[1]
 		elif len(args) == 3:
-			self.mat = np.identity(4)
+			self._set_identity()
 			self.translation = args[0]
 			self.rotation = args[1]
 			self.localScale = args[2]
@@ -35,9 +78,8 @@ class Transform():
 	
 	@staticmethod
 	def conversion_from_to(frame1:CoordinateFrame, frame2:CoordinateFrame) -> 'Transform':
-		f1 = Transform(frame_directions[frame1].rotation_matrix())
-		f2 = Transform(frame_directions[frame2].rotation_matrix())
-		return  f2* f1.inverse
+		#frames are signed permutations of the axes, so rigid:
+		return Transform._from_np(frame_conversions[(frame1, frame2)].mat, _rigid)
 	
 	@classproperty
 	def identity() -> 'Transform':
@@ -114,7 +156,67 @@ class Transform():
 			m[0:3,0:3] = mat
 			self._mat = m
 		else:
-			raise ValueError("Expected 4x4 or 3x3 matrix, got "+mat.shape)
+			raise ValueError("Expected 4x4 or 3x3 matrix, got "+str(mat.shape))
+		self._kind = TransformKind.of_matrix(self._mat)
+		self._changed()
+	
+	def _set_identity(self) -> None:
+		self._mat = np.identity(4)
+		self._kind = _identity
+		self._changed()
+	
+	@property
+	def kind(self) -> TransformKind:
+		''' What this transform's matrix is known to hold, see TransformKind '''
+		return self._kind
+	
+	#----Cached Decomposition----
+	def _changed(self) -> None:
+		'''
+		Drops the cached scale and rotation, call after writing to _mat.
+		(translation is read straight from the matrix, so is never cached)
+		'''
+		self._scale = None
+		self._rotation_mat = None
+		self._rotation = None
+	
+	def _get_scale(self) -> np.ndarray:
+		if self._scale is None:
+			self._scale = LA.norm(self._mat[0:3,0:3], axis=0)
+		return self._scale
+	
+	def _get_rotation_mat(self) -> np.ndarray:
+		if self._rotation_mat is None:
+			self._rotation_mat = self._mat[0:3,0:3] / self._get_scale()
+		return self._rotation_mat
+	
+	def _get_rotation(self) -> np.ndarray:
+		if self._rotation is None:
+			self._rotation = Quaternion.from_rotation_matrix(self._get_rotation_mat()).normalized.value
+		return self._rotation
+	
+	def _direction(self, name:str) -> Vector3:
+		''' Reads a direction of the current coordinate frame out of the rotation matrix '''
+		column, sign = BaseVector._frame_constants().axes[name]
+		return Vector3._from_np(self._get_rotation_mat()[:,column] * sign)
+
+	#----Casting----
+	@classmethod
+	def _from_np(cls, mat:np.ndarray, kind:TransformKind=None) -> 'Transform':
+		newTransform = cls.__new__(cls)
+		newTransform._mat = mat
+		newTransform._kind = TransformKind.of_matrix(mat) if kind is None else kind
+		newTransform._scale = None
+		newTransform._rotation_mat = None
+		newTransform._rotation = None
+		return newTransform
+
+	def _array_buffer(self) -> np.ndarray:
+		return self._mat
+
+	def _array_written(self, buffer:np.ndarray) -> None:
+		self._kind = TransformKind.of_matrix(self._mat)
+		self._changed()
 
 	@property
 	def coefficients_2d(self) -> List[List[float]]:
@@ -136,30 +238,33 @@ class Transform():
 
 	@property
 	def translation(self) -> Vector3:
-		return Vector3._from_np(self.mat[0:3,3])
+		return Vector3._from_np(self._mat[0:3,3].copy())
 	@translation.setter
 	def translation(self, new_translation: Vector3) -> None:
-		self._mat[0:3,3] = new_translation.value
+		self._mat[0:3,3] = new_translation._value
+		if self._kind is _identity:
+			self._kind = _translation
 	
 	@property
 	def localScale(self) -> Vector3:
 		'''
 		Gets the positive local scale from the transform matrix, does not handle negative scale.
 		'''
-		m = self._mat
-		return Vector3._from_np(LA.norm([m[0:3,0], m[0:3,1], m[0:3,2]], axis=1))
+		return Vector3._from_np(self._get_scale().copy())
 	@localScale.setter
 	def localScale(self, new_localScale:Vector3) -> None:
-		current_localScale = self.localScale
-		self._mat[0:3,0:3] = (self._mat[0:3,0:3]/current_localScale.value)*new_localScale.value
+		self._mat[0:3,0:3] *= new_localScale._value/self._get_scale()
+		if self._kind < _TRS:
+			self._kind = _TRS
+		self._changed()
 	
 	@property
 	def rotation_mat(self) -> np.ndarray:
-		return self._mat[0:3,0:3] / self.localScale._value
+		return self._get_rotation_mat().copy()
 		
 	@property
 	def rotation(self) -> Quaternion:
-		return Quaternion.from_rotation_matrix(self.rotation_mat).normalized
+		return Quaternion._from_np(self._get_rotation().copy())
 
 	@rotation.setter
 	def rotation(self, rotation:Quaternion):
@@ -177,39 +282,88 @@ class Transform():
 			(                0.0,                 0.0,                 0.0, 1.0)
 			), dtype=np.float64)
 			
-		self._mat[0:3,0:3] = rot_mat[0:3, 0:3] * self.localScale._value
+		self._mat[0:3,0:3] = rot_mat[0:3, 0:3] * self._get_scale()
+		#the 3x3 is now rotation * scale:
+		if self._kind < _rigid:
+			self._kind = _rigid
+		elif self._kind is _affine:
+			self._kind = _TRS
+		self._changed()
 
 	@property
 	def inverse(self) -> 'Transform':
-		 return Transform(LA.inv(self._mat))
+		'''
+		Returns the inverse, using the closed form for this transform's kind.
+		'''
+		kind = self._kind
+		if kind is _projective:
+			return Transform._from_np(LA.inv(self._mat), kind)
+		if kind is _identity:
+			return Transform._from_np(np.identity(4), kind)
+		
+		#small enough that python floats beat numpy's per call overhead:
+		(a,b,c,x),(d,e,f,y),(g,h,i,z),_ = self._mat.tolist()
+		if kind is _translation:
+			return Transform._from_np(np.array((
+				(1.0, 0.0, 0.0, -x),
+				(0.0, 1.0, 0.0, -y),
+				(0.0, 0.0, 1.0, -z),
+				(0.0, 0.0, 0.0, 1.0))), kind)
+		
+		if kind is _rigid:
+			#R^-1 = R^T
+			a,b,c, d,e,f, g,h,i = a,d,g, b,e,h, c,f,i
+		elif kind is _TRS:
+			#(R*S)^-1 = S^-1 * R^T, so is the transpose with rows divided by the squared scales
+			sx = a*a + d*d + g*g
+			sy = b*b + e*e + h*h
+			sz = c*c + f*f + i*i
+			if sx == 0 or sy == 0 or sz == 0:
+				raise LA.LinAlgError("Singular matrix")
+			a,b,c, d,e,f, g,h,i = a/sx,d/sx,g/sx, b/sy,e/sy,h/sy, c/sz,f/sz,i/sz
+		else:
+			#adjugate over determinant
+			A, B, C = e*i - f*h, f*g - d*i, d*h - e*g
+			det = a*A + b*B + c*C
+			if det == 0:
+				raise LA.LinAlgError("Singular matrix")
+			a,b,c, d,e,f, g,h,i = (
+				A/det, (c*h - b*i)/det, (b*f - c*e)/det,
+				B/det, (a*i - c*g)/det, (c*d - a*f)/det,
+				C/det, (b*g - a*h)/det, (a*e - b*d)/det)
+		return Transform._from_np(np.array((
+			(a, b, c, -(a*x + b*y + c*z)),
+			(d, e, f, -(d*x + e*y + f*z)),
+			(g, h, i, -(g*x + h*y + i*z)),
+			(0.0, 0.0, 0.0, 1.0))), kind)
 		 
 	@property
 	def transpose(self) -> 'Transform':
-		 return Transform(self._mat.T)
+		 return Transform._from_np(self._mat.T.copy())
 	
 	@property
 	def forward(self) -> Vector3:
-		return self.rotation*Vector3.forward
+		return self._direction('forward')
 	
 	@property
 	def back(self) -> Vector3:
-		return self.rotation*Vector3.back
+		return self._direction('back')
 		
 	@property
 	def up(self) -> Vector3:
-		return self.rotation*Vector3.up
+		return self._direction('up')
 	
 	@property
 	def down(self) -> Vector3:
-		return self.rotation*Vector3.down
+		return self._direction('down')
 		
 	@property
 	def right(self) -> Vector3:
-		return self.rotation*Vector3.right
+		return self._direction('right')
 		
 	@property
 	def left(self) -> Vector3:
-		return self.rotation*Vector3.left
+		return self._direction('left')
  
 	#----Operators----
 	def __str__(self) -> str:
@@ -217,28 +371,55 @@ class Transform():
 	def __repr__(self) -> str:
 		return self._mat.__repr__()
 	
+	@staticmethod
+	def multiply(a:'Transform', b:'Transform', out:'Transform'=None) -> 'Transform':
+		'''
+		Composes a*b, written into out when given (which may be a or b).
+		'''
+		kind = TransformKind.of_product(a._kind, b._kind)
+		if out is None:
+			return Transform._from_np(np.matmul(a._mat, b._mat), kind)
+		np.matmul(a._mat, b._mat, out=out._mat)
+		out._kind = kind
+		out._changed()
+		return out
+	
+	def apply(self, vector:Vector3, out:Vector3=None) -> Vector3:
+		'''
+		Transforms vector as a point, written into out when given (which may be vector).
+		'''
+		m = self._mat
+		if out is None:
+			return Vector3._from_np(np.dot(m[0:3,0:3], vector._value) + m[0:3,3])
+		if out._is_scalar:
+			out._assign((np.dot(m[0:3,0:3], vector._value) + m[0:3,3]).tolist())
+			return out
+		np.matmul(m[0:3,0:3], vector._value, out=out._value)
+		out._value += m[0:3,3]
+		return out
+	
 	@overload
 	def __mul__(self, other:'Transform') -> 'Transform': ...
 	@overload
 	def __mul__(self, other:Vector3) -> Vector3: ...
 	def __mul__(self, other):
 		if isinstance(other, Transform):
-			return Transform(np.matmul( self._mat, other._mat) )
+			return Transform.multiply(self, other)
 		elif isinstance(other, Vector3):
-			v4 = np.array([*other._value, 1])
-			v4 = np.dot(self._mat,v4)
-			return Vector3(v4[:3])
-		else:
-			raise ValueError("Transforms can only be multiplied by Vector3's and Transforms, not "+type(other))
+			return self.apply(other)
+		return NotImplemented
 	def __rmul__(self, other:'Transform') -> 'Transform':
-		return Transform(np.matmul( other._mat, self._mat) )
+		return Transform._from_np(np.matmul( other._mat, self._mat), TransformKind.of_product(other._kind, self._kind))
+	def __imul__(self, other:'Transform') -> 'Transform':
+		if isinstance(other, Transform):
+			return Transform.multiply(self, other, out=self)
+		return NotImplemented
 
 	def __eq__(self,other:'Transform') -> bool:
-		#TODO: speed improvement, flatten coppies
-		return all(np.isclose(self._mat.flatten(), other._mat.flatten(), rtol=self.rtol, atol=self.atol))
+		return bool(np.all(np.isclose(self._mat, other._mat, rtol=self.rtol, atol=self.atol)))
 
 	def __ne__(self,other:'Transform') -> bool:
-		return any(not np.isclose(m1,m2, rtol=self.rtol, atol=self.atol) for m1,m2 in zip(self._mat.flatten(), other._mat.flatten()))
+		return not self == other
 
 if __name__ == '__main__':
 	print(Quaternion.from_euler(0,0,math.pi/2))
@@ -0,0 +1,219 @@
+from UnitAlg.Vector3Array import Vector3Array
+from UnitAlg.QuaternionArray import QuaternionArray
+from UnitAlg.ArrayInterop import ArrayInterop
+from UnitAlg.helpers import *
+from typing import Iterator, List, Sequence, Union, overload
+import numpy as np
+import numpy.linalg as LA
+
+from UnitAlg import Vector3, Quaternion, Transform
+
+class TransformArray(ArrayInterop):
+	'''
+	A stack of Transform's stored as one contiguous (N,4,4) float64 buffer.
+
+	Products broadcast one against many as well as many against many,
+	and points are transformed without building homogeneous copies.
+	'''
+	rtol=Transform.rtol
+	atol=Transform.atol
+
+	_array_shape = (-1,4,4)
+	#ndarray * TransformArray still uses our reflected operators:
+	_ufunc_operators = True
+
+	@overload
+	def __init__(self, mats:np.ndarray) -> None: ...
+	@overload
+	def __init__(self, transforms:Sequence[Transform]) -> None: ...
+
+	def __init__(self, values) -> None:
+		if isinstance(values, TransformArray):
+			self.mat = values._mat
+		elif isinstance(values, (list, tuple)) and len(values) > 0 and isinstance(values[0], Transform):
+			mat = np.empty((len(values),4,4), dtype=np.float64)
+			for i, t in enumerate(values):
+				mat[i] = t._mat
+			self._mat = mat
+		elif isinstance(values, (np.ndarray, list, tuple)):
+			self.mat = values
+		else:
+			raise ValueError("init can only take a (N,4,4) or (N,3,3) numpy array or a list of Transform's, not "+str(type(values)))
+
+	@staticmethod
+	def identity(count:int) -> 'TransformArray':
+		return TransformArray._from_np(np.tile(np.identity(4), (count,1,1)))
+
+	@staticmethod
+	def Translate(translations:Union[Vector3Array,np.ndarray]) -> 'TransformArray':
+		translations = Vector3Array._buffer(translations)
+		t = TransformArray.identity(len(translations))
+		t._mat[:,0:3,3] = translations
+		return t
+
+	@staticmethod
+	def Rotate(rotations:QuaternionArray) -> 'TransformArray':
+		t = TransformArray.identity(len(rotations))
+		t._mat[:,0:3,0:3] = rotations.normalized.rotation_matrix
+		return t
+
+	@staticmethod
+	def Scale(scales:Union[Vector3Array,np.ndarray]) -> 'TransformArray':
+		scales = Vector3Array._buffer(scales)
+		t = TransformArray.identity(len(scales))
+		t._mat[:,[0,1,2],[0,1,2]] = scales
+		return t
+
+	@staticmethod
+	def TR(translations:Union[Vector3Array,Vector3,np.ndarray], rotations:Union[QuaternionArray,Quaternion]) -> 'TransformArray':
+		return TransformArray.TRS(translations, rotations, Vector3.one)
+
+	@staticmethod
+	def TRS(translations:Union[Vector3Array,Vector3,np.ndarray], rotations:Union[QuaternionArray,Quaternion], scales:Union[Vector3Array,Vector3,np.ndarray]) -> 'TransformArray':
+		'''
+		Builds translation*rotation*scale matrices in one pass,
+		broadcasting any single Vector3 or Quaternion.
+		'''
+		translations = Vector3Array._buffer(translations)
+		scales = Vector3Array._buffer(scales)
+		rotations = QuaternionArray._from_np(np.atleast_2d(rotations._value)).normalized
+		count = np.broadcast(translations[...,0], scales[...,0], rotations._value[:,0]).shape[0]
+		t = TransformArray.identity(count)
+		t._mat[:,0:3,0:3] = rotations.rotation_matrix * scales[:,None,:]
+		t._mat[:,0:3,3] = translations
+		return t
+
+	#----Main Properties----
+	@property
+	def mat(self) -> np.ndarray:
+		return np.array(self._mat)
+	@mat.setter
+	def mat(self, new_mat:Union[np.ndarray, List[List[List[float]]]]) -> None:
+		mat = np.array(new_mat, dtype=np.float64, order='C')
+		if mat.ndim == 2:
+			mat = mat[None]
+		if mat.shape[1:] == (4,4):
+			self._mat = mat
+		elif mat.shape[1:] == (3,3):
+			m = np.tile(np.identity(4), (len(mat),1,1))
+			m[:,0:3,0:3] = mat
+			self._mat = m
+		else:
+			raise ValueError("Expected (N,4,4) or (N,3,3) matrices, got "+str(mat.shape))
+
+	@property
+	def translation(self) -> Vector3Array:
+		return Vector3Array._from_np(np.array(self._mat[:,0:3,3]))
+	@translation.setter
+	def translation(self, new_translation:Union[Vector3Array,Vector3,np.ndarray]) -> None:
+		self._mat[:,0:3,3] = Vector3Array._buffer(new_translation)
+
+	@property
+	def localScale(self) -> Vector3Array:
+		'''
+		Gets the positive local scales from the transform matrices, does not handle negative scale.
+		'''
+		return Vector3Array._from_np(np.sqrt(np.einsum('nij,nij->nj', self._mat[:,0:3,0:3], self._mat[:,0:3,0:3])))
+
+	@property
+	def rotation_mat(self) -> np.ndarray:
+		return self._mat[:,0:3,0:3] / self.localScale._value[:,None,:]
+
+	@property
+	def rotation(self) -> QuaternionArray:
+		return QuaternionArray.from_rotation_matrix(self.rotation_mat).normalized
+
+	@property
+	def inverse(self) -> 'TransformArray':
+		return TransformArray._from_np(LA.inv(self._mat))
+
+	@property
+	def transpose(self) -> 'TransformArray':
+		return TransformArray._from_np(np.ascontiguousarray(self._mat.transpose((0,2,1))))
+
+	#----Casting----
+	@classmethod
+	def _from_np(cls, mat:np.ndarray) -> 'TransformArray':
+		newArr = cls.__new__(cls)
+		newArr._mat = mat
+		return newArr
+
+	def _array_buffer(self) -> np.ndarray:
+		return self._mat
+
+	def to_list(self) -> List[Transform]:
+		return [Transform(m) for m in self._mat]
+
+	#----Functions----
+	@staticmethod
+	def multiply(a:Union['TransformArray',Transform], b:Union['TransformArray',Transform]) -> 'TransformArray':
+		''' Composes each pair a*b, broadcasting single transforms. '''
+		return TransformArray._from_np(np.matmul(a._mat, b._mat).reshape((-1,4,4)))
+
+	def apply(self, points:Union[Vector3Array,Vector3,np.ndarray]) -> Vector3Array:
+		'''
+		Transforms points, one transform against many points or each transform against its own point.
+		'''
+		p = Vector3Array._buffer(points)
+		if len(self._mat) == 1:
+			m = self._mat[0]
+			return Vector3Array._from_np(p @ m[0:3,0:3].T + m[0:3,3])
+		return Vector3Array._from_np(np.einsum('nij,nj->ni', self._mat[:,0:3,0:3], np.broadcast_to(p, (len(self._mat),3))) + self._mat[:,0:3,3])
+
+	def apply_outer(self, points:Union[Vector3Array,np.ndarray]) -> np.ndarray:
+		'''
+		Transforms every point by every transform, returning a (N,M,3) array.
+		'''
+		p = Vector3Array._buffer(points)
+		return np.matmul(p, self._mat[:,0:3,0:3].transpose((0,2,1))) + self._mat[:,None,0:3,3]
+
+	def isclose(self, other:Union['TransformArray',Transform]) -> np.ndarray:
+		''' Returns a (N,) mask of which transforms are equal to other '''
+		return np.all(np.isclose(self._mat, other._mat, rtol=self.rtol, atol=self.atol), axis=(-2,-1))
+
+	#----Operators----
+	@overload
+	def __mul__(self, other:Union['TransformArray',Transform]) -> 'TransformArray': ...
+	@overload
+	def __mul__(self, other:Union[Vector3Array,Vector3]) -> Vector3Array: ...
+	def __mul__(self, other):
+		if isinstance(other, (TransformArray, Transform)):
+			return TransformArray.multiply(self, other)
+		elif isinstance(other, (Vector3Array, Vector3)):
+			return self.apply(other)
+		return NotImplemented
+	def __rmul__(self, other:Transform) -> 'TransformArray':
+		if isinstance(other, Transform):
+			return TransformArray.multiply(other, self)
+		return NotImplemented
+
+	def __eq__(self, other:'TransformArray') -> bool:
+		if not isinstance(other, TransformArray):
+			return NotImplemented
+		return self._mat.shape == other._mat.shape and bool(np.all(self.isclose(other)))
+	def __ne__(self, other:'TransformArray') -> bool:
+		return not self == other
+
+	@overload
+	def __getitem__(self, index:int) -> Transform: ...
+	@overload
+	def __getitem__(self, index:Union[slice,np.ndarray,List[int]]) -> 'TransformArray': ...
+	def __getitem__(self, index):
+		if isinstance(index, (int, np.integer)):
+			return Transform(self._mat[index])
+		return TransformArray._from_np(self._mat[index])
+	def __setitem__(self, index:Union[int,slice,np.ndarray], value:Union[Transform,'TransformArray',np.ndarray]) -> None:
+		if isinstance(value, (Transform, TransformArray)):
+			value = value._mat
+		self._mat[index] = value
+
+	def __iter__(self) -> Iterator[Transform]:
+		for i in range(len(self._mat)):
+			yield self[i]
+	def __len__(self) -> int:
+		return len(self._mat)
+
+	def __str__(self) -> str:
+		return self._mat.__str__()
+	def __repr__(self) -> str:
+		return 'TransformArray({})'.format(self._mat.__repr__())
@@ -0,0 +1,126 @@
+from UnitAlg.Vector3Array import Vector3Array
+from typing import Iterator, List, Sequence, Union, overload
+import numpy as np
+
+from UnitAlg import Vector3, Transform, TransformKind
+
+class TransformChain():
+	'''
+	A sequence of Transform's t[0]*t[1]*...*t[n-1], fused into one matrix.
+
+	Keeps the products of every prefix and suffix of the chain, so when
+	one element changes only the products between the changed element
+	and the still valid caches are recomputed (2 matrix products when a
+	single element changes), instead of the whole chain.
+	'''
+	@overload
+	def __init__(self) -> None: ...
+	@overload
+	def __init__(self, transforms:Sequence[Transform]) -> None: ...
+
+	def __init__(self, transforms:Sequence[Transform]=()) -> None:
+		self._mats:List[np.ndarray] = [np.array(t._mat) for t in transforms]
+		self._kinds:List[TransformKind] = [t._kind for t in transforms]
+		#_prefix[i] = t[0]*...*t[i-1] is valid for i <= _prefix_valid,
+		#_suffix[i] = t[i]*...*t[n-1] is valid for i >= _suffix_valid:
+		self._prefix:List[np.ndarray] = [_identity]*(len(self._mats)+1)
+		self._suffix:List[np.ndarray] = [_identity]*(len(self._mats)+1)
+		self._prefix_valid = 0
+		self._suffix_valid = len(self._mats)
+		self._last_changed = len(self._mats)-1
+		self._product:np.ndarray = None
+
+	#----Main Properties----
+	@property
+	def mat(self) -> np.ndarray:
+		''' The fused 4x4 matrix of the whole chain '''
+		return np.array(self._fused())
+
+	@property
+	def transform(self) -> Transform:
+		''' The fused chain as a single Transform '''
+		kind = TransformKind.identity
+		for k in self._kinds:
+			kind = TransformKind.of_product(kind, k)
+		return Transform._from_np(np.array(self._fused()), kind)
+
+	def _fused(self) -> np.ndarray:
+		if self._product is None:
+			mats, prefix, suffix = self._mats, self._prefix, self._suffix
+			if len(mats) == 0:
+				self._product = _identity
+				return self._product
+			
+			#split the stale part of the chain at the last changed transform,
+			#so changing that transform again only takes 2 products:
+			k = min(max(self._last_changed, self._prefix_valid), self._suffix_valid-1)
+			for i in range(self._prefix_valid, k):
+				prefix[i+1] = prefix[i] @ mats[i]
+			for i in range(self._suffix_valid-1, k, -1):
+				suffix[i] = mats[i] @ suffix[i+1]
+			self._prefix_valid = max(self._prefix_valid, k)
+			self._suffix_valid = min(self._suffix_valid, k+1)
+			self._product = prefix[k] @ mats[k] @ suffix[k+1]
+		return self._product
+
+	#----Functions----
+	def append(self, transform:Transform) -> None:
+		self._mats.append(np.array(transform._mat))
+		self._kinds.append(transform._kind)
+		self._prefix.append(_identity)
+		self._suffix.append(_identity)
+		self._changed(len(self._mats)-1)
+
+	def _changed(self, index:int) -> None:
+		#prefixes after index and suffixes up to it now include a stale transform:
+		self._prefix_valid = min(self._prefix_valid, index)
+		self._suffix_valid = max(self._suffix_valid, index+1)
+		self._last_changed = index
+		self._product = None
+
+	@overload
+	def apply(self, points:Vector3) -> Vector3: ...
+	@overload
+	def apply(self, points:Union[Vector3Array,np.ndarray]) -> Vector3Array: ...
+	def apply(self, points):
+		'''
+		Transforms points by the whole chain in a single pass.
+		'''
+		m = self._fused()
+		if isinstance(points, Vector3):
+			return Vector3._from_np(m[0:3,0:3] @ points._value + m[0:3,3])
+		p = Vector3Array._buffer(points)
+		return Vector3Array._from_np(p @ m[0:3,0:3].T + m[0:3,3])
+
+	#----Operators----
+	@overload
+	def __mul__(self, other:Vector3) -> Vector3: ...
+	@overload
+	def __mul__(self, other:Vector3Array) -> Vector3Array: ...
+	def __mul__(self, other):
+		if isinstance(other, (Vector3, Vector3Array)):
+			return self.apply(other)
+		return NotImplemented
+
+	def __getitem__(self, index:int) -> Transform:
+		return Transform._from_np(np.array(self._mats[index]), self._kinds[index])
+	def __setitem__(self, index:int, transform:Transform) -> None:
+		if index < 0:
+			index += len(self._mats)
+		self._mats[index] = np.array(transform._mat)
+		self._kinds[index] = transform._kind
+		self._changed(index)
+
+	def __iter__(self) -> Iterator[Transform]:
+		for i in range(len(self._mats)):
+			yield self[i]
+	def __len__(self) -> int:
+		return len(self._mats)
+
+	def __str__(self) -> str:
+		return 'TransformChain({} transforms)'.format(len(self._mats))
+	def __repr__(self) -> str:
+		return self.__str__()
+
+#shared, never written to:
+_identity = np.identity(4)
@@ -0,0 +1,260 @@
+from UnitAlg.QuaternionArray import QuaternionArray
+from UnitAlg.TransformArray import TransformArray
+from typing import Iterator, List, Optional
+import numpy as np
+
+from UnitAlg import Vector3, Quaternion, Transform, TransformKind
+
+class TransformNode():
+	'''
+	A node of a TransformTree, with a local translation, rotation and
+	scale relative to its parent.
+
+	Nodes are handles into their tree's buffers, so are cheap to keep
+	around, and setting any local value only marks the node's subtree dirty.
+	'''
+	def __init__(self, tree:'TransformTree', index:int) -> None:
+		self.tree = tree
+		self.index = index
+
+	#----Main Properties----
+	@property
+	def parent(self) -> Optional['TransformNode']:
+		p = self.tree._parents[self.index]
+		return None if p < 0 else self.tree._nodes[p]
+	@parent.setter
+	def parent(self, parent:Optional['TransformNode']) -> None:
+		self.tree._reparent(self.index, -1 if parent is None else parent.index)
+
+	@property
+	def children(self) -> List['TransformNode']:
+		nodes = self.tree._nodes
+		return [nodes[c] for c in self.tree._children[self.index]]
+
+	@property
+	def depth(self) -> int:
+		''' Number of ancestors this node has '''
+		return int(self.tree._depths[self.index])
+
+	@property
+	def translation(self) -> Vector3:
+		return Vector3._from_np(self.tree._translations[self.index].copy())
+	@translation.setter
+	def translation(self, translation:Vector3) -> None:
+		self.tree._translations[self.index] = translation._value
+		self.tree._local_changed(self.index)
+
+	@property
+	def rotation(self) -> Quaternion:
+		return Quaternion._from_np(self.tree._rotations[self.index].copy())
+	@rotation.setter
+	def rotation(self, rotation:Quaternion) -> None:
+		self.tree._rotations[self.index] = rotation.normalized._value
+		self.tree._local_changed(self.index)
+
+	@property
+	def localScale(self) -> Vector3:
+		return Vector3._from_np(self.tree._scales[self.index].copy())
+	@localScale.setter
+	def localScale(self, scale:Vector3) -> None:
+		self.tree._scales[self.index] = scale._value
+		self.tree._local_changed(self.index)
+
+	@property
+	def local(self) -> Transform:
+		''' This node's transform relative to its parent '''
+		self.tree._update_locals(np.array([self.index]))
+		return Transform._from_np(self.tree._locals[self.index].copy(), TransformKind.TRS)
+	@local.setter
+	def local(self, local:Transform) -> None:
+		tree = self.tree
+		tree._translations[self.index] = local.translation._value
+		tree._rotations[self.index] = local.rotation._value
+		tree._scales[self.index] = local.localScale._value
+		tree._local_changed(self.index)
+
+	@property
+	def world(self) -> Transform:
+		''' This node's transform relative to the tree's root, computed only if dirty '''
+		kind = TransformKind.TRS if self.tree._parents[self.index] < 0 else TransformKind.affine
+		return Transform._from_np(self.tree._world(self.index).copy(), kind)
+
+	#----Operators----
+	def __str__(self) -> str:
+		return 'TransformNode({}, parent:{})'.format(self.index, self.tree._parents[self.index])
+	def __repr__(self) -> str:
+		return self.__str__()
+
+class TransformTree():
+	'''
+	A hierarchy of TransformNode's, whose local and world matrices
+	are kept in contiguous buffers and only recomputed when dirty.
+
+	Changing a node marks its subtree dirty (stopping at nodes that
+	already are), world matrices are then computed lazily per node,
+	or for every dirty node at once with update(), which does one
+	vectorized product per level of the tree.
+	'''
+	def __init__(self, capacity:int=16) -> None:
+		self._count = 0
+		self._nodes:List[TransformNode] = []
+		self._children:List[List[int]] = []
+		for name, (shape, dtype, fill) in _buffers.items():
+			setattr(self, name, np.full((max(capacity, 1),)+shape, fill, dtype=dtype))
+
+	def _grow(self) -> None:
+		for name, (shape, dtype, fill) in _buffers.items():
+			old = getattr(self, name)
+			new = np.full((2*len(old),)+shape, fill, dtype=dtype)
+			new[:self._count] = old[:self._count]
+			setattr(self, name, new)
+
+	#----Functions----
+	def add(self, parent:Optional[TransformNode]=None, translation:Vector3=None, rotation:Quaternion=None, scale:Vector3=None) -> TransformNode:
+		''' Adds a node under parent (or as a root), with an identity local transform by default. '''
+		if self._count == len(self._parents):
+			self._grow()
+		index = self._count
+		self._count += 1
+		self._translations[index] = 0 if translation is None else translation._value
+		self._rotations[index] = (0,0,0,1) if rotation is None else rotation.normalized._value
+		self._scales[index] = 1 if scale is None else scale._value
+		self._local_dirty[index] = True
+		self._world_dirty[index] = True
+		self._parents[index] = -1
+		self._depths[index] = 0
+		self._children.append([])
+		node = TransformNode(self, index)
+		self._nodes.append(node)
+		if parent is not None:
+			self._reparent(index, parent.index)
+		return node
+
+	@property
+	def roots(self) -> List[TransformNode]:
+		return [self._nodes[i] for i in np.flatnonzero(self._parents[:self._count] < 0)]
+
+	@property
+	def worlds(self) -> TransformArray:
+		''' Every node's world matrix, in the order they were added '''
+		self.update()
+		return TransformArray._from_np(self._worlds[:self._count].copy())
+
+	def update(self) -> None:
+		'''
+		Recomputes every dirty world matrix, one batched product per tree level.
+		'''
+		dirty = np.flatnonzero(self._world_dirty[:self._count])
+		if len(dirty) == 0:
+			return
+		self._update_locals(dirty)
+
+		depths = self._depths[dirty]
+		order = np.argsort(depths, kind='stable')
+		dirty, depths = dirty[order], depths[order]
+		starts = np.flatnonzero(np.diff(depths)) + 1
+		for level in np.split(dirty, starts):
+			parents = self._parents[level]
+			if parents[0] < 0:
+				#roots are the only nodes at depth 0:
+				self._worlds[level] = self._locals[level]
+			else:
+				self._worlds[level] = np.matmul(self._worlds[parents], self._locals[level])
+		self._world_dirty[dirty] = False
+
+	def _update_locals(self, indices:np.ndarray) -> None:
+		indices = indices[self._local_dirty[indices]]
+		if len(indices) == 0:
+			return
+		self._locals[indices] = TransformArray.TRS(
+			self._translations[indices],
+			QuaternionArray._from_np(self._rotations[indices]),
+			self._scales[indices])._mat
+		self._local_dirty[indices] = False
+
+	def _world(self, index:int) -> np.ndarray:
+		''' Returns the world matrix of one node, computing it (and any dirty ancestors) if needed. '''
+		if self._world_dirty[index]:
+			#walk up to the first clean ancestor, then down again:
+			path = []
+			i = index
+			while i >= 0 and self._world_dirty[i]:
+				path.append(i)
+				i = self._parents[i]
+			path.reverse()
+			self._update_locals(np.array(path))
+			for i in path:
+				p = self._parents[i]
+				self._worlds[i] = self._locals[i] if p < 0 else self._worlds[p] @ self._locals[i]
+				self._world_dirty[i] = False
+		return self._worlds[index]
+
+	def _local_changed(self, index:int) -> None:
+		self._local_dirty[index] = True
+		self._mark_dirty(index)
+
+	def _mark_dirty(self, index:int) -> None:
+		''' Marks index's subtree dirty, not descending into subtrees that already are. '''
+		world_dirty, children = self._world_dirty, self._children
+		if world_dirty[index]:
+			return
+		stack = [index]
+		while stack:
+			i = stack.pop()
+			world_dirty[i] = True
+			stack.extend(c for c in children[i] if not world_dirty[c])
+
+	def _reparent(self, index:int, parent:int) -> None:
+		old = self._parents[index]
+		if old == parent:
+			return
+		#only a node with children can end up under itself:
+		if parent == index or self._children[index]:
+			p = parent
+			while p >= 0:
+				if p == index:
+					raise ValueError("Can not parent a node to itself or one of its descendants")
+				p = self._parents[p]
+
+		if old >= 0:
+			self._children[old].remove(index)
+		if parent >= 0:
+			self._children[parent].append(index)
+		self._parents[index] = parent
+
+		#depths of the whole subtree shift, and its world matrices change:
+		depth = 0 if parent < 0 else self._depths[parent]+1
+		stack = [(index, depth)]
+		while stack:
+			i, d = stack.pop()
+			self._depths[i] = d
+			self._world_dirty[i] = True
+			stack.extend((c, d+1) for c in self._children[i])
+
+	#----Operators----
+	def __getitem__(self, index:int) -> TransformNode:
+		return self._nodes[index]
+
+	def __iter__(self) -> Iterator[TransformNode]:
+		return iter(self._nodes)
+	def __len__(self) -> int:
+		return self._count
+
+	def __str__(self) -> str:
+		return 'TransformTree({} nodes, {} roots)'.format(self._count, len(self.roots))
+	def __repr__(self) -> str:
+		return self.__str__()
+
+#per node buffers of TransformTree, as name:(shape, dtype, fill):
+_buffers = {
+	'_translations':((3,), np.float64, 0),
+	'_rotations':((4,), np.float64, 0),
+	'_scales':((3,), np.float64, 1),
+	'_locals':((4,4), np.float64, 0),
+	'_worlds':((4,4), np.float64, 0),
+	'_parents':((), np.int64, -1),
+	'_depths':((), np.int64, 0),
+	#a dirty world implies dirty descendants, so a clean one implies clean ancestors:
+	'_local_dirty':((), bool, True),
+	'_world_dirty':((), bool, True),
+}
@@ -1,17 +1,42 @@
 from UnitAlg.CoordinateFrame import *
 from UnitAlg.BaseVector import BaseVector
-from numpy.core.numeric import isclose
-from UnitAlg.Convertable import Convertable
-from numpy.lib.arraysetops import isin
+from UnitAlg.Backend import Backend
+from UnitAlg.Convertable import Convertable, ConversionTable
 from UnitAlg.helpers.classproperty import all_true
 from UnitAlg.helpers import *
 from typing import Any, Dict, Iterator, Tuple, Type, Union, List, overload
 import numpy as np
 import math
 
+#enum member lookups are slow, and constants are read often:
+_scalar_backend = Backend.scalar
+
+#numpy backed vectors are plain objects, so constants skip the backend's __new__:
+_object_new = object.__new__
+
+class _frame_constant():
+	''' A class property returning a copy of one of the current coordinate frame's cached constants '''
+	__slots__ = ('name',)
+	def __init__(self, name:str) -> None:
+		self.name = name
+	
+	def __get__(self, obj, owner) -> 'Vector3':
+		#inlined BaseVector._frame_constants, this is read in hot loops:
+		constants = FrameConstants.current
+		if constants.frame is not BaseVector.coordinate_frame:
+			constants = FrameConstants.rebuild(BaseVector.coordinate_frame)
+		if Vector3.backend is _scalar_backend:
+			return Vector3._from_components(constants.tuples[self.name])
+		vector = _object_new(Vector3)
+		vector._value = constants.arrays[self.name].copy()
+		return vector
+
 class Vector3(BaseVector):
-	to_conversions = {}
-	from_conversions = {}
+	__slots__ = ()
+	to_conversions = ConversionTable()
+	from_conversions = ConversionTable()
+	bulk_from_conversions = ConversionTable()
+	_array_shape = (3,)
 	
 	@overload
 	def __init__(self, x:Union[float,int], y:Union[float,int], z:Union[float,int]=0) -> None: ...
@@ -42,36 +67,16 @@ class Vector3(BaseVector):
 			raise ValueError("init can only take 3 real numbers, or 1 list numpy array or some type with a conversion function specified in from_conversions and nothing else.")
 				
 	#----Common values----
-	@classproperty
-	def back() -> 'Vector3':
-		return Vector3( Vector3.frame[Directions.back] )
-	@classproperty
-	def down() -> 'Vector3':
-		return Vector3( Vector3.frame[Directions.down] )
-	@classproperty
-	def forward() -> 'Vector3':
-		return Vector3( Vector3.frame[Directions.forward] )
-	@classproperty
-	def left() -> 'Vector3':
-		return Vector3( Vector3.frame[Directions.left] )
-	@classproperty
-	def negative_infinity() -> 'Vector3':
-		return Vector3(-math.inf,-math.inf,-math.inf)
-	@classproperty
-	def one() -> 'Vector3':
-		return Vector3(1,1,1)
-	@classproperty
-	def positive_infinity() -> 'Vector3':
-		return Vector3(math.inf,math.inf,math.inf)
-	@classproperty
-	def right() -> 'Vector3':
-		return Vector3( Vector3.frame[Directions.right] )
-	@classproperty
-	def up() -> 'Vector3':
-		return Vector3( Vector3.frame[Directions.up] )
-	@classproperty
-	def zero() -> 'Vector3':
-		return Vector3(0,0,0)
+	back = _frame_constant('back')
+	down = _frame_constant('down')
+	forward = _frame_constant('forward')
+	left = _frame_constant('left')
+	negative_infinity = _frame_constant('negative_infinity')
+	one = _frame_constant('one')
+	positive_infinity = _frame_constant('positive_infinity')
+	right = _frame_constant('right')
+	up = _frame_constant('up')
+	zero = _frame_constant('zero')
 	
 	#----Functions----
 	@staticmethod
@@ -84,7 +89,7 @@ class Vector3(BaseVector):
 		''' 
 		Returns the unsigned angle between 'fromV' and 'toV' in rad [0,pi].  
 		'''
-		v = Vector3.dot(from_v,to_v)/(from_v.magnitude*to_v.magnitude)
+		v = divide(Vector3.dot(from_v,to_v), from_v.magnitude*to_v.magnitude)
 		if v > 1:
 			return 0
 		elif v < -1:
@@ -119,20 +124,38 @@ class Vector3(BaseVector):
 		return angle
 		
 	@staticmethod
-	def cross(vector_a:'Vector3',vector_b:'Vector3') -> 'Vector3':
-		'''Cross product between two vectors '''
-		return Vector3._from_np(np.cross(vector_a.value,vector_b.value))
+	def cross(vector_a:'Vector3',vector_b:'Vector3', out:'Vector3'=None) -> 'Vector3':
+		'''Cross product between two vectors, written into out when given (which may be vector_a or vector_b) '''
+		ax, ay, az = vector_a._components()
+		bx, by, bz = vector_b._components()
+		x = ay*bz - az*by
+		y = az*bx - ax*bz
+		z = ax*by - ay*bx
+		if out is None:
+			return Vector3._from_components((x,y,z))
+		out._assign((x,y,z))
+		return out
 	@staticmethod
 	def dot(vector_a:'Vector3', vector_b:'Vector3') -> float:
 		''' Dot product between two vectors '''
-		return np.dot(vector_a.value,vector_b.value)
+		ax, ay, az = vector_a._components()
+		bx, by, bz = vector_b._components()
+		return ax*bx + ay*by + az*bz
 
 	@staticmethod
-	def lerp(vector_a:'Vector3', vector_b:'Vector3', factor:float) -> 'Vector3':
-		p1 = vector_a._value
-		v = (vector_b._value-p1)
-		d = np.linalg.norm(v)
-		return Vector3._from_np(p1 + v*(factor/d))
+	def lerp(vector_a:'Vector3', vector_b:'Vector3', factor:float, out:'Vector3'=None) -> 'Vector3':
+		''' Moves vector_a factor units toward vector_b, written into out when given '''
+		if out is None:
+			p1 = vector_a._value
+			v = (vector_b._value-p1)
+			d = np.linalg.norm(v)
+			return Vector3._from_np(p1 + v*(factor/d))
+		ax, ay, az = vector_a._components()
+		bx, by, bz = vector_b._components()
+		vx, vy, vz = bx-ax, by-ay, bz-az
+		f = factor/math.sqrt(vx*vx + vy*vy + vz*vz)
+		out._assign((ax + vx*f, ay + vy*f, az + vz*f))
+		return out
 		
 	@staticmethod
 	def project_point(vector:'Vector3', onNormal:'Vector3')->'Vector3':
@@ -144,11 +167,23 @@ class Vector3(BaseVector):
 
 	#----Operators----
 	def __add__(self,other:'Vector3') -> 'Vector3':
-		return Vector3._from_np(self.value + other.value)
+		if not isinstance(other, Vector3):
+			return NotImplemented
+		return Vector3._from_np(self._value + other._value)
 	def __iadd__(self,other:'Vector3') -> 'Vector3':
-		return self + other
+		if not isinstance(other, Vector3):
+			return NotImplemented
+		self._value += other._value
+		return self
 	def __sub__(self,other:'Vector3') -> 'Vector3':
-		return Vector3._from_np(self.value - other.value)
+		if not isinstance(other, Vector3):
+			return NotImplemented
+		return Vector3._from_np(self._value - other._value)
+	def __isub__(self,other:'Vector3') -> 'Vector3':
+		if not isinstance(other, Vector3):
+			return NotImplemented
+		self._value -= other._value
+		return self
 		
 	@overload
 	def __mul__(self,other:Union[float,int]) -> 'Vector3': ...
@@ -156,27 +191,38 @@ class Vector3(BaseVector):
 	def __mul__(self,other:'Vector3') -> 'Vector3': ...
 	def __mul__(self,other):
 		if isinstance(other, (float,int)):
-			return Vector3._from_np(self.value * other)
+			return Vector3._from_np(self._value * other)
 		elif isinstance(other,Vector3):
 			return Vector3._from_np(self._value * other._value)
+		return NotImplemented
+	def __imul__(self,other:Union[float,int,'Vector3']) -> 'Vector3':
+		if isinstance(other, (float,int)):
+			self._value *= other
+		elif isinstance(other,Vector3):
+			self._value *= other._value
 		else:
-			raise ValueError("Expected float/int or Vector3 not "+str(type(other)))
-	def __imul__(self,other:Union[float,int]) -> 'Vector3':
-		return self * other	
+			return NotImplemented
+		return self
 	def __rmul__(self,other:Union[float,int]) -> 'Vector3':
 		return self * other
 		
 	def __rtruediv__(self,other:float) -> 'Vector3':
 		if math.isclose(other,0.0):
 			return Vector3(math.nan, math.nan, math.nan)
-		return Vector3._from_np(np.divide(other, self.value))
+		return Vector3._from_np(np.divide(other, self._value))
 	def __truediv__(self,other:float) -> 'Vector3':
 		if math.isclose(other,0.0):
 			return Vector3(math.nan, math.nan, math.nan)
-		return Vector3._from_np(np.divide(self.value, other))
+		return Vector3._from_np(np.divide(self._value, other))
+	def __itruediv__(self,other:float) -> 'Vector3':
+		if math.isclose(other,0.0):
+			self._value[:] = math.nan
+		else:
+			self._value /= other
+		return self
 	
 	def __neg__(self) -> 'Vector3':
-		return Vector3(-self._value)
+		return Vector3._from_np(-self._value)
 		
 	def __str__(self) -> str:
 		return str.format('({0}, {1}, {2})',*self._value)
@@ -203,4 +249,4 @@ if __name__ == "__main__":
 	
 	try:
 		print(Vector3(1,'f'))
-	except Exception as e: print(e)
\ No newline at end of file
+	except Exception as e: print(e)
@@ -0,0 +1,384 @@
+from UnitAlg.BaseVectorArray import BaseVectorArray
+from UnitAlg.Vector3 import Vector3
+from UnitAlg.helpers import *
+from typing import List, Tuple, Union
+import numpy as np
+import numbers
+import math
+
+class Vector3Array(BaseVectorArray):
+	'''
+	A batch of Vector3's stored as one contiguous (N,3) float64 buffer.
+
+	Mirrors the Vector3 API, with every operation done as a single
+	vectorized call over all rows.
+	'''
+	element_type = Vector3
+	width = 3
+	_array_shape = (-1,3)
+
+	@staticmethod
+	def zeros(count:int) -> 'Vector3Array':
+		return Vector3Array._from_np(np.zeros((count,3), dtype=np.float64))
+
+	@staticmethod
+	def full(count:int, vector:Vector3) -> 'Vector3Array':
+		''' Returns count copies of vector '''
+		return Vector3Array._from_np(np.tile(vector._value, (count,1)))
+
+	#----Functions----
+	@staticmethod
+	def sq_distance(vectors_a:'Vector3Array', vectors_b:Union['Vector3Array',Vector3]) -> np.ndarray:
+		''' Returns the square distance between each pair of vectors '''
+		return (vectors_a - vectors_b).sq_magnitude
+
+	@staticmethod
+	def distance(vectors_a:'Vector3Array', vectors_b:Union['Vector3Array',Vector3]) -> np.ndarray:
+		''' Returns the distance between each pair of vectors '''
+		return (vectors_a - vectors_b).magnitude
+
+	@staticmethod
+	def angle(from_v:'Vector3Array', to_v:Union['Vector3Array',Vector3]) -> np.ndarray:
+		'''
+		Returns the unsigned angles between 'fromV' and 'toV' in rad [0,pi].
+		'''
+		to_v = Vector3Array._as_array(to_v)
+		v = Vector3Array.dot(from_v, to_v)/(from_v.magnitude*to_v.magnitude)
+		return np.arccos(np.clip(v, -1, 1))
+
+	@staticmethod
+	def signed_angle(from_v:'Vector3Array', to_v:Union['Vector3Array',Vector3], axis:Union['Vector3Array',Vector3]) -> np.ndarray:
+		'''
+		Returns the signed angles between 'fromV' and 'toV' in rad [-pi,pi].
+		'''
+		angle = Vector3Array.angle(from_v, to_v)
+		cross = Vector3Array.cross(from_v, to_v)
+		return np.where(Vector3Array.dot(cross, axis) >= 0, angle, -angle)
+
+	@staticmethod
+	def signed_angle2(from_v:'Vector3Array', to_v:Union['Vector3Array',Vector3], axis:Union['Vector3Array',Vector3], inclusive=False) -> np.ndarray:
+		'''
+		Returns the signed angles between 'fromV' and 'toV' in rad [0,2pi), or [0,2pi] if inclusive is True.
+		'''
+		angle = Vector3Array.signed_angle(from_v, to_v, axis)
+		angle = np.where(angle < 0, angle + 2*math.pi, angle)
+		if not inclusive:
+			#~1 arcsecond less than 2pi, this is to make it so that 2pi is the same as 0
+			wrap = angle >= 2*math.pi-0.000005
+			angle[wrap] = np.maximum(angle[wrap] - 2*math.pi, 0)
+		return angle
+
+	@staticmethod
+	def cross(vectors_a:Union['Vector3Array',Vector3], vectors_b:Union['Vector3Array',Vector3]) -> 'Vector3Array':
+		''' Cross product between each pair of vectors '''
+		a = Vector3Array._vectors(vectors_a)
+		b = Vector3Array._vectors(vectors_b)
+		return Vector3Array._from_np(np.cross(a, b))
+
+	@staticmethod
+	def dot(vectors_a:Union['Vector3Array',Vector3], vectors_b:Union['Vector3Array',Vector3]) -> np.ndarray:
+		''' Dot product between each pair of vectors '''
+		a = Vector3Array._vectors(vectors_a)
+		b = Vector3Array._vectors(vectors_b)
+		return np.einsum('...i,...i->...', a, b)
+
+	@staticmethod
+	def lerp(vectors_a:Union['Vector3Array',Vector3], vectors_b:Union['Vector3Array',Vector3], factor:Union[float,np.ndarray]) -> 'Vector3Array':
+		''' Moves each vector in vectors_a factor units toward vectors_b (see Vector3.lerp) '''
+		p1 = Vector3Array._vectors(vectors_a)
+		v = Vector3Array._vectors(vectors_b) - p1
+		d = np.sqrt(np.einsum('...i,...i->...', v, v))
+		return Vector3Array._from_np(p1 + v*(np.asarray(factor)/d)[...,None])
+
+	@staticmethod
+	def project_point(vectors:'Vector3Array', onNormal:Union['Vector3Array',Vector3]) -> 'Vector3Array':
+		'''
+		Projects each vector onto onNormal.
+
+		Rows with a (near) zero normal are nan, where Vector3.project_point returns None.
+		'''
+		n = Vector3Array._vectors(onNormal)
+		sqrMag = np.einsum('...i,...i->...', n, n)
+		dot = Vector3Array.dot(vectors, onNormal)
+		with np.errstate(divide='ignore', invalid='ignore'):
+			scale = np.where(sqrMag < 2.22*1e-16, math.nan, dot/sqrMag)
+		return Vector3Array._from_np(n * scale[...,None])
+
+	@staticmethod
+	def weld(points:Union['Vector3Array',List[Vector3],np.ndarray], tolerance:float=Vector3.atol, average:bool=False) -> Tuple['Vector3Array',np.ndarray]:
+		'''
+		Merges points within tolerance of each other (on every axis, like ==),
+		returning (unique points, remap) where unique[remap] are the welded points.
+
+		Points are welded when a chain of points, each within tolerance of the
+		next, connects them. Unique points are in order of first occurrence and
+		are that first point, or the mean of their group when average is set.
+
+		Points are grouped into cells of tolerance size, where every point of a
+		cell is within tolerance of the rest, so only points in neighbouring
+		cells are ever compared, a bounded batch at a time and stopping at the
+		first close pair.
+		'''
+		p = Vector3Array._buffer(points)
+		if not tolerance >= 0:
+			raise ValueError("tolerance must not be negative, got {}".format(tolerance))
+		if tolerance == 0 or len(p) == 0:
+			groups = np.unique(p, axis=0, return_inverse=True)[1].reshape(-1)
+		else:
+			groups = _weld_groups(p, tolerance)
+		#number groups in order of first occurrence:
+		firsts = np.full(groups.max()+1 if len(groups) else 0, len(p))
+		np.minimum.at(firsts, groups, np.arange(len(p)))
+		used = firsts < len(p)
+		order = np.argsort(firsts[used])
+		rank = np.empty(len(firsts), dtype=np.int64)
+		rank[np.flatnonzero(used)[order]] = np.arange(len(order))
+		remap = rank[groups]
+		if average:
+			counts = np.bincount(remap, minlength=len(order))
+			unique = np.stack([np.bincount(remap, p[:,axis], minlength=len(order)) for axis in range(3)], axis=1) / counts[:,None]
+		else:
+			unique = p[firsts[used][order]]
+		return Vector3Array._from_np(unique), remap
+
+	#----Operators----
+	def __add__(self, other:Union['Vector3Array',Vector3,np.ndarray]) -> 'Vector3Array':
+		o = Vector3Array._operand(other)
+		if o is NotImplemented:
+			return NotImplemented
+		return Vector3Array._from_np(self._value + o)
+	def __radd__(self, other:Union[Vector3,np.ndarray]) -> 'Vector3Array':
+		o = Vector3Array._operand(other)
+		if o is NotImplemented:
+			return NotImplemented
+		return Vector3Array._from_np(o + self._value)
+	def __iadd__(self, other:Union['Vector3Array',Vector3,np.ndarray]) -> 'Vector3Array':
+		o = Vector3Array._operand(other)
+		if o is NotImplemented:
+			return NotImplemented
+		self._value += o
+		return self
+	def __sub__(self, other:Union['Vector3Array',Vector3,np.ndarray]) -> 'Vector3Array':
+		o = Vector3Array._operand(other)
+		if o is NotImplemented:
+			return NotImplemented
+		return Vector3Array._from_np(self._value - o)
+	def __rsub__(self, other:Union[Vector3,np.ndarray]) -> 'Vector3Array':
+		o = Vector3Array._operand(other)
+		if o is NotImplemented:
+			return NotImplemented
+		return Vector3Array._from_np(o - self._value)
+	def __isub__(self, other:Union['Vector3Array',Vector3,np.ndarray]) -> 'Vector3Array':
+		o = Vector3Array._operand(other)
+		if o is NotImplemented:
+			return NotImplemented
+		self._value -= o
+		return self
+
+	def __mul__(self, other:Union[float,int,np.ndarray,Vector3,'Vector3Array']) -> 'Vector3Array':
+		'''
+		Multiplies by a scalar, a (N,) array of per vector scalars,
+		or element wise by a Vector3 or Vector3Array.
+		'''
+		o = Vector3Array._operand(other)
+		if o is NotImplemented:
+			return NotImplemented
+		return Vector3Array._from_np(self._value * o)
+	def __rmul__(self, other:Union[float,int,np.ndarray,Vector3,'Quaternion']) -> 'Vector3Array':
+		result = self.__mul__(other)
+		if result is NotImplemented:
+			#a single rotation times the points rotates every point, like Quaternion * Vector3:
+			from UnitAlg.Quaternion import Quaternion
+			if isinstance(other, Quaternion):
+				from UnitAlg.QuaternionArray import QuaternionArray
+				return QuaternionArray.rotate(other, self)
+		return result
+	def __imul__(self, other:Union[float,int,np.ndarray,Vector3,'Vector3Array']) -> 'Vector3Array':
+		o = Vector3Array._operand(other)
+		if o is NotImplemented:
+			return NotImplemented
+		self._value *= o
+		return self
+
+	def __truediv__(self, other:Union[float,int,np.ndarray]) -> 'Vector3Array':
+		o = Vector3Array._operand(other)
+		if o is NotImplemented:
+			return NotImplemented
+		with np.errstate(divide='ignore', invalid='ignore'):
+			return Vector3Array._from_np(self._value / o)
+	def __itruediv__(self, other:Union[float,int,np.ndarray]) -> 'Vector3Array':
+		o = Vector3Array._operand(other)
+		if o is NotImplemented:
+			return NotImplemented
+		with np.errstate(divide='ignore', invalid='ignore'):
+			self._value /= o
+		return self
+
+	def __neg__(self) -> 'Vector3Array':
+		return Vector3Array._from_np(-self._value)
+
+	#----Helpers----
+	@staticmethod
+	def _as_array(vectors:Union['Vector3Array',Vector3]) -> 'Vector3Array':
+		if isinstance(vectors, Vector3Array):
+			return vectors
+		return Vector3Array._from_np(np.asarray(Vector3Array._vectors(vectors))[None,:])
+
+	@staticmethod
+	def _operand(other:Union['Vector3Array',Vector3,np.ndarray,float,int]) -> Union[np.ndarray,float,int]:
+		'''
+		Returns the raw data of other, broadcastable against a (N,3) buffer,
+		or NotImplemented for types the operators don't take.
+
+		1 dimensional numpy arrays are treated as per vector scalars, so a (3,)
+		array is NOT a vector here. Functions taking points use _buffer instead.
+		'''
+		if isinstance(other, Vector3Array):
+			return other._value
+		elif isinstance(other, Vector3):
+			return other._value
+		elif isinstance(other, np.ndarray):
+			if other.ndim == 1:
+				return other[:,None]
+			return other
+		elif isinstance(other, (numbers.Real, np.number)):
+			return other
+		return NotImplemented
+
+	@staticmethod
+	def _vectors(other:Union['Vector3Array',Vector3,np.ndarray,float,int]) -> Union[np.ndarray,float,int]:
+		''' _operand for functions, raising a ValueError for types it doesn't take '''
+		o = Vector3Array._operand(other)
+		if o is NotImplemented:
+			raise ValueError("Expected float/int, (N,) or (N,3) numpy array, Vector3 or Vector3Array, not "+str(type(other)))
+		return o
+
+	@staticmethod
+	def _buffer(points:Union['Vector3Array',Vector3,List[Vector3],np.ndarray]) -> np.ndarray:
+		'''
+		Returns points as a (N,3) float64 buffer, without copying when they already are one.
+		'''
+		if isinstance(points, (Vector3Array, Vector3)):
+			return np.atleast_2d(points._value)
+		if isinstance(points, (list, tuple)) and len(points) > 0 and isinstance(points[0], Vector3):
+			return Vector3Array(points)._value
+		points = np.asarray(points, dtype=np.float64)
+		if points.ndim == 1 and points.shape[0] == 0:
+			points = points.reshape((0,3))
+		points = np.atleast_2d(points)
+		if points.ndim != 2 or points.shape[1] != 3:
+			raise ValueError("invalid points shape {}, expected shape (N,3)".format(points.shape))
+		return points
+
+#the 13 neighbouring cell offsets of one half of the cube around a cell, (the other half are their pairs reversed):
+_half_neighbours = np.array([(x,y,z) for x in (-1,0,1) for y in (-1,0,1) for z in (-1,0,1) if (x,y,z) > (0,0,0)], dtype=np.int64)
+#most point pairs compared at once when linking cells:
+_max_weld_pairs = 1 << 20
+
+def _runs(starts:np.ndarray, counts:np.ndarray) -> Tuple[np.ndarray,np.ndarray]:
+	''' Returns (run, position) for every position of the runs [start, start+count) '''
+	run = np.repeat(np.arange(len(counts)), counts)
+	return run, np.arange(int(counts.sum())) - np.repeat(np.cumsum(counts) - counts - starts, counts)
+
+def _cells_linked(sorted_points:np.ndarray, starts:np.ndarray, counts:np.ndarray, a:np.ndarray, b:np.ndarray, tolerance:float) -> np.ndarray:
+	'''
+	Returns a mask of which cell pairs (a[i], b[i]) have a pair of points within tolerance.
+
+	A few of a's points are compared against all of b's each round, twice as many
+	as the round before (up to what fits in _max_weld_pairs), and pairs stop being
+	compared once they are linked, which for dense cells is usually the first round.
+	'''
+	linked = np.zeros(len(a), dtype=bool)
+	pending = np.arange(len(a))
+	row = 0
+	rows = 1
+	while len(pending) > 0:
+		rows = max(1, min(rows, _max_weld_pairs // int(counts[b[pending]].sum())))
+		taken = np.minimum(counts[a[pending]] - row, rows)
+		pair, i = _runs(starts[a[pending]] + row, taken)
+		sizes = counts[b[pending]][pair]
+		compared, j = _runs(starts[b[pending]][pair], sizes)
+		close = np.all(np.abs(sorted_points[i[compared]] - sorted_points[j]) <= tolerance, axis=1)
+		linked[pending[np.unique(pair[compared[close]])]] = True
+		row += rows
+		rows *= 2
+		pending = pending[~linked[pending] & (counts[a[pending]] > row)]
+	return linked
+
+def _ranks(values:np.ndarray) -> Tuple[np.ndarray,Tuple[np.ndarray,np.ndarray,np.ndarray]]:
+	'''
+	Returns (rank of each value among the distinct ones, ranks of each distinct value's
+	value-1, value and value+1), with rank -1 where value-1 or value+1 isn't one of them.
+	'''
+	unique, rank = np.unique(values, return_inverse=True)
+	consecutive = np.diff(unique) == 1
+	ranks = np.arange(len(unique))
+	below = np.where(np.insert(consecutive, 0, False), ranks-1, -1)
+	above = np.where(np.append(consecutive, False), ranks+1, -1)
+	return rank.reshape(-1), (below, ranks, above)
+
+def _weld_groups(p:np.ndarray, tolerance:float) -> np.ndarray:
+	''' Returns a (N,) group label per point of the welded groups of p '''
+	scaled = np.floor(p / tolerance)
+	if not np.all(np.abs(scaled) < 2.0**62):
+		raise ValueError("points must be finite and within 2^62 tolerances of the origin to weld")
+	cells = scaled.astype(np.int64)
+
+	#exact keys of the cells from each axis's rank among the distinct values on it,
+	#(the x and y ranks make a key per column of cells, and its rank and z the cell's):
+	x_rank, x_steps = _ranks(cells[:,0])
+	y_rank, y_steps = _ranks(cells[:,1])
+	z_rank, z_steps = _ranks(cells[:,2])
+	y_count, z_count = len(y_steps[1]), len(z_steps[1])
+	columns, column = np.unique(x_rank*y_count + y_rank, return_inverse=True)
+	keys = column.reshape(-1)*z_count + z_rank
+
+	#points sorted by cell, and per cell bounds:
+	order = np.argsort(keys, kind='stable')
+	keys = keys[order]
+	starts = np.flatnonzero(np.diff(keys, prepend=-1))
+	counts = np.diff(np.append(starts, len(p)))
+	cell_keys = keys[starts]
+	sorted_points = p[order]
+	mins = np.minimum.reduceat(sorted_points, starts, axis=0)
+	maxs = np.maximum.reduceat(sorted_points, starts, axis=0)
+	cell_x, cell_y, cell_z = x_rank[order[starts]], y_rank[order[starts]], z_rank[order[starts]]
+
+	#link neighbouring cells that have a pair of points within tolerance:
+	links_a, links_b = [], []
+	for offset in _half_neighbours:
+		#(the neighbours of cells in key order are in key order too, which keeps these searches fast)
+		x, y, z = x_steps[offset[0]+1][cell_x], y_steps[offset[1]+1][cell_y], z_steps[offset[2]+1][cell_z]
+		a = np.flatnonzero((x >= 0) & (y >= 0) & (z >= 0))
+		column_keys = x[a]*y_count + y[a]
+		neighbour_column = np.minimum(np.searchsorted(columns, column_keys), len(columns)-1)
+		found = columns[neighbour_column] == column_keys
+		a = a[found]
+		neighbour_keys = neighbour_column[found]*z_count + z[a]
+		b = np.minimum(np.searchsorted(cell_keys, neighbour_keys), len(cell_keys)-1)
+		found = cell_keys[b] == neighbour_keys
+		a, b = a[found], b[found]
+		#cells whose bounds are further apart than tolerance can't be linked:
+		near = np.all(np.maximum(mins[b] - maxs[a], mins[a] - maxs[b]) <= tolerance, axis=1)
+		a, b = a[near], b[near]
+		linked = _cells_linked(sorted_points, starts, counts, a, b, tolerance)
+		links_a.append(a[linked])
+		links_b.append(b[linked])
+	links_a, links_b = np.concatenate(links_a), np.concatenate(links_b)
+
+	#connected cells, hooking the larger label onto the smaller until every link agrees:
+	labels = np.arange(len(starts))
+	while True:
+		la, lb = labels[links_a], labels[links_b]
+		differ = la != lb
+		if not np.any(differ):
+			break
+		np.minimum.at(labels, np.maximum(la, lb)[differ], np.minimum(la, lb)[differ])
+		while True:
+			jumped = labels[labels]
+			if np.array_equal(jumped, labels):
+				break
+			labels = jumped
+	groups = np.empty(len(p), dtype=np.int64)
+	groups[order] = np.repeat(labels, counts)
+	return groups
@@ -1,6 +1,55 @@
-from .Vector3 import Vector3
-from .Quaternion import Quaternion
-from .Ray import Ray
-from .Transform import Transform
-from .Plane import Plane
-from .CoordinateFrame import CoordinateFrame
\ No newline at end of file
+'''
+Submodules are imported on first use of one of their names, so `import UnitAlg`
+stays cheap and `from UnitAlg import Vector3` only loads what Vector3 needs.
+'''
+import importlib
+import sys
+import types
+
+#exported name -> submodule defining it:
+_exports = {
+	'Backend':'Backend',
+	'Vector3':'Vector3',
+	'ScalarVector3':'ScalarVector3',
+	'Vector3Array':'Vector3Array',
+	'Quaternion':'Quaternion',
+	'ScalarQuaternion':'ScalarQuaternion',
+	'QuaternionArray':'QuaternionArray',
+	'Ray':'Ray',
+	'RayArray':'RayArray',
+	'Transform':'Transform',
+	'TransformKind':'Transform',
+	'TransformArray':'TransformArray',
+	'TransformChain':'TransformChain',
+	'TransformTree':'TransformTree',
+	'TransformNode':'TransformTree',
+	'FrameBuffer':'FrameBuffer',
+	'Plane':'Plane',
+	'PlaneArray':'PlaneArray',
+	'SpatialGrid':'SpatialGrid',
+	'Range':'Range',
+	'RangeArray':'RangeArray',
+	'RangeIndex':'RangeIndex',
+	'CoordinateFrame':'CoordinateFrame',
+}
+__all__ = list(_exports)
+
+def __getattr__(name:str):
+	submodule = _exports.get(name)
+	if submodule is None:
+		raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+	value = getattr(importlib.import_module('.' + submodule, __name__), name)
+	globals()[name] = value
+	return value
+
+def __dir__():
+	return sorted(set(globals()) | set(_exports))
+
+class _Package(types.ModuleType):
+	def __setattr__(self, name:str, value) -> None:
+		#importing a submodule binds it on the package, which would hide the class of the same name:
+		if isinstance(value, types.ModuleType) and name in _exports:
+			return
+		super().__setattr__(name, value)
+
+sys.modules[__name__].__class__ = _Package
@@ -0,0 +1,4 @@
+import sys
+from UnitAlg.benchmarks.suite import main
+
+sys.exit(main())
@@ -0,0 +1,87 @@
+'''
+Compares a small control loop written with the allocating operators
+against the same loop written with the in place operators and out= targets.
+
+Run with: python -m UnitAlg.benchmarks.allocations
+'''
+from typing import Callable, Dict
+import time
+import tracemalloc
+
+from UnitAlg import Vector3, Quaternion, Transform
+
+def _make_state() -> Dict:
+	return {
+		'position':Vector3(0,0,0),
+		'velocity':Vector3(1,0,0),
+		'acceleration':Vector3(0,0.001,0),
+		'up':Vector3(0,0,1),
+		'heading':Vector3(0,0,0),
+		'target':Vector3(0,0,0),
+		'spin':Quaternion.from_angle_axis(0.001, Vector3(0,0,1)),
+		'orientation':Quaternion(0,0,0,1),
+		'pose':Transform(),
+		'next_pose':Transform(),
+		'delta':Transform.Translate(Vector3(0.01,0,0)),
+	}
+
+def allocating_step(state:Dict) -> None:
+	state['velocity'] = state['velocity'] + state['acceleration']
+	state['position'] = state['position'] + state['velocity']
+	state['heading'] = Vector3.cross(state['velocity'], state['up']).normalized
+	state['orientation'] = state['spin'] * state['orientation']
+	state['pose'] = state['pose'] * state['delta']
+	state['target'] = state['orientation'] * state['heading']
+
+def in_place_step(state:Dict) -> None:
+	velocity = state['velocity']
+	velocity += state['acceleration']
+	state['position'] += velocity
+	Vector3.cross(velocity, state['up'], out=state['heading']).normalize()
+	Quaternion.multiply(state['spin'], state['orientation'], out=state['orientation'])
+	#matmul copies its inputs when out aliases them, so ping-pong between two poses:
+	Transform.multiply(state['pose'], state['delta'], out=state['next_pose'])
+	state['pose'], state['next_pose'] = state['next_pose'], state['pose']
+	state['orientation'].rotate(state['heading'], out=state['target'])
+
+def measure(step:Callable[[Dict],None], iterations:int=10000) -> Dict[str,float]:
+	'''
+	Returns seconds per iteration, and the peak bytes of temporaries
+	alive at once during an iteration (traced by tracemalloc).
+	'''
+	state = _make_state()
+	for _ in range(100):
+		step(state)
+		
+	start = time.perf_counter()
+	for _ in range(iterations):
+		step(state)
+	seconds = (time.perf_counter() - start)/iterations
+	
+	tracemalloc.start()
+	peak = 0
+	for _ in range(100):
+		if hasattr(tracemalloc, 'reset_peak'):
+			current, _ = tracemalloc.get_traced_memory()
+			tracemalloc.reset_peak()
+		else:
+			#before python 3.9, clearing the traces is the only way to zero the peak (and current) size:
+			tracemalloc.clear_traces()
+			current = 0
+		step(state)
+		peak = max(peak, tracemalloc.get_traced_memory()[1] - current)
+	tracemalloc.stop()
+	return {'seconds':seconds, 'peak_temporary_bytes':peak}
+
+def run(iterations:int=10000) -> Dict[str,Dict[str,float]]:
+	return {
+		'allocating':measure(allocating_step, iterations),
+		'in_place':measure(in_place_step, iterations),
+	}
+
+def main() -> None:
+	for name, result in run().items():
+		print('{:<12} {:>8.2f} us/iter {:>6d} peak temporary bytes/iter'.format(name, result['seconds']*1e6, result['peak_temporary_bytes']))
+
+if __name__ == '__main__':
+	main()
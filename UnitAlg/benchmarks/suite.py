@@ -0,0 +1,779 @@
+'''
+Times the constructors, operators, conversions and properties of
+Vector3, Quaternion, Transform, Plane, Ray and Range, along with their
+array counterparts, and compares the results against a stored baseline.
+
+Every scalar case is timed once per call (size 1) and looped over a
+batch of inputs, array cases are timed on whole batches. Times are
+recorded per element so sizes can be compared with each other.
+Import cases time an import statement in a fresh interpreter (size 1).
+
+Run with: python -m UnitAlg.benchmarks [--help]
+'''
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from contextlib import contextmanager
+import argparse
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import time
+import timeit
+import numpy as np
+
+from UnitAlg import Vector3, Vector3Array, Quaternion, QuaternionArray, Transform, TransformArray, TransformChain, TransformTree, FrameBuffer, Ray, RayArray, Plane, PlaneArray, SpatialGrid, CoordinateFrame
+from UnitAlg.Range import Range
+from UnitAlg.Convertable import bulk_attributes
+from UnitAlg.RangeArray import RangeArray
+from UnitAlg.RangeIndex import RangeIndex
+
+#random inputs for one element, and the operation to time on them:
+ArgsMaker = Callable[[np.random.Generator], Tuple]
+BatchMaker = Callable[[np.random.Generator, int], Tuple]
+
+scalar_cases:Dict[str, Tuple[ArgsMaker, Callable]] = {}
+array_cases:Dict[str, Tuple[BatchMaker, Callable]] = {}
+import_cases:Dict[str, str] = {}
+
+default_scalar_sizes = (1, 100)
+default_array_sizes = (100, 10000)
+#relative to the working directory, since the installed package may be read only:
+default_baseline = 'benchmark_baseline.json'
+
+def scalar_case(name:str, make_args:ArgsMaker) -> Callable[[Callable], Callable]:
+	''' Registers op(*make_args(rng)) as a benchmark of a single element operation. '''
+	def register(op:Callable) -> Callable:
+		scalar_cases[name] = (make_args, op)
+		return op
+	return register
+
+def array_case(name:str, make_args:BatchMaker) -> Callable[[Callable], Callable]:
+	''' Registers op(*make_args(rng, size)) as a benchmark of a whole batch operation. '''
+	def register(op:Callable) -> Callable:
+		array_cases[name] = (make_args, op)
+		return op
+	return register
+
+def import_case(name:str, statement:str) -> None:
+	''' Registers the time statement takes to run in a new python process, as a benchmark of startup cost. '''
+	import_cases[name] = statement
+
+#----Inputs----
+def _vector(rng:np.random.Generator) -> Vector3:
+	return Vector3(*rng.uniform(-10, 10, 3).tolist())
+
+def _direction(rng:np.random.Generator) -> Vector3:
+	return _vector(rng).normalized
+
+def _quaternion(rng:np.random.Generator) -> Quaternion:
+	return Quaternion.from_angle_axis(float(rng.uniform(0.1, 3)), _direction(rng))
+
+def _transform(rng:np.random.Generator) -> Transform:
+	return Transform.TRS(_vector(rng), _quaternion(rng), Vector3(*rng.uniform(0.5, 2, 3).tolist()))
+
+def _plane(rng:np.random.Generator) -> Plane:
+	return Plane(_vector(rng), _direction(rng))
+
+def _ray(rng:np.random.Generator) -> Ray:
+	return Ray(_vector(rng), _direction(rng))
+
+def _range(rng:np.random.Generator) -> Range:
+	low = float(rng.uniform(-10, 10))
+	return Range(low, low + float(rng.uniform(0, 10)))
+
+def _points(rng:np.random.Generator, count:int) -> List[Vector3]:
+	return [_vector(rng) for _ in range(count)]
+
+def _vectors(rng:np.random.Generator, count:int) -> Vector3Array:
+	return Vector3Array._from_np(rng.uniform(-10, 10, (count,3)))
+
+def _directions(rng:np.random.Generator, count:int) -> Vector3Array:
+	return _vectors(rng, count).normalized
+
+def _quaternions(rng:np.random.Generator, count:int) -> QuaternionArray:
+	return QuaternionArray.from_angle_axis(rng.uniform(0.1, 3, count), _directions(rng, count))
+
+def _ranges(rng:np.random.Generator, count:int) -> RangeArray:
+	lows = rng.uniform(-10, 10, count)
+	return RangeArray(lows, lows + rng.uniform(0, 10, count))
+
+class _PointMsg():
+	''' A message type from another framework, converted by registered conversions '''
+	__slots__ = ('x', 'y', 'z')
+	def __init__(self, x:float, y:float, z:float) -> None:
+		self.x, self.y, self.z = x, y, z
+
+class _BulkPointMsg(_PointMsg):
+	__slots__ = ()
+
+@contextmanager
+def _message_conversions() -> Iterator[None]:
+	''' Registers the message conversions the cases use, only while they run '''
+	Vector3.from_conversions[_PointMsg] = lambda m: Vector3(m.x, m.y, m.z)
+	Vector3.bulk_from_conversions[_BulkPointMsg] = bulk_attributes('x', 'y', 'z')
+	try:
+		yield
+	finally:
+		Vector3.from_conversions.pop(_PointMsg, None)
+		Vector3.bulk_from_conversions.pop(_BulkPointMsg, None)
+
+def _messages(rng:np.random.Generator, count:int, msg_type:type=_PointMsg) -> List[_PointMsg]:
+	return [msg_type(*p) for p in rng.uniform(-10, 10, (count,3)).tolist()]
+
+def _transforms(rng:np.random.Generator, count:int) -> TransformArray:
+	return TransformArray.TRS(_vectors(rng, count), _quaternions(rng, count), rng.uniform(0.5, 2, (count,3)))
+
+#----Vector3----
+@scalar_case('Vector3.__init__(x,y,z)', lambda rng: tuple(rng.uniform(-10, 10, 3).tolist()))
+def _(x, y, z): return Vector3(x, y, z)
+@scalar_case('Vector3.__init__(list)', lambda rng: (rng.uniform(-10, 10, 3).tolist(),))
+def _(values): return Vector3(values)
+@scalar_case('Vector3.__init__(ndarray)', lambda rng: (rng.uniform(-10, 10, 3),))
+def _(values): return Vector3(values)
+@scalar_case('Vector3.zero', lambda rng: ())
+def _(): return Vector3.zero
+@scalar_case('Vector3.one', lambda rng: ())
+def _(): return Vector3.one
+@scalar_case('Vector3.up', lambda rng: ())
+def _(): return Vector3.up
+@scalar_case('Vector3.forward', lambda rng: ())
+def _(): return Vector3.forward
+@scalar_case('Vector3.right', lambda rng: ())
+def _(): return Vector3.right
+@scalar_case('Vector3.value', lambda rng: (_vector(rng),))
+def _(v): return v.value
+@scalar_case('Vector3.x', lambda rng: (_vector(rng),))
+def _(v): return v.x
+@scalar_case('Vector3.x=', lambda rng: (_vector(rng), float(rng.uniform())))
+def _(v, x): v.x = x
+@scalar_case('Vector3.__getitem__', lambda rng: (_vector(rng),))
+def _(v): return v[1]
+@scalar_case('Vector3.__iter__', lambda rng: (_vector(rng),))
+def _(v): return tuple(v)
+@scalar_case('Vector3.sq_magnitude', lambda rng: (_vector(rng),))
+def _(v): return v.sq_magnitude
+@scalar_case('Vector3.magnitude', lambda rng: (_vector(rng),))
+def _(v): return v.magnitude
+@scalar_case('Vector3.normalized', lambda rng: (_vector(rng),))
+def _(v): return v.normalized
+@scalar_case('Vector3.normalize', lambda rng: (_vector(rng),))
+def _(v): return v.normalize()
+@scalar_case('Vector3.distance', lambda rng: (_vector(rng), _vector(rng)))
+def _(a, b): return Vector3.distance(a, b)
+@scalar_case('Vector3.sq_distance', lambda rng: (_vector(rng), _vector(rng)))
+def _(a, b): return Vector3.sq_distance(a, b)
+@scalar_case('Vector3.angle', lambda rng: (_vector(rng), _vector(rng)))
+def _(a, b): return Vector3.angle(a, b)
+@scalar_case('Vector3.signed_angle', lambda rng: (_vector(rng), _vector(rng), _direction(rng)))
+def _(a, b, axis): return Vector3.signed_angle(a, b, axis)
+@scalar_case('Vector3.signed_angle2', lambda rng: (_vector(rng), _vector(rng), _direction(rng)))
+def _(a, b, axis): return Vector3.signed_angle2(a, b, axis)
+@scalar_case('Vector3.cross', lambda rng: (_vector(rng), _vector(rng)))
+def _(a, b): return Vector3.cross(a, b)
+@scalar_case('Vector3.cross(out=)', lambda rng: (_vector(rng), _vector(rng), _vector(rng)))
+def _(a, b, out): return Vector3.cross(a, b, out=out)
+@scalar_case('Vector3.dot', lambda rng: (_vector(rng), _vector(rng)))
+def _(a, b): return Vector3.dot(a, b)
+@scalar_case('Vector3.lerp', lambda rng: (_vector(rng), _vector(rng), float(rng.uniform())))
+def _(a, b, t): return Vector3.lerp(a, b, t)
+@scalar_case('Vector3.project_point', lambda rng: (_vector(rng), _direction(rng)))
+def _(v, normal): return Vector3.project_point(v, normal)
+@scalar_case('Vector3.__add__', lambda rng: (_vector(rng), _vector(rng)))
+def _(a, b): return a + b
+@scalar_case('Vector3.__iadd__', lambda rng: (_vector(rng), _vector(rng)))
+def _(a, b): a += b
+@scalar_case('Vector3.__sub__', lambda rng: (_vector(rng), _vector(rng)))
+def _(a, b): return a - b
+@scalar_case('Vector3.__isub__', lambda rng: (_vector(rng), _vector(rng)))
+def _(a, b): a -= b
+@scalar_case('Vector3.__mul__(float)', lambda rng: (_vector(rng), float(rng.uniform())))
+def _(a, s): return a * s
+@scalar_case('Vector3.__mul__(Vector3)', lambda rng: (_vector(rng), _vector(rng)))
+def _(a, b): return a * b
+@scalar_case('Vector3.__rmul__', lambda rng: (_vector(rng), float(rng.uniform())))
+def _(a, s): return s * a
+@scalar_case('Vector3.__imul__', lambda rng: (_vector(rng), 1.0))
+def _(a, s): a *= s
+@scalar_case('Vector3.__truediv__', lambda rng: (_vector(rng), float(rng.uniform(1, 2))))
+def _(a, s): return a / s
+@scalar_case('Vector3.__rtruediv__', lambda rng: (_vector(rng), float(rng.uniform(1, 2))))
+def _(a, s): return s / a
+@scalar_case('Vector3.__itruediv__', lambda rng: (_vector(rng), 1.0))
+def _(a, s): a /= s
+@scalar_case('Vector3.__neg__', lambda rng: (_vector(rng),))
+def _(a): return -a
+@scalar_case('Vector3.__eq__', lambda rng: (_vector(rng), _vector(rng)))
+def _(a, b): return a == b
+@scalar_case('Vector3.__ne__', lambda rng: (_vector(rng), _vector(rng)))
+def _(a, b): return a != b
+@scalar_case('Vector3.__hash__', lambda rng: (_vector(rng),))
+def _(a): return hash(a)
+@scalar_case('Vector3.__str__', lambda rng: (_vector(rng),))
+def _(a): return str(a)
+@scalar_case('Vector3.from_other', lambda rng: (_messages(rng, 1)[0],))
+def _(message): return Vector3.from_other(message)
+@scalar_case('Vector3.__array__', lambda rng: (_vector(rng),))
+def _(a): return np.asarray(a)
+@scalar_case('Vector3.__array_ufunc__(np.add)', lambda rng: (_vector(rng), _vector(rng)))
+def _(a, b): return np.add(a, b)
+@scalar_case('Vector3.from_buffer', lambda rng: (rng.uniform(-10, 10, 3),))
+def _(values): return Vector3.from_buffer(values)
+
+#----Quaternion----
+@scalar_case('Quaternion.__init__(x,y,z,w)', lambda rng: tuple(_quaternion(rng).value.tolist()))
+def _(x, y, z, w): return Quaternion(x, y, z, w)
+@scalar_case('Quaternion.__init__(ndarray)', lambda rng: (_quaternion(rng).value,))
+def _(values): return Quaternion(values)
+@scalar_case('Quaternion.identity', lambda rng: ())
+def _(): return Quaternion.identity
+@scalar_case('Quaternion.from_angle_axis', lambda rng: (float(rng.uniform(0, 3)), _direction(rng)))
+def _(angle, axis): return Quaternion.from_angle_axis(angle, axis)
+@scalar_case('Quaternion.from_euler', lambda rng: tuple(rng.uniform(-3, 3, 3).tolist()))
+def _(x, y, z): return Quaternion.from_euler(x, y, z)
+@scalar_case('Quaternion.from_rotation_matrix', lambda rng: (_transform(rng).rotation_mat,))
+def _(m): return Quaternion.from_rotation_matrix(m)
+@scalar_case('Quaternion.w', lambda rng: (_quaternion(rng),))
+def _(q): return q.w
+@scalar_case('Quaternion.angle', lambda rng: (_quaternion(rng),))
+def _(q):
+	q._derived = None
+	return q.angle
+@scalar_case('Quaternion.axis', lambda rng: (_quaternion(rng),))
+def _(q):
+	q._derived = None
+	return q.axis
+@scalar_case('Quaternion.angle_axis', lambda rng: (_quaternion(rng),))
+def _(q):
+	q._derived = None
+	return q.angle_axis
+@scalar_case('Quaternion.conjugate', lambda rng: (_quaternion(rng),))
+def _(q): return q.conjugate()
+@scalar_case('Quaternion.inverse', lambda rng: (_quaternion(rng),))
+def _(q): return q.inverse
+@scalar_case('Quaternion.normalized', lambda rng: (_quaternion(rng),))
+def _(q): return q.normalized
+@scalar_case('Quaternion.eulers', lambda rng: (_quaternion(rng),))
+def _(q): return q.eulers()
+@scalar_case('Quaternion.lerp', lambda rng: (_quaternion(rng), _quaternion(rng), float(rng.uniform())))
+def _(a, b, t): return Quaternion.lerp(a, b, t)
+@scalar_case('Quaternion.multiply', lambda rng: (_quaternion(rng), _quaternion(rng)))
+def _(a, b): return Quaternion.multiply(a, b)
+@scalar_case('Quaternion.multiply(out=)', lambda rng: (_quaternion(rng), _quaternion(rng), _quaternion(rng)))
+def _(a, b, out): return Quaternion.multiply(a, b, out=out)
+@scalar_case('Quaternion.rotate', lambda rng: (_quaternion(rng), _vector(rng)))
+def _(q, v): return q.rotate(v)
+@scalar_case('Quaternion.__mul__(Quaternion)', lambda rng: (_quaternion(rng), _quaternion(rng)))
+def _(a, b): return a * b
+@scalar_case('Quaternion.__mul__(Vector3)', lambda rng: (_quaternion(rng), _vector(rng)))
+def _(q, v): return q * v
+@scalar_case('Quaternion.__imul__', lambda rng: (_quaternion(rng), Quaternion.identity))
+def _(a, b): a *= b
+@scalar_case('Quaternion.__eq__', lambda rng: (_quaternion(rng), _quaternion(rng)))
+def _(a, b): return a == b
+@scalar_case('Quaternion.__str__', lambda rng: (_quaternion(rng),))
+def _(q): return str(q)
+
+#----Transform----
+@scalar_case('Transform.__init__()', lambda rng: ())
+def _(): return Transform()
+@scalar_case('Transform.__init__(ndarray)', lambda rng: (_transform(rng).mat,))
+def _(m): return Transform(m)
+@scalar_case('Transform.__init__(list)', lambda rng: (_transform(rng).mat.tolist(),))
+def _(m): return Transform(m)
+@scalar_case('Transform.__init__(Vector3,Quaternion,Vector3)', lambda rng: (_vector(rng), _quaternion(rng), _vector(rng)))
+def _(t, r, s): return Transform(t, r, s)
+@scalar_case('Transform.identity', lambda rng: ())
+def _(): return Transform.identity
+@scalar_case('Transform.from_rows', lambda rng: (_direction(rng), _direction(rng), _direction(rng), _vector(rng)))
+def _(x, y, z, p): return Transform.from_rows(x, y, z, p)
+@scalar_case('Transform.from_3x3list', lambda rng: (rng.uniform(-1, 1, 9).tolist(), _vector(rng)))
+def _(m, p): return Transform.from_3x3list(m, p)
+@scalar_case('Transform.Translate', lambda rng: (_vector(rng),))
+def _(t): return Transform.Translate(t)
+@scalar_case('Transform.Rotate', lambda rng: (_quaternion(rng),))
+def _(r): return Transform.Rotate(r)
+@scalar_case('Transform.Rotate_about', lambda rng: (_quaternion(rng), _vector(rng)))
+def _(r, o): return Transform.Rotate_about(r, o)
+@scalar_case('Transform.Scale', lambda rng: (_vector(rng),))
+def _(s): return Transform.Scale(s)
+@scalar_case('Transform.TR', lambda rng: (_vector(rng), _quaternion(rng)))
+def _(t, r): return Transform.TR(t, r)
+@scalar_case('Transform.TRS', lambda rng: (_vector(rng), _quaternion(rng), _vector(rng)))
+def _(t, r, s): return Transform.TRS(t, r, s)
+@scalar_case('Transform.conversion_from_to', lambda rng: (CoordinateFrame.ROS, CoordinateFrame.Unity))
+def _(a, b): return Transform.conversion_from_to(a, b)
+@array_case('FrameConversion.points', lambda rng, n: (CoordinateFrame.conversion(CoordinateFrame.Unity, CoordinateFrame.ROS), _vectors(rng, n)))
+def _(conversion, points): return conversion.points(points)
+@array_case('FrameConversion.poses', lambda rng, n: (CoordinateFrame.conversion(CoordinateFrame.Unity, CoordinateFrame.ROS), TransformArray.TR(_vectors(rng, n), _quaternions(rng, n))))
+def _(conversion, poses): return conversion.poses(poses)
+@scalar_case('Transform.mat', lambda rng: (_transform(rng),))
+def _(t): return t.mat
+@scalar_case('Transform.coefficients_2d', lambda rng: (_transform(rng),))
+def _(t): return t.coefficients_2d
+@scalar_case('Transform.coefficients_3d', lambda rng: (_transform(rng),))
+def _(t): return t.coefficients_3d
+@scalar_case('Transform.translation', lambda rng: (_transform(rng),))
+def _(t): return t.translation
+@scalar_case('Transform.translation=', lambda rng: (_transform(rng), _vector(rng)))
+def _(t, v): t.translation = v
+@scalar_case('Transform.localScale', lambda rng: (_transform(rng),))
+def _(t): return t.localScale
+@scalar_case('Transform.localScale=', lambda rng: (_transform(rng), Vector3(1,2,3)))
+def _(t, s): t.localScale = s
+@scalar_case('Transform.rotation_mat', lambda rng: (_transform(rng),))
+def _(t): return t.rotation_mat
+@scalar_case('Transform.rotation', lambda rng: (_transform(rng),))
+def _(t): return t.rotation
+@scalar_case('Transform.rotation=', lambda rng: (_transform(rng), _quaternion(rng)))
+def _(t, r): t.rotation = r
+@scalar_case('Transform.inverse', lambda rng: (_transform(rng),))
+def _(t): return t.inverse
+@scalar_case('Transform.transpose', lambda rng: (_transform(rng),))
+def _(t): return t.transpose
+@scalar_case('Transform.forward', lambda rng: (_transform(rng),))
+def _(t): return t.forward
+@scalar_case('Transform.up', lambda rng: (_transform(rng),))
+def _(t): return t.up
+@scalar_case('Transform.right', lambda rng: (_transform(rng),))
+def _(t): return t.right
+@scalar_case('Transform.multiply', lambda rng: (_transform(rng), _transform(rng)))
+def _(a, b): return Transform.multiply(a, b)
+@scalar_case('Transform.multiply(out=)', lambda rng: (_transform(rng), _transform(rng), Transform()))
+def _(a, b, out): return Transform.multiply(a, b, out=out)
+@scalar_case('Transform.apply', lambda rng: (_transform(rng), _vector(rng)))
+def _(t, v): return t.apply(v)
+@scalar_case('Transform.__mul__(Transform)', lambda rng: (_transform(rng), _transform(rng)))
+def _(a, b): return a * b
+@scalar_case('Transform.__mul__(Vector3)', lambda rng: (_transform(rng), _vector(rng)))
+def _(t, v): return t * v
+@scalar_case('Transform.__eq__', lambda rng: (_transform(rng), _transform(rng)))
+def _(a, b): return a == b
+@scalar_case('Transform.__str__', lambda rng: (_transform(rng),))
+def _(t): return str(t)
+
+#----Plane----
+@scalar_case('Plane.__init__(position,normal)', lambda rng: (_vector(rng), _direction(rng)))
+def _(p, n): return Plane(p, n)
+@scalar_case('Plane.__init__(p1,p2,p3)', lambda rng: (_vector(rng), _vector(rng), _vector(rng)))
+def _(a, b, c): return Plane(a, b, c)
+@scalar_case('Plane.__init__(a,b,c)', lambda rng: tuple(rng.uniform(-1, 1, 3).tolist()))
+def _(a, b, c): return Plane(a, b, c)
+@scalar_case('Plane.from_point_normal', lambda rng: (_vector(rng), _direction(rng)))
+def _(p, n): return Plane.from_point_normal(p, n)
+@scalar_case('Plane.from_points', lambda rng: (_vector(rng), _vector(rng), _vector(rng)))
+def _(a, b, c): return Plane.from_points(a, b, c)
+@scalar_case('Plane.from_coefficients', lambda rng: tuple(rng.uniform(-1, 1, 3).tolist()))
+def _(a, b, c): return Plane.from_coefficients(a, b, c)
+@scalar_case('Plane.from_arrays', lambda rng: (rng.uniform(-10, 10, 3), rng.uniform(-1, 1, 3)))
+def _(p, n): return Plane.from_arrays(p, n)
+@scalar_case('Plane.__init__(points)', lambda rng: (_points(rng, 16),))
+def _(points): return Plane(points)
+@scalar_case('Plane.fit_coefficients', lambda rng: (_points(rng, 16),))
+def _(points): return Plane.fit_coefficients(points)
+@scalar_case('Plane.position', lambda rng: (_plane(rng),))
+def _(p): return p.position
+@scalar_case('Plane.normal', lambda rng: (_plane(rng),))
+def _(p): return p.normal
+@scalar_case('Plane.a', lambda rng: (Plane(*rng.uniform(-1, 1, 3).tolist()),))
+def _(p): return p.a
+@scalar_case('Plane.raycast', lambda rng: (_plane(rng), _ray(rng)))
+def _(p, r): return p.raycast(r)
+@scalar_case('Plane.reflect(Vector3)', lambda rng: (_plane(rng), _direction(rng)))
+def _(p, d): return p.reflect(d)
+@scalar_case('Plane.reflect(Ray)', lambda rng: (_plane(rng), _ray(rng)))
+def _(p, r): return p.reflect(r)
+@scalar_case('Plane.__str__', lambda rng: (_plane(rng),))
+def _(p): return str(p)
+
+#----Ray----
+@scalar_case('Ray.__init__', lambda rng: (_vector(rng), _direction(rng)))
+def _(o, d): return Ray(o, d)
+@scalar_case('Ray.at', lambda rng: (_ray(rng), float(rng.uniform(0, 10))))
+def _(r, t): return r.at(t)
+@scalar_case('Ray.closest_point', lambda rng: (_ray(rng), _vector(rng)))
+def _(r, p): return r.closest_point(p)
+@scalar_case('Ray.skew_point', lambda rng: (_ray(rng), _ray(rng)))
+def _(a, b): return a.skew_point(b)
+@scalar_case('Ray.__str__', lambda rng: (_ray(rng),))
+def _(r): return str(r)
+
+#----Range----
+@scalar_case('Range.__init__', lambda rng: (0.0, float(rng.uniform(0, 10))))
+def _(low, high): return Range(low, high)
+@scalar_case('Range.from_point', lambda rng: (float(rng.uniform()),))
+def _(p): return Range.from_point(p)
+@scalar_case('Range.from_center_delta', lambda rng: (float(rng.uniform()), float(rng.uniform())))
+def _(c, d): return Range.from_center_delta(c, d)
+@scalar_case('Range.overlaps', lambda rng: (_range(rng), _range(rng)))
+def _(a, b): return a.overlaps(b)
+@scalar_case('Range.overlapping', lambda rng: (_range(rng), _range(rng)))
+def _(a, b): return a.overlapping(b)
+@scalar_case('Range.clamp', lambda rng: (_range(rng), float(rng.uniform(-20, 20))))
+def _(r, v): return r.clamp(v)
+@scalar_case('Range.__mul__', lambda rng: (_range(rng), float(rng.uniform())))
+def _(r, s): return r * s
+@scalar_case('Range.__rmul__', lambda rng: (_range(rng), float(rng.uniform())))
+def _(r, s): return s * r
+@scalar_case('Range.__truediv__', lambda rng: (_range(rng), float(rng.uniform(1, 2))))
+def _(r, s): return r / s
+@scalar_case('Range.__contains__', lambda rng: (_range(rng), float(rng.uniform(-20, 20))))
+def _(r, v): return v in r
+@scalar_case('Range.__str__', lambda rng: (_range(rng),))
+def _(r): return str(r)
+
+#----Vector3Array----
+@array_case('Vector3Array.__init__(ndarray)', lambda rng, n: (rng.uniform(-10, 10, (n,3)),))
+def _(values): return Vector3Array(values)
+@array_case('Vector3Array.__init__(list of Vector3)', lambda rng, n: (_points(rng, n),))
+def _(vectors): return Vector3Array(vectors)
+@array_case('Vector3Array.from_other (per message)', lambda rng, n: (_messages(rng, n),))
+def _(messages): return Vector3Array.from_other(messages)
+@array_case('Vector3Array.from_other (bulk_attributes)', lambda rng, n: (_messages(rng, n, _BulkPointMsg),))
+def _(messages): return Vector3Array.from_other(messages)
+@array_case('Vector3Array.from_buffer', lambda rng, n: (rng.uniform(-10, 10, (n,3)),))
+def _(values): return Vector3Array.from_buffer(values)
+@array_case('np.array(list of Vector3)', lambda rng, n: (_points(rng, n),))
+def _(vectors): return np.array(vectors)
+@array_case('Vector3Array.__array_ufunc__(ndarray * Vector3Array)', lambda rng, n: (rng.uniform(1, 2, n), _vectors(rng, n)))
+def _(scales, a): return scales * a
+@array_case('Vector3Array.to_list', lambda rng, n: (_vectors(rng, n),))
+def _(a): return a.to_list()
+@array_case('Vector3Array.magnitude', lambda rng, n: (_vectors(rng, n),))
+def _(a): return a.magnitude
+@array_case('Vector3Array.normalized', lambda rng, n: (_vectors(rng, n),))
+def _(a): return a.normalized
+@array_case('Vector3Array.distance', lambda rng, n: (_vectors(rng, n), _vectors(rng, n)))
+def _(a, b): return Vector3Array.distance(a, b)
+@array_case('Vector3Array.angle', lambda rng, n: (_vectors(rng, n), _vectors(rng, n)))
+def _(a, b): return Vector3Array.angle(a, b)
+@array_case('Vector3Array.signed_angle', lambda rng, n: (_vectors(rng, n), _vectors(rng, n), _directions(rng, n)))
+def _(a, b, axis): return Vector3Array.signed_angle(a, b, axis)
+@array_case('Vector3Array.cross', lambda rng, n: (_vectors(rng, n), _vectors(rng, n)))
+def _(a, b): return Vector3Array.cross(a, b)
+@array_case('Vector3Array.dot', lambda rng, n: (_vectors(rng, n), _vectors(rng, n)))
+def _(a, b): return Vector3Array.dot(a, b)
+@array_case('Vector3Array.lerp', lambda rng, n: (_vectors(rng, n), _vectors(rng, n), rng.uniform(0, 1, n)))
+def _(a, b, t): return Vector3Array.lerp(a, b, t)
+@array_case('Vector3Array.project_point', lambda rng, n: (_vectors(rng, n), _directions(rng, n)))
+def _(a, normal): return Vector3Array.project_point(a, normal)
+@array_case('Vector3Array.weld (half repeated)', lambda rng, n: (np.repeat(rng.uniform(-10, 10, ((n+1)//2,3)), 2, axis=0)[:n] + rng.uniform(0, 1e-7, (n,3)),))
+def _(points): return Vector3Array.weld(points, 1e-6)
+@array_case('Vector3Array.weld (list of Vector3)', lambda rng, n: (_points(rng, n),))
+def _(vectors): return Vector3Array.weld(vectors, 1e-6)
+@array_case('Vector3Array.__add__', lambda rng, n: (_vectors(rng, n), _vectors(rng, n)))
+def _(a, b): return a + b
+@array_case('Vector3Array.__iadd__', lambda rng, n: (_vectors(rng, n), _vectors(rng, n)))
+def _(a, b): a += b
+@array_case('Vector3Array.__mul__(float)', lambda rng, n: (_vectors(rng, n), 2.0))
+def _(a, s): return a * s
+@array_case('Vector3Array.__eq__', lambda rng, n: (_vectors(rng, n), _vectors(rng, n)))
+def _(a, b): return a == b
+
+#----QuaternionArray----
+@array_case('QuaternionArray.from_angle_axis', lambda rng, n: (rng.uniform(0, 3, n), _directions(rng, n)))
+def _(angles, axes): return QuaternionArray.from_angle_axis(angles, axes)
+@array_case('QuaternionArray.from_euler', lambda rng, n: tuple(rng.uniform(-3, 3, (3,n))))
+def _(x, y, z): return QuaternionArray.from_euler(x, y, z)
+@array_case('QuaternionArray.from_rotation_matrix', lambda rng, n: (_quaternions(rng, n).rotation_matrix,))
+def _(m): return QuaternionArray.from_rotation_matrix(m)
+@array_case('QuaternionArray.rotation_matrix', lambda rng, n: (_quaternions(rng, n),))
+def _(q): return q.rotation_matrix
+@array_case('QuaternionArray.inverse', lambda rng, n: (_quaternions(rng, n),))
+def _(q): return q.inverse
+@array_case('QuaternionArray.eulers', lambda rng, n: (_quaternions(rng, n),))
+def _(q): return q.eulers()
+@array_case('QuaternionArray.multiply', lambda rng, n: (_quaternions(rng, n), _quaternions(rng, n)))
+def _(a, b): return QuaternionArray.multiply(a, b)
+@array_case('QuaternionArray.rotate', lambda rng, n: (_quaternions(rng, n), _vectors(rng, n)))
+def _(q, v): return QuaternionArray.rotate(q, v)
+@array_case('QuaternionArray.rotate(Quaternion)', lambda rng, n: (_quaternion(rng), _vectors(rng, n)))
+def _(q, v): return QuaternionArray.rotate(q, v)
+@array_case('QuaternionArray.slerp', lambda rng, n: (_quaternions(rng, n), _quaternions(rng, n), rng.uniform(0, 1, n)))
+def _(a, b, t): return QuaternionArray.slerp(a, b, t)
+@array_case('QuaternionArray.nlerp', lambda rng, n: (_quaternions(rng, n), _quaternions(rng, n), rng.uniform(0, 1, n)))
+def _(a, b, t): return QuaternionArray.nlerp(a, b, t)
+
+#----TransformArray----
+@array_case('TransformArray.__init__(list of Transform)', lambda rng, n: (_transforms(rng, n).to_list(),))
+def _(transforms): return TransformArray(transforms)
+@array_case('TransformArray.TRS', lambda rng, n: (_vectors(rng, n), _quaternions(rng, n), _vectors(rng, n)))
+def _(t, r, s): return TransformArray.TRS(t, r, s)
+@array_case('TransformArray.translation', lambda rng, n: (_transforms(rng, n),))
+def _(t): return t.translation
+@array_case('TransformArray.localScale', lambda rng, n: (_transforms(rng, n),))
+def _(t): return t.localScale
+@array_case('TransformArray.rotation', lambda rng, n: (_transforms(rng, n),))
+def _(t): return t.rotation
+@array_case('TransformArray.inverse', lambda rng, n: (_transforms(rng, n),))
+def _(t): return t.inverse
+@array_case('TransformArray.multiply', lambda rng, n: (_transforms(rng, n), _transforms(rng, n)))
+def _(a, b): return TransformArray.multiply(a, b)
+@array_case('TransformArray.apply', lambda rng, n: (_transforms(rng, n), _vectors(rng, n)))
+def _(t, v): return t.apply(v)
+@array_case('TransformArray.apply(Transform)', lambda rng, n: (TransformArray([_transform(rng)]), _vectors(rng, n)))
+def _(t, v): return t.apply(v)
+
+#----RayArray----
+def _rays(rng:np.random.Generator, count:int) -> RayArray:
+	return RayArray(_vectors(rng, count), _directions(rng, count))
+
+@array_case('RayArray.at', lambda rng, n: (_rays(rng, n), rng.uniform(0, 10, n)))
+def _(r, t): return r.at(t)
+@array_case('RayArray.closest_point', lambda rng, n: (_rays(rng, n), _vectors(rng, n)))
+def _(r, p): return r.closest_point(p)
+@array_case('RayArray.skew_point', lambda rng, n: (_rays(rng, n), _rays(rng, n)))
+def _(a, b): return a.skew_point(b)
+@array_case('RayArray.nearest_point (groups of 8)', lambda rng, n: (_rays(rng, n), rng.integers(0, max(1, n//8), n)))
+def _(r, labels): return r.nearest_point(labels)
+
+#----PlaneArray----
+def _planes(rng:np.random.Generator, count:int) -> PlaneArray:
+	return PlaneArray(_vectors(rng, count), _directions(rng, count))
+
+@array_case('Plane.raycast_all', lambda rng, n: (_plane(rng), _vectors(rng, n), _directions(rng, n)))
+def _(p, o, d): return p.raycast_all(o, d)
+@array_case('PlaneArray.raycast (8 planes)', lambda rng, n: (_planes(rng, 8), _vectors(rng, n), _directions(rng, n)))
+def _(p, o, d): return p.raycast(o, d)
+@array_case('PlaneArray.fit (groups of 16)', lambda rng, n: (_vectors(rng, n), rng.integers(0, max(1, n//16), n)))
+def _(points, labels): return PlaneArray.fit(points, labels)
+
+#----RangeArray----
+@array_case('RangeArray.__init__(list of Range)', lambda rng, n: ([_range(rng) for _ in range(n)],))
+def _(ranges): return RangeArray(ranges)
+@array_case('RangeArray.overlaps', lambda rng, n: (_ranges(rng, n), _ranges(rng, n)))
+def _(a, b): return a.overlaps(b)
+@array_case('RangeArray.overlapping', lambda rng, n: (_ranges(rng, n), _ranges(rng, n)))
+def _(a, b): return a.overlapping(b)
+@array_case('RangeArray.clamp', lambda rng, n: (_ranges(rng, n), rng.uniform(-20, 20, n)))
+def _(r, v): return r.clamp(v)
+@array_case('RangeArray.clamp (n configurations of 8 joints)', lambda rng, n: (_ranges(rng, 8), rng.uniform(-20, 20, (n,8))))
+def _(r, v): return r.clamp(v)
+@array_case('RangeArray.contains', lambda rng, n: (_ranges(rng, n), rng.uniform(-20, 20, n)))
+def _(r, v): return r.contains(v)
+@array_case('RangeArray.__mul__', lambda rng, n: (_ranges(rng, n), float(rng.uniform())))
+def _(r, s): return r * s
+
+#----RangeIndex----
+def _time_windows(rng:np.random.Generator, count:int) -> RangeArray:
+	starts = np.sort(rng.uniform(0, count, count))
+	return RangeArray(starts, starts + rng.exponential(2, count))
+@array_case('RangeIndex.__init__', lambda rng, n: (_time_windows(rng, n),))
+def _(ranges): return RangeIndex(ranges)
+@array_case('RangeIndex.query (n values)', lambda rng, n: (RangeIndex(_time_windows(rng, n)), rng.uniform(0, n, n)))
+def _(index, values): return index.query(values)
+@array_case('RangeIndex.pairs (n ranges)', lambda rng, n: (RangeIndex(_time_windows(rng, n)), _time_windows(rng, n)))
+def _(index, windows): return index.pairs(windows)
+@array_case('RangeIndex.count (n ranges)', lambda rng, n: (RangeIndex(_time_windows(rng, n)), _time_windows(rng, n)))
+def _(index, windows): return index.count(windows)
+
+#----SpatialGrid----
+def _grid(rng:np.random.Generator, count:int) -> SpatialGrid:
+	''' count points in a cube holding about 2 per cell '''
+	size = (count/2) ** (1/3)
+	return SpatialGrid(rng.uniform(0, size, (count,3)), cell_size=1.0)
+
+@array_case('SpatialGrid.__init__', lambda rng, n: (rng.uniform(0, (n/2) ** (1/3), (n,3)),))
+def _(points): return SpatialGrid(points)
+@array_case('SpatialGrid.nearest (k=4, n queries)', lambda rng, n: (_grid(rng, n), rng.uniform(0, (n/2) ** (1/3), (n,3))))
+def _(grid, queries): return grid.nearest(queries, 4)
+@array_case('SpatialGrid.radius (n queries)', lambda rng, n: (_grid(rng, n), rng.uniform(0, (n/2) ** (1/3), (n,3))))
+def _(grid, queries): return grid.radius(queries, 1.0)
+
+#----TransformChain----
+@scalar_case('TransformChain.__setitem__ (1 of 16)', lambda rng: (TransformChain([_transform(rng) for _ in range(16)]), _transform(rng)))
+def _(chain, t):
+	chain[7] = t
+	return chain.mat
+@array_case('TransformChain.apply (16 transforms)', lambda rng, n: (TransformChain([_transform(rng) for _ in range(16)]), _vectors(rng, n)))
+def _(chain, points): return chain.apply(points)
+
+#----TransformTree----
+def _tree(rng:np.random.Generator, count:int) -> TransformTree:
+	tree = TransformTree(count)
+	for i in range(count):
+		tree.add(None if i == 0 else tree[int(rng.integers(0, i))], _vector(rng), _quaternion(rng))
+	tree.update()
+	return tree
+
+@scalar_case('TransformNode.world (after moving root child)', lambda rng: (_tree(rng, 64),))
+def _(tree):
+	tree[1].translation = Vector3.one
+	return tree[63].world
+@array_case('TransformTree.update (1% moved)', lambda rng, n: (_tree(rng, n), rng.integers(0, n, max(1, n//100)).tolist()))
+def _(tree, moving):
+	for i in moving:
+		tree[i].translation = Vector3.one
+	tree.update()
+
+#----FrameBuffer----
+def _frames(rng:np.random.Generator, samples:int=100) -> FrameBuffer:
+	''' A chain world -> base -> arm -> hand, plus world -> camera, sampled once a second '''
+	frames = FrameBuffer(samples)
+	times = np.arange(samples, dtype=np.float64)
+	for parent, child in (('world','base'), ('base','arm'), ('arm','hand'), ('world','camera')):
+		frames.set(parent, child, times, TransformArray.TR(_vectors(rng, samples), _quaternions(rng, samples)))
+	return frames
+
+@scalar_case('FrameBuffer.lookup (4 edges)', lambda rng: (_frames(rng), float(rng.uniform(0, 99))))
+def _(frames, t): return frames.lookup('camera', 'hand', t)
+@array_case('FrameBuffer.lookup (4 edges)', lambda rng, n: (_frames(rng), rng.uniform(0, 99, n)))
+def _(frames, times): return frames.lookup('camera', 'hand', times)
+
+#----Imports----
+import_case('import.UnitAlg', 'import UnitAlg')
+import_case('import.Vector3', 'from UnitAlg import Vector3')
+import_case('import.Transform', 'from UnitAlg import Transform')
+import_case('import.all', 'from UnitAlg import *')
+
+#----Timing----
+def _time(call:Callable[[],Any], min_time:float, repeat:int) -> float:
+	''' Returns the best seconds per call of repeat runs, each lasting about min_time. '''
+	timer = timeit.Timer(call)
+	number = 1
+	while True:
+		seconds = timer.timeit(number)
+		if seconds >= min_time/10 or number >= 1e6:
+			break
+		number *= 10
+	number = max(1, int(number * min_time / max(seconds, 1e-9)))
+	return min(timer.repeat(repeat, number))/number
+
+#directory UnitAlg is imported from, for the import cases' processes:
+_package_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def _time_import(statement:str, repeat:int) -> float:
+	''' Returns the best seconds statement took in repeat new processes, not counting interpreter startup. '''
+	code = 'import time\nstart = time.perf_counter()\n{}\nprint(time.perf_counter() - start)'.format(statement)
+	env = dict(os.environ)
+	env['PYTHONPATH'] = os.pathsep.join(p for p in (_package_root, env.get('PYTHONPATH')) if p)
+	times = []
+	for _ in range(repeat):
+		output = subprocess.run([sys.executable, '-c', code], env=env, stdout=subprocess.PIPE, check=True, universal_newlines=True).stdout
+		times.append(float(output.split()[-1]))
+	return min(times)
+
+def _looped(op:Callable, args:List[Tuple]) -> Callable[[],None]:
+	if len(args) == 1:
+		first = args[0]
+		return lambda: op(*first)
+	return lambda: [op(*a) for a in args]
+
+def run(pattern:str='', scalar_sizes:Sequence[int]=default_scalar_sizes, array_sizes:Sequence[int]=default_array_sizes, min_time:float=0.02, repeat:int=3, seed:int=0, progress:Optional[Callable[[str,Dict[str,float]],None]]=None) -> Dict[str,Any]:
+	'''
+	Times every case whose name contains pattern, returning a json ready dict of
+	{'meta':{...}, 'results':{'<case>[<size>]':{'seconds':..., 'per_element':..., 'size':...}}}.
+	'''
+	results = {}
+	def record(name:str, size:int, seconds:float) -> None:
+		key = '{}[{}]'.format(name, size)
+		results[key] = {'seconds':seconds, 'per_element':seconds/size, 'size':size}
+		if progress is not None:
+			progress(key, results[key])
+
+	with np.errstate(all='ignore'), _message_conversions():
+		for name, (make_args, op) in scalar_cases.items():
+			if pattern not in name:
+				continue
+			for size in scalar_sizes:
+				rng = np.random.default_rng(seed)
+				record(name, size, _time(_looped(op, [make_args(rng) for _ in range(size)]), min_time, repeat))
+		for name, (make_args, op) in array_cases.items():
+			if pattern not in name:
+				continue
+			for size in array_sizes:
+				args = make_args(np.random.default_rng(seed), size)
+				record(name, size, _time(lambda: op(*args), min_time, repeat))
+		for name, statement in import_cases.items():
+			if pattern in name:
+				record(name, 1, _time_import(statement, repeat))
+
+	return {
+		'meta':{
+			'created':time.strftime('%Y-%m-%dT%H:%M:%S'),
+			'python':platform.python_version(),
+			'numpy':np.__version__,
+			'platform':platform.platform(),
+		},
+		'results':results,
+	}
+
+#----Reporting----
+def save(report:Dict[str,Any], path:str) -> None:
+	with open(path, 'w') as f:
+		json.dump(report, f, indent='\t', sort_keys=True)
+
+def load(path:str) -> Dict[str,Any]:
+	with open(path) as f:
+		return json.load(f)
+
+def compare(report:Dict[str,Any], baseline:Dict[str,Any], threshold:float=0.1) -> List[Dict[str,Any]]:
+	'''
+	Compares the cases both reports share, returning a row per case with
+	ratio = current/baseline and status 'faster', 'slower' or 'same'
+	(within threshold, as a fraction of the baseline time).
+	'''
+	rows = []
+	for key, current in report['results'].items():
+		old = baseline['results'].get(key)
+		if old is None:
+			continue
+		ratio = current['seconds']/old['seconds'] if old['seconds'] > 0 else math.inf
+		if ratio > 1 + threshold:
+			status = 'slower'
+		elif ratio < 1 - threshold:
+			status = 'faster'
+		else:
+			status = 'same'
+		rows.append({'case':key, 'baseline':old['seconds'], 'current':current['seconds'], 'ratio':ratio, 'status':status})
+	return rows
+
+def _format_seconds(seconds:float) -> str:
+	for unit, scale in (('s',1), ('ms',1e-3), ('us',1e-6)):
+		if seconds >= scale:
+			return '{:8.2f} {}'.format(seconds/scale, unit)
+	return '{:8.2f} ns'.format(seconds/1e-9)
+
+def main(argv:Optional[List[str]]=None) -> int:
+	parser = argparse.ArgumentParser(prog='python -m UnitAlg.benchmarks', description=__doc__.strip().splitlines()[0])
+	parser.add_argument('-k', '--filter', default='', help='only run cases whose name contains this text')
+	parser.add_argument('--scalar-sizes', default=','.join(map(str, default_scalar_sizes)), help='comma separated element counts for scalar cases')
+	parser.add_argument('--array-sizes', default=','.join(map(str, default_array_sizes)), help='comma separated element counts for array cases')
+	parser.add_argument('--min-time', type=float, default=0.02, help='seconds each timing repeat should last')
+	parser.add_argument('--repeat', type=int, default=3, help='timing repeats, the best is kept')
+	parser.add_argument('-o', '--output', help='write the results to this json file')
+	parser.add_argument('--baseline', default=default_baseline, help='json results to compare against (default: %(default)s)')
+	parser.add_argument('--save-baseline', action='store_true', help='store the results as the new baseline')
+	parser.add_argument('--threshold', type=float, default=0.1, help='fractional change reported as faster/slower')
+	parser.add_argument('--fail-on-regression', action='store_true', help='exit with 1 when any case got slower')
+	args = parser.parse_args(argv)
+
+	def progress(key:str, result:Dict[str,float]) -> None:
+		print('{:<56} {} {}/element'.format(key, _format_seconds(result['seconds']), _format_seconds(result['per_element'])))
+	report = run(args.filter,
+		[int(s) for s in args.scalar_sizes.split(',') if s],
+		[int(s) for s in args.array_sizes.split(',') if s],
+		args.min_time, args.repeat, progress=progress)
+
+	if args.output:
+		save(report, args.output)
+
+	regressed = False
+	if os.path.exists(args.baseline) and not args.save_baseline:
+		rows = compare(report, load(args.baseline), args.threshold)
+		print('\ncompared to {}:'.format(args.baseline))
+		for row in rows:
+			if row['status'] != 'same':
+				print('{:<56} {:>6.2f}x {}'.format(row['case'], row['ratio'], row['status']))
+		counts = {status:sum(row['status']==status for row in rows) for status in ('faster','slower','same')}
+		print('{faster} faster, {slower} slower, {same} unchanged'.format(**counts))
+		regressed = counts['slower'] > 0
+
+	if args.save_baseline:
+		save(report, args.baseline)
+		print('\nsaved baseline to {}'.format(args.baseline))
+	return 1 if regressed and args.fail_on_regression else 0
+
+if __name__ == '__main__':
+	sys.exit(main())
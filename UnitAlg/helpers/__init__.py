@@ -1,8 +1,17 @@
 from .classproperty import classproperty, all_true
 from itertools import chain
+import math
 
 epsilon:float=0
 def _get_epsilon_scoped_import():
 	import numpy as np
 	epsilon = np.finfo(float).eps*4
-_get_epsilon_scoped_import()
\ No newline at end of file
+_get_epsilon_scoped_import()
+
+def divide(a:float, b:float) -> float:
+	'''Divides like numpy does for floats, giving inf/nan instead of raising ZeroDivisionError.'''
+	if b == 0:
+		if a == 0 or math.isnan(a):
+			return math.nan
+		return math.copysign(math.inf, a)*math.copysign(1, b)
+	return a/b
\ No newline at end of file
@@ -0,0 +1,81 @@
+import unittest
+from UnitAlg import *
+import numpy as np
+
+rng = np.random.default_rng(17)
+values = rng.uniform(-10, 10, (20,3))
+
+class ArrayInteropTests(unittest.TestCase):
+	def test00_asarray(self):
+		'''Checks numpy views the types' buffers, and lists of them convert.'''
+		v = Vector3(1,2,3)
+		view = np.asarray(v)
+		view[0] = 5
+		self.assertEqual(v.x, 5)
+		self.assertTrue(np.array_equal(np.array([Vector3(p) for p in values]), values))
+		self.assertEqual(np.asarray(v, dtype=np.float32).dtype, np.float32)
+
+		#types caching values derived from their buffer give read only views:
+		q = Quaternion.from_angle_axis(1, Vector3(0,0,1))
+		self.assertFalse(np.asarray(q).flags.writeable)
+		self.assertTrue(np.array(q).flags.writeable)
+		t = Transform.Translate(Vector3(1,2,3))
+		self.assertTrue(np.array_equal(np.asarray(t), t.mat) and not np.asarray(t).flags.writeable)
+
+		vectors = Vector3Array(values)
+		self.assertTrue(np.asarray(vectors) is vectors._value)
+		transforms = TransformArray([t, t])
+		self.assertEqual(np.asarray(transforms).shape, (2,4,4))
+
+	def test01_ufuncs(self):
+		'''Checks ufuncs return UnitAlg types, and array types keep their operators.'''
+		a, b = Vector3(1,2,3), Vector3(4,5,6)
+		self.assertTrue(np.add(a, b) == Vector3(5,7,9))
+		self.assertTrue(isinstance(np.array([1.0,1,1]) + a, Vector3))
+		self.assertTrue(isinstance(np.sqrt(Quaternion(0,0,0,1)), Quaternion))
+		self.assertTrue(isinstance(np.isfinite(a), np.ndarray))
+		self.assertTrue(isinstance(np.matmul(Transform.identity, Transform.identity), Transform))
+
+		vectors = Vector3Array(values)
+		scales = rng.uniform(1, 2, 20)
+		#a (N,) array is one scalar per row, like Vector3Array * ndarray:
+		self.assertTrue(np.multiply(scales, vectors) == vectors * scales)
+		self.assertTrue(isinstance(scales * vectors, Vector3Array))
+		self.assertTrue(np.add(a, vectors) == vectors + a)
+		self.assertTrue(np.maximum(vectors, a) == Vector3Array(np.maximum(values, (1,2,3))))
+		self.assertTrue(isinstance(np.add.reduce(vectors), np.ndarray))
+
+		#writing through out= keeps caches right:
+		q = Quaternion.from_angle_axis(1, Vector3(0,0,1))
+		out = Quaternion(0,0,0,1)
+		out.rotation_matrix
+		self.assertTrue(np.multiply(q, 1, out=out) is out)
+		self.assertTrue(np.allclose(out.rotation_matrix, q.rotation_matrix))
+		t = Transform.Translate(Vector3(1,2,3))
+		np.multiply(t, 2, out=t)
+		self.assertEqual(t.kind, TransformKind.projective)
+
+	def test02_from_buffer(self):
+		'''Checks wrapping existing buffers without copying.'''
+		buffer = np.array(values)
+		vectors = Vector3Array.from_buffer(buffer)
+		vectors += Vector3(1,1,1)
+		self.assertTrue(np.allclose(buffer, values + 1))
+		v = Vector3.from_buffer(buffer[3])
+		v.x = 100
+		self.assertEqual(buffer[3,0], 100)
+		self.assertTrue(Vector3Array.from_buffer(values.tobytes()) == Vector3Array(values))
+		poses = TransformArray.from_buffer(np.tile(np.identity(4), (3,1)).reshape(-1))
+		self.assertTrue(poses == TransformArray.identity(3))
+		self.assertTrue(Quaternion.from_buffer(np.array([0,0,0,1.0])) == Quaternion.identity)
+
+		with self.assertRaises(ValueError):
+			Vector3Array.from_buffer(np.zeros((4,3), dtype=np.float32))
+		with self.assertRaises(ValueError):
+			Vector3.from_buffer(np.zeros(4))
+		with self.assertRaises(ValueError):
+			#rows of a transposed buffer can't be viewed as vectors without a copy:
+			Vector3Array.from_buffer(np.zeros((4,3)).T)
+
+if __name__ == '__main__':
+	unittest.main()
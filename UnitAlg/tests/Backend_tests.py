@@ -0,0 +1,86 @@
+import math
+import unittest
+from UnitAlg import *
+from UnitAlg.BaseVector import BaseVector
+import numpy as np
+
+class BackendTests(unittest.TestCase):
+	def tearDown(self):
+		for cls in (Vector3, Quaternion):
+			if 'backend' in cls.__dict__:
+				Backend.set(Backend.numpy, cls)
+				del cls.backend
+		Backend.set(Backend.numpy)
+		
+	def test00_selection(self):
+		'''Checks the backend can be selected globally and per type.'''
+		self.assertTrue(type(Vector3(1,2,3)) is Vector3)
+		Backend.set(Backend.scalar)
+		self.assertTrue(type(Vector3(1,2,3)) is ScalarVector3)
+		self.assertTrue(type(Quaternion(0,0,0,1)) is ScalarQuaternion)
+		self.assertTrue(type(Vector3([1,2,3])) is ScalarVector3)
+		self.assertTrue(type(Vector3.up) is ScalarVector3)
+		self.assertTrue(isinstance(Vector3(1,2,3), Vector3))
+		
+		Backend.set(Backend.numpy)
+		Backend.set(Backend.scalar, Quaternion)
+		self.assertTrue(type(Vector3(1,2,3)) is Vector3)
+		self.assertTrue(type(Quaternion(0,0,0,1)) is ScalarQuaternion)
+		
+		with self.assertRaises(ValueError):
+			ScalarVector3([1,2])
+			
+	def test01_vector_math(self):
+		'''Checks ScalarVector3 math against the numpy backed Vector3.'''
+		pairs = [((1,-2.2,3),(4,5,-6.5)), ((0.1,0,7),(-3,2,1)), ((3,8,-1),(10,3,-12.4))]
+		for a, b in pairs:
+			v1, v2 = Vector3(*a), Vector3(*b)
+			s1, s2 = ScalarVector3(*a), ScalarVector3(*b)
+			self.assertTrue(s1+s2 == v1+v2 and s1-s2 == v1-v2 and s1*s2 == v1*v2)
+			self.assertTrue(s1*2.5 == v1*2.5 and 2.5*s1 == v1*2.5 and s1/3 == v1/3 and -s1 == -v1)
+			self.assertTrue(Vector3.cross(s1,s2) == Vector3.cross(v1,v2))
+			self.assertTrue(math.isclose(Vector3.dot(s1,s2), Vector3.dot(v1,v2)))
+			self.assertTrue(math.isclose(s1.magnitude, v1.magnitude))
+			self.assertTrue(s1.normalized == v1.normalized)
+			self.assertTrue(math.isclose(Vector3.angle(s1,s2), Vector3.angle(v1,v2)))
+			self.assertTrue(Vector3.lerp(s1,s2,0.3) == Vector3.lerp(v1,v2,0.3))
+			
+			#mixed backends:
+			self.assertTrue(s1+v2 == v1+v2 and v1+s2 == v1+v2)
+			
+			s1 += s2
+			s1 *= 2
+			self.assertTrue(s1 == (v1+v2)*2)
+			s1.normalize()
+			self.assertTrue(math.isclose(s1.magnitude, 1))
+			
+		s = ScalarVector3(1,2,3)
+		s[1] = 5
+		s.z = 7
+		self.assertTrue(list(s) == [1,5,7] and len(s) == 3 and s.value.tolist() == [1,5,7])
+		self.assertTrue(ScalarVector3(1,2,3) != ScalarVector3(1,2,3+1e-9))
+		self.assertTrue(all(math.isnan(c) for c in ScalarVector3(1,2,3)/0))
+		
+	def test02_quaternion_math(self):
+		'''Checks ScalarQuaternion math against the numpy backed Quaternion.'''
+		q1 = Quaternion.from_angle_axis(math.pi/2, Vector3(.3,7,2).normalized)
+		q2 = Quaternion.from_angle_axis(math.pi/3, Vector3(4,2,-9).normalized)
+		s1 = ScalarQuaternion(*q1)
+		s2 = ScalarQuaternion(*q2)
+		v = Vector3(1,2,3)
+		self.assertTrue(s1*s2 == q1*q2 and type(s1*s2) is Quaternion)
+		Backend.set(Backend.scalar)
+		self.assertTrue(type(s1*s2) is ScalarQuaternion)
+		self.assertTrue(s1*s2 == q1*q2)
+		self.assertTrue(s1*ScalarVector3(1,2,3) == q1*v)
+		self.assertTrue(s1.inverse == q1.inverse and s1.conjugate() == q1.conjugate())
+		self.assertTrue(s1.normalized == q1.normalized)
+		self.assertTrue(np.allclose(s1.eulers(), q1.eulers()))
+		self.assertTrue(math.isclose(s1.angle, q1.angle))
+		self.assertTrue(Quaternion.from_euler(0.1,0.2,0.3) == ScalarQuaternion(*Quaternion.from_euler(0.1,0.2,0.3)))
+		
+		t = Transform.TRS(Vector3(1,2,3), s1, Vector3(1,2,1))
+		self.assertTrue(t*ScalarVector3(1,2,3) == t*Vector3(1,2,3))
+		
+if __name__ == 'main':
+	unittest.main()
@@ -0,0 +1,35 @@
+import os
+import tempfile
+import unittest
+from UnitAlg.benchmarks import suite
+
+class BenchmarksTests(unittest.TestCase):
+	def test00_run(self):
+		'''Checks every case runs, at scalar and batch sizes.'''
+		report = suite.run(scalar_sizes=(1,3), array_sizes=(5,), min_time=1e-5, repeat=1)
+		results = report['results']
+		self.assertEqual(len(results), 2*len(suite.scalar_cases) + len(suite.array_cases) + len(suite.import_cases))
+		for prefix in ('Vector3.', 'Quaternion.', 'Transform.', 'Plane.', 'Ray.', 'Range.', 'Vector3Array.', 'QuaternionArray.', 'TransformArray.', 'import.'):
+			self.assertTrue(any(key.startswith(prefix) for key in results), prefix)
+		self.assertEqual(results['Vector3.__add__[3]']['size'], 3)
+		self.assertAlmostEqual(results['Vector3.__add__[3]']['per_element']*3, results['Vector3.__add__[3]']['seconds'])
+		self.assertGreater(results['import.UnitAlg[1]']['seconds'], 0)
+		#the cases' message conversions don't outlive the run:
+		self.assertFalse(suite._PointMsg in suite.Vector3.from_conversions)
+		self.assertFalse(suite._BulkPointMsg in suite.Vector3.bulk_from_conversions)
+		
+	def test01_compare(self):
+		'''Checks results round trip through json and are compared to a baseline.'''
+		report = suite.run('Range.clamp', scalar_sizes=(1,), min_time=1e-5, repeat=1)
+		path = os.path.join(tempfile.mkdtemp(), 'baseline.json')
+		suite.save(report, path)
+		baseline = suite.load(path)
+		self.assertEqual(baseline['results'], report['results'])
+		
+		baseline['results']['Range.clamp[1]']['seconds'] = report['results']['Range.clamp[1]']['seconds']*2
+		baseline['results']['Range.removed[1]'] = {'seconds':1.0, 'per_element':1.0, 'size':1}
+		rows = suite.compare(report, baseline)
+		self.assertEqual(len(rows), 1)
+		self.assertEqual(rows[0]['status'], 'faster')
+		self.assertAlmostEqual(rows[0]['ratio'], 0.5)
+		self.assertEqual(suite.compare(report, report)[0]['status'], 'same')
@@ -0,0 +1,84 @@
+import unittest
+from UnitAlg import *
+from UnitAlg.Convertable import ConversionTable, bulk_attributes
+import numpy as np
+
+class PointMsg():
+	def __init__(self, x:float, y:float, z:float) -> None:
+		self.x, self.y, self.z = x, y, z
+
+class StampedPointMsg(PointMsg):
+	pass
+
+class PoseMsg():
+	def __init__(self, position:PointMsg) -> None:
+		self.position = position
+
+class QuaternionMsg():
+	def __init__(self, x:float, y:float, z:float, w:float) -> None:
+		self.x, self.y, self.z, self.w = x, y, z, w
+
+rng = np.random.default_rng(19)
+values = rng.uniform(-10, 10, (30,3))
+
+class ConvertableTests(unittest.TestCase):
+	def tearDown(self) -> None:
+		for table in (Vector3.from_conversions, Vector3.to_conversions, Vector3.bulk_from_conversions, Quaternion.from_conversions):
+			table.clear()
+
+	def test00_lookup(self):
+		'''Checks conversions are found for subclasses, and the cache follows table changes.'''
+		table = ConversionTable()
+		table[PointMsg] = str
+		self.assertTrue(table.lookup(StampedPointMsg) is str)
+		self.assertTrue(table.lookup(int) is None)
+		table[StampedPointMsg] = repr
+		self.assertTrue(table.lookup(StampedPointMsg) is repr and table.lookup(PointMsg) is str)
+		del table[StampedPointMsg]
+		self.assertTrue(table.lookup(StampedPointMsg) is str)
+		table.clear()
+		self.assertTrue(table.lookup(StampedPointMsg) is None)
+
+		Vector3.from_conversions[PointMsg] = lambda m: Vector3(m.x, m.y, m.z)
+		Vector3.to_conversions[PointMsg] = lambda v: PointMsg(v.x, v.y, v.z)
+		self.assertTrue(Vector3(StampedPointMsg(1,2,3)) == Vector3(1,2,3))
+		self.assertTrue(Vector3.from_other(PointMsg(1,2,3)) == Vector3(1,2,3))
+		message = Vector3(4,5,6).to_other(PointMsg)
+		self.assertTrue(isinstance(message, PointMsg) and message.z == 6)
+
+		#conversion errors aren't hidden, missing conversions are KeyErrors:
+		Vector3.from_conversions[PoseMsg] = lambda m: 1/0
+		with self.assertRaises(ZeroDivisionError):
+			Vector3(PoseMsg(PointMsg(1,2,3)))
+		with self.assertRaises(KeyError):
+			Vector3(QuaternionMsg(0,0,0,1))
+		with self.assertRaises(KeyError):
+			Vector3(1,2,3).to(PoseMsg)
+
+	def test01_bulk(self):
+		'''Checks converting sequences of messages in one call, with and without bulk conversions.'''
+		messages = [StampedPointMsg(*p) for p in values]
+		Vector3.from_conversions[PointMsg] = lambda m: Vector3(m.x, m.y, m.z)
+		per_object = Vector3Array.from_other(messages)
+		self.assertTrue(np.array_equal(per_object._value, values))
+
+		Vector3.bulk_from_conversions[PointMsg] = bulk_attributes('x', 'y', 'z')
+		self.assertTrue(np.array_equal(Vector3Array.from_other(messages)._value, values))
+		self.assertTrue(np.array_equal(Vector3Array(messages)._value, values))
+		self.assertEqual(len(Vector3Array.from_other([])), 0)
+
+		poses = [PoseMsg(m) for m in messages]
+		Vector3.bulk_from_conversions[PoseMsg] = bulk_attributes('position.x', 'position.y', 'position.z')
+		self.assertTrue(np.array_equal(Vector3Array.from_other(poses)._value, values))
+		Vector3.bulk_from_conversions[PoseMsg] = bulk_attributes('position.x', 'position.y')
+		with self.assertRaises(ValueError):
+			Vector3Array.from_other(poses)
+
+		Quaternion.from_conversions[QuaternionMsg] = lambda m: Quaternion(m.x, m.y, m.z, m.w)
+		rotations = QuaternionArray.from_other([QuaternionMsg(0,0,0,1), QuaternionMsg(1,0,0,0)])
+		self.assertTrue(rotations == QuaternionArray([Quaternion(0,0,0,1), Quaternion(1,0,0,0)]))
+		with self.assertRaises(KeyError):
+			QuaternionArray.from_other(messages)
+
+if __name__ == '__main__':
+	unittest.main()
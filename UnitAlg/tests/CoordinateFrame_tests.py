@@ -1,5 +1,6 @@
 import math
 import unittest
+import numpy as np
 from UnitAlg import *
 from UnitAlg.BaseVector import BaseVector
 from UnitAlg.CoordinateFrame import *
@@ -66,5 +67,62 @@ class Vector3Tests(unittest.TestCase):
 		self.assertTrue(t*Vector3(0,1,0) == Vector3(-1,0,0))
 		self.assertTrue(t*Vector3(0,0,1) == Vector3(0,-1,0))
 
+	def test02_cached_constants(self):
+		'''Checks constants come from a per frame cache, as independent copies.'''
+		CoordinateFrame.set(CoordinateFrame.Unity)
+		self.assertTrue(FrameConstants.current.frame is CoordinateFrame.Unity)
+		self.assertTrue(Vector3.up == Vector3(0,1,0))
+		
+		up = Vector3.up
+		up.x = 5
+		up += Vector3.one
+		self.assertTrue(Vector3.up == Vector3(0,1,0))
+		self.assertTrue(Vector3.one == Vector3(1,1,1))
+		self.assertFalse(Vector3.up._value is Vector3.up._value)
+		
+		CoordinateFrame.set(CoordinateFrame.ROS)
+		self.assertTrue(FrameConstants.current.frame is CoordinateFrame.ROS)
+		self.assertTrue(Vector3.up == Vector3(0,0,1))
+		self.assertTrue(Vector3.right == Vector3(0,-1,0))
+		self.assertTrue(Vector3.positive_infinity.x == math.inf)
+		
+		Backend.set(Backend.scalar)
+		try:
+			self.assertTrue(type(Vector3.forward) is ScalarVector3)
+			self.assertTrue(Vector3.forward == Vector3(1,0,0))
+		finally:
+			Backend.set(Backend.numpy)
+		CoordinateFrame.set(CoordinateFrame.Normal_Math)
+	
+	def test03_bulk_conversion(self):
+		'''Checks the permutation table converts points, rotations and poses like the conversion matrices do.'''
+		rng = np.random.default_rng(0)
+		points = rng.uniform(-5, 5, (20,3))
+		rotations = QuaternionArray.from_angle_axis(rng.uniform(0, 3, 20), rng.uniform(-1, 1, (20,3)))
+		poses = TransformArray.TR(points, rotations)
+		for frame1 in CoordinateFrame:
+			for frame2 in CoordinateFrame:
+				conversion = CoordinateFrame.conversion(frame1, frame2)
+				t = Transform.conversion_from_to(frame1, frame2)
+				m = t.mat[0:3,0:3]
+				self.assertTrue(np.allclose(conversion.points(points), points @ m.T))
+				
+				converted = conversion.points(Vector3Array(points))
+				self.assertTrue(type(converted) is Vector3Array)
+				self.assertTrue(converted == Vector3Array(points @ m.T))
+				
+				converted = conversion.quaternions(rotations)
+				self.assertTrue(type(converted) is QuaternionArray)
+				self.assertTrue(np.allclose(converted.rotation_matrix, m @ rotations.rotation_matrix @ m.T))
+				
+				converted = conversion.poses(poses)
+				self.assertTrue(type(converted) is TransformArray)
+				self.assertTrue(converted == TransformArray.multiply(t, poses) * t.inverse)
+				self.assertTrue(np.allclose(conversion.poses(poses.mat), converted.mat))
+				
+				#converting there and back is lossless:
+				back = CoordinateFrame.conversion(frame2, frame1)
+				self.assertTrue(np.array_equal(back.poses(conversion.poses(poses.mat)), poses.mat))
+		
 if __name__ == 'main':
 	unittest.main()
\ No newline at end of file
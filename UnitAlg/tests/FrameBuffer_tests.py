@@ -0,0 +1,78 @@
+import unittest
+import numpy as np
+from UnitAlg import *
+
+def pose(t:float) -> Transform:
+	return Transform.TR(Vector3(t, 2*t, 0), Quaternion.from_angle_axis(.1*t, Vector3(1,2,3)))
+
+class FrameBufferTests(unittest.TestCase):
+	def test00_lookup(self):
+		'''Checks lookups chain edges through the common ancestor, in both directions.'''
+		frames = FrameBuffer()
+		frames.set_static('world', 'base', Transform.Translate(Vector3(1,0,0)))
+		frames.set_static('world', 'camera', Transform.Rotate(Quaternion.from_angle_axis(.5, Vector3.up)))
+		for t in range(5):
+			frames.set('base', 'arm', float(t), pose(t))
+
+		world_arm = Transform.Translate(Vector3(1,0,0)) * pose(3)
+		camera_world = Transform.Rotate(Quaternion.from_angle_axis(.5, Vector3.up)).inverse
+		self.assertTrue(frames.lookup('world', 'arm', 3.0) == world_arm)
+		self.assertTrue(frames.lookup('camera', 'arm', 3.0) == camera_world * world_arm)
+		self.assertTrue(frames.lookup('arm', 'camera', 3.0) == (camera_world * world_arm).inverse)
+		self.assertTrue(frames.lookup('arm', 'arm', 3.0) == Transform.identity)
+
+		with self.assertRaises(ValueError):
+			frames.lookup('world', 'nowhere', 3.0)
+		with self.assertRaises(ValueError):
+			frames.lookup('world', 'arm', 4.5)
+		with self.assertRaises(ValueError):
+			frames.set('base', 'arm', 2.0, pose(2))
+		with self.assertRaises(ValueError):
+			frames.set('arm', 'world', 5.0, pose(5))
+
+	def test01_interpolation(self):
+		'''Checks bulk lookups interpolate between the bracketing samples and match single lookups.'''
+		frames = FrameBuffer()
+		times = np.arange(10, dtype=np.float64)
+		frames.set('world', 'arm', times, TransformArray([pose(t) for t in times]))
+
+		halfway = frames.lookup('world', 'arm', 2.5)
+		self.assertTrue(halfway.translation == Vector3(2.5, 5, 0))
+		self.assertTrue(halfway.rotation == Quaternion.from_angle_axis(.25, Vector3(1,2,3)))
+
+		queries = np.array([0, .25, 3.7, 9])
+		results = frames.lookup('world', 'arm', queries)
+		self.assertEqual(len(results), 4)
+		for t, result in zip(queries, results):
+			self.assertTrue(result == frames.lookup('world', 'arm', float(t)))
+			self.assertTrue(result == pose(t))
+
+		#a quaternion's sign doesn't change the rotation, nor the interpolation path:
+		flipped = FrameBuffer()
+		q = TransformArray([pose(t) for t in times]).rotation
+		q._value[1::2] *= -1
+		flipped.set('world', 'arm', times, TransformArray.TR(Vector3Array.zeros(10), q))
+		self.assertTrue(np.allclose(flipped.lookup('world', 'arm', 2.5).rotation_mat, halfway.rotation_mat))
+
+	def test02_ring_buffer(self):
+		'''Checks old samples are dropped once an edge is full.'''
+		frames = FrameBuffer(capacity=4)
+		for t in range(10):
+			frames.set('world', 'arm', float(t), pose(t))
+		self.assertTrue(frames.lookup('world', 'arm', 7.5) == pose(7.5))
+		with self.assertRaises(ValueError):
+			frames.lookup('world', 'arm', 5.5)
+
+		frames.set('world', 'arm', np.arange(10, 20, dtype=np.float64), TransformArray([pose(t) for t in range(10,20)]))
+		self.assertTrue(frames.lookup('world', 'arm', np.array([16, 18.5])) == TransformArray([pose(16), pose(18.5)]))
+
+		#an empty batch changes nothing, and a batch must be sorted itself, not only after the last sample:
+		frames.set('world', 'arm', np.empty(0), TransformArray._from_np(np.empty((0,4,4))))
+		self.assertTrue(frames.lookup('world', 'arm', 19) == pose(19))
+		with self.assertRaises(ValueError):
+			frames.set('world', 'arm', np.array([20.0, 22, 21]), TransformArray([pose(t) for t in (20, 22, 21)]))
+		with self.assertRaises(ValueError):
+			frames.lookup('world', 'arm', 20)
+
+if __name__ == '__main__':
+	unittest.main()
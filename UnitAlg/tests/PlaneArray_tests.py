@@ -0,0 +1,115 @@
+import unittest
+from UnitAlg import *
+import numpy as np
+
+rng = np.random.default_rng(3)
+origins = rng.uniform(-10, 10, (30,3))
+directions = rng.uniform(-1, 1, (30,3))
+positions = rng.uniform(-5, 5, (4,3))
+normals = rng.uniform(-1, 1, (4,3))
+normals /= np.linalg.norm(normals, axis=1)[:,None]
+
+class PlaneArrayTests(unittest.TestCase):
+	def test00_constructors(self):
+		'''Checks building from planes and from buffers agree.'''
+		planes = PlaneArray(positions, normals)
+		self.assertEqual(len(planes), 4)
+		from_list = PlaneArray([Plane(Vector3(p), Vector3(n)) for p, n in zip(positions, normals)])
+		self.assertTrue(from_list.positions == planes.positions and from_list.normals == planes.normals)
+		self.assertTrue(planes[2].position == Vector3(positions[2]) and planes[2].normal == Vector3(normals[2]))
+		self.assertEqual(len(planes[1:3]), 2)
+
+		with self.assertRaises(ValueError):
+			PlaneArray(positions, normals[:2])
+
+	def test01_raycast(self):
+		'''Checks every ray against every plane matches Plane.raycast, including parallel and behind origin rays.'''
+		#a ray parallel to the first plane, and one pointing away from it:
+		d = np.array(directions)
+		d[0] = np.cross(normals[0], [1,0,0])
+		d[1] = normals[0] if np.dot(normals[0], positions[0] - origins[1]) < 0 else -normals[0]
+
+		hits, t, points = PlaneArray(positions, normals).raycast(origins, d)
+		self.assertEqual(hits.shape, (30,4))
+		self.assertEqual(points.shape, (30,4,3))
+		self.assertFalse(hits[1,0])
+		for j in range(4):
+			plane = Plane(Vector3(positions[j]), Vector3(normals[j]))
+			for i in range(30):
+				hit, point = plane.raycast(Ray(Vector3(origins[i]), Vector3(d[i])))
+				self.assertEqual(hits[i,j], hit)
+				if point is None:
+					self.assertTrue(np.isnan(t[i,j]) and np.all(np.isnan(points[i,j])))
+				else:
+					self.assertTrue(Vector3(points[i,j]) == point)
+					self.assertTrue(Vector3(points[i,j]) == Ray(Vector3(origins[i]), Vector3(d[i])).at(t[i,j]))
+
+			single = plane.raycast_all(Vector3Array(origins), Vector3Array(d))
+			self.assertTrue(np.array_equal(single[0], hits[:,j]))
+			self.assertTrue(np.allclose(single[2], points[:,j], equal_nan=True))
+		self.assertFalse(hits[0,0])
+		self.assertTrue(np.isnan(t[0,0]))
+
+		#a single ray as (3,) arrays:
+		hit, t2, point = PlaneArray(positions, normals).raycast(origins[5], d[5])
+		self.assertTrue(np.array_equal(hit, hits[5:6]) and np.allclose(point, points[5:6]))
+		hit, t2, point = plane.raycast_all(origins[5], d[5])
+		self.assertTrue(hit[0] == hits[5,3] and np.allclose(point[0], points[5,3]))
+
+		#far from the origin, t keeps the precision of the plane to ray offset:
+		normal = np.array([[0.48, 0.6, 0.64]])
+		far = np.array([[1e12+7, 1e12+3, 1e12+1]])
+		offset = np.array([2.0, 3, 5])
+		hit, t2, point = PlaneArray(far, normal).raycast(far - offset, normal)
+		self.assertAlmostEqual(t2[0,0], np.dot(normal[0], offset) / np.dot(normal[0], normal[0]), places=9)
+
+	def test02_fit(self):
+		'''Checks grouped total least squares fits recover known planes, including vertical ones.'''
+		truth_normals = np.array(normals)
+		truth_normals[1] = (1,0,0) #perpendicular to the x,y plane
+		groups = []
+		for k in range(4):
+			#two directions in each plane:
+			u = np.cross(truth_normals[k], [.3,.5,.7])
+			u /= np.linalg.norm(u)
+			v = np.cross(truth_normals[k], u)
+			count = 10 + 5*k
+			a, b = rng.uniform(-3, 3, (2,count))
+			offsets = rng.normal(0, .01*k, count)
+			groups.append(positions[k] + a[:,None]*u + b[:,None]*v + offsets[:,None]*truth_normals[k])
+		labels = np.concatenate([np.full(len(g), 10*k) for k, g in enumerate(groups)])
+		points = np.concatenate(groups)
+		shuffle = rng.permutation(len(points))
+
+		planes, residuals, group_labels = PlaneArray.fit(Vector3Array(points[shuffle]), labels[shuffle])
+		self.assertTrue(np.array_equal(group_labels, [0,10,20,30]))
+		for k in range(4):
+			self.assertTrue(np.isclose(abs(np.dot(planes._normals[k], truth_normals[k])), 1, atol=1e-3))
+			self.assertTrue(np.allclose(planes._positions[k], groups[k].mean(axis=0)))
+			distances = (groups[k] - groups[k].mean(axis=0)) @ planes._normals[k]
+			self.assertTrue(np.isclose(residuals[k], np.sqrt(np.mean(distances**2))))
+		self.assertTrue(residuals[0] < 1e-9)
+		self.assertTrue(np.all(planes._normals @ Vector3.up._value >= 0))
+		self.assertTrue(isinstance(planes[1], Plane))
+
+		#a thin, wide plane keeps its residual (the scatter matrix would square it below rounding):
+		u = np.cross(normals[0], [1,0,0])
+		u /= np.linalg.norm(u)
+		v = np.cross(normals[0], u)
+		a, b = rng.uniform(-1e3, 1e3, (2,200))
+		offsets = np.where(np.arange(200) % 2, 1e-7, -1e-7)
+		thin = positions[0] + a[:,None]*u + b[:,None]*v + offsets[:,None]*normals[0]
+		thin_plane, thin_residual, _ = PlaneArray.fit(thin)
+		distances = (thin - thin.mean(axis=0)) @ thin_plane._normals[0]
+		self.assertTrue(np.isclose(thin_residual[0], np.sqrt(np.mean(distances**2)), rtol=1e-3))
+		self.assertTrue(np.isclose(thin_residual[0], 1e-7, rtol=1e-2))
+
+		#the single group fits agree:
+		plane = Plane.fit([Vector3(p) for p in groups[2]])
+		self.assertTrue(plane.normal == planes[2].normal and plane.position == planes[2].position)
+		a, b, c = Plane.fit_coefficients(groups[0])
+		n = planes[0].normal
+		self.assertTrue(np.allclose((-a, -b, 1)/np.linalg.norm((-a, -b, 1)), (n*np.sign(n.z))._value))
+
+if __name__ == '__main__':
+	unittest.main()
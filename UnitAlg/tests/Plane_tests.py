@@ -0,0 +1,57 @@
+import unittest
+from UnitAlg import *
+import numpy as np
+
+rng = np.random.default_rng(23)
+points = rng.uniform(-10, 10, (3,3))
+
+class PlaneTests(unittest.TestCase):
+	def test00_constructors(self):
+		'''Checks the explicit constructors match the ones picked by __init__.'''
+		p1, p2, p3 = (Vector3(p) for p in points)
+		plane = Plane.from_points(p1, p2, p3)
+		self.assertTrue(plane.position == p1 and plane.normal == Plane(p1, p2, p3).normal)
+		self.assertTrue(plane.normal == Vector3.cross((p2-p1).normalized, (p3-p1).normalized))
+		for p in (p1, p2, p3):
+			self.assertAlmostEqual(Vector3.dot(p - plane.position, plane.normal), 0)
+
+		normal = Vector3(0,0,1)
+		self.assertTrue(Plane.from_point_normal(p1, normal).normal is Plane(p1, normal).normal)
+		position, direction = np.array([1.0,2,3]), np.array([0,1.0,0])
+		from_arrays = Plane.from_arrays(position, direction)
+		self.assertTrue(from_arrays.position == Vector3(1,2,3) and from_arrays.normal == Vector3(0,1,0))
+
+		#the coefficient plane is the one through 3 points on z = ax + by + c:
+		a, b, c = 0.5, -2.0, 3.0
+		plane = Plane.from_coefficients(a, b, c)
+		expected = Plane(Vector3(0,0,c), Vector3(100,0,a*100+c), Vector3(0,100,b*100+c))
+		self.assertTrue(plane.position == expected.position and plane.normal == expected.normal)
+		self.assertTrue(Plane(a, b, c).normal == plane.normal and Plane(1, 2, 3).c == 3)
+		self.assertEqual((plane.a, plane.b, plane.c), (a, b, c))
+		fit = Plane([Vector3(x, y, a*x + b*y + c) for x, y in rng.uniform(-5, 5, (10,2))])
+		self.assertTrue(np.allclose((fit.a, fit.b, fit.c), (a, b, c)))
+
+		with self.assertRaises(ValueError):
+			Plane(p1)
+
+	def test01_reflect(self):
+		'''Checks reflected directions keep the angle to the plane, and rays start where they hit.'''
+		plane = Plane(Vector3(0,0,1), Vector3(0,0,2))
+		self.assertTrue(plane.reflect(Vector3(1,0,-1)) == Vector3(1,0,1))
+		self.assertTrue(plane.reflect(Vector3(0,0,-1)) == Vector3(0,0,1))
+		self.assertTrue(plane.reflect(Vector3(1,2,0)) == Vector3(1,2,0))
+
+		ray = plane.reflect(Ray(Vector3(-1,0,2), Vector3(1,0,-1)))
+		self.assertTrue(ray.origin == Vector3(0,0,1) and ray.direction == Vector3(1,0,1))
+		self.assertTrue(plane.reflect(Ray(Vector3(0,0,2), Vector3(0,0,1))) is None)
+
+		tilted = Plane.from_points(*(Vector3(p) for p in points))
+		for d in rng.uniform(-1, 1, (10,3)):
+			d = Vector3(d)
+			reflected = tilted.reflect(d)
+			self.assertAlmostEqual(reflected.magnitude, d.magnitude)
+			self.assertAlmostEqual(Vector3.dot(reflected, tilted.normal), -Vector3.dot(d, tilted.normal))
+			self.assertTrue(Vector3.cross(reflected, tilted.normal) == Vector3.cross(d, tilted.normal))
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,118 @@
+import math
+import unittest
+from UnitAlg import *
+import numpy as np
+
+rng = np.random.default_rng(7)
+q1_values = rng.uniform(-1, 1, (40,4))
+q1_values /= np.linalg.norm(q1_values, axis=1)[:,None]
+q2_values = rng.uniform(-1, 1, (40,4))
+q2_values /= np.linalg.norm(q2_values, axis=1)[:,None]
+v_values = rng.uniform(-10, 10, (40,3))
+eulers = rng.uniform(-math.pi, math.pi, (40,3))
+
+class QuaternionArrayTests(unittest.TestCase):
+	def test00_constructors(self):
+		'''Tests the QuaternionArray constructors against the Quaternion ones.'''
+		qa = QuaternionArray(q1_values)
+		self.assertTrue(len(qa) == 40 and isinstance(qa[0], Quaternion))
+		self.assertTrue(qa == QuaternionArray([Quaternion(v) for v in q1_values]))
+		self.assertTrue(QuaternionArray.identity(3)[2] == Quaternion.identity)
+		
+		from_euler = QuaternionArray.from_euler(eulers[:,0], eulers[:,1], eulers[:,2])
+		angles = eulers[:,0]
+		axes = Vector3Array(v_values)
+		from_angle_axis = QuaternionArray.from_angle_axis(angles, axes)
+		for i in range(len(eulers)):
+			self.assertTrue(from_euler[i] == Quaternion.from_euler(*eulers[i]))
+			self.assertTrue(from_angle_axis[i] == Quaternion.from_angle_axis(angles[i], Vector3(v_values[i])))
+		
+		with self.assertRaises(ValueError):
+			QuaternionArray(np.zeros((2,3)))
+			
+	def test01_multiply(self):
+		'''Checks batched Hamilton products, including broadcasting a single Quaternion.'''
+		qa1 = QuaternionArray(q1_values)
+		qa2 = QuaternionArray(q2_values)
+		single = Quaternion(q2_values[0])
+		products = qa1*qa2
+		left = single*qa1
+		right = qa1*single
+		for i in range(len(qa1)):
+			q1, q2 = Quaternion(q1_values[i]), Quaternion(q2_values[i])
+			self.assertTrue(products[i] == q1*q2)
+			self.assertTrue(left[i] == single*q1)
+			self.assertTrue(right[i] == q1*single)
+			
+	def test02_rotate(self):
+		'''Checks rotating Vector3Arrays by one or many quaternions.'''
+		qa = QuaternionArray(q1_values)
+		va = Vector3Array(v_values)
+		many = qa*va
+		one = QuaternionArray.rotate(qa[0], va)
+		self.assertTrue(isinstance(many, Vector3Array))
+		for i in range(len(qa)):
+			q, v = Quaternion(q1_values[i]), Vector3(v_values[i])
+			self.assertTrue(many[i] == q*v)
+			self.assertTrue(one[i] == qa[0]*v)
+		self.assertTrue((qa*Vector3(1,2,3))[5] == qa[5]*Vector3(1,2,3))
+		#one Quaternion times many points, like Quaternion * Vector3:
+		self.assertTrue(qa[0]*va == one)
+		
+	def test03_conversions(self):
+		'''Checks conjugate, inverse, normalize, eulers and rotation matrices.'''
+		qa = QuaternionArray(q1_values*3)
+		conjugate = qa.conjugate()
+		inverse = qa.inverse
+		normalized = qa.normalized
+		_eulers = qa.normalized.eulers()
+		from_matrix = QuaternionArray.from_rotation_matrix(qa.normalized.rotation_matrix)
+		for i in range(len(qa)):
+			q = Quaternion(q1_values[i]*3)
+			self.assertTrue(conjugate[i] == q.conjugate())
+			self.assertTrue(inverse[i] == q.inverse)
+			self.assertTrue(normalized[i] == q.normalized)
+			self.assertTrue(np.allclose(_eulers[i], q.normalized.eulers()))
+			self.assertTrue(from_matrix[i] == Quaternion.from_rotation_matrix(qa.normalized.rotation_matrix[i]))
+		qa.normalize()
+		self.assertTrue(np.allclose(qa.magnitude, 1))
+		
+		#poles:
+		poles = QuaternionArray.from_euler(np.array([0.3,0.3]), np.array([0.2,0.2]), np.array([math.pi/2,-math.pi/2]))
+		for i in range(2):
+			self.assertTrue(np.allclose(poles.eulers()[i], poles[i].eulers()))
+	
+	def test04_interpolation(self):
+		'''Checks slerp turns at a constant rate along the shortest path, and nlerp's end points and broadcasting.'''
+		qa1 = QuaternionArray(q1_values)
+		qa2 = QuaternionArray(q2_values)
+		t = rng.uniform(0, 1, 40)
+		def angle_between(a:QuaternionArray, b:QuaternionArray) -> np.ndarray:
+			return 2*np.arccos(np.clip(np.abs(np.einsum('ij,ij->i', a._value, b._value)), -1, 1))
+		
+		total = angle_between(qa1, qa2)
+		self.assertTrue(np.all(total <= math.pi + 1e-9))
+		for interpolate in (QuaternionArray.slerp, QuaternionArray.nlerp):
+			self.assertTrue(np.allclose(angle_between(interpolate(qa1, qa2, 0), qa1), 0, atol=1e-6))
+			self.assertTrue(np.allclose(angle_between(interpolate(qa1, qa2, 1), qa2), 0, atol=1e-6))
+			self.assertTrue(interpolate(qa1, qa2, t) == interpolate(qa1, QuaternionArray(-q2_values), t))
+			self.assertTrue(np.allclose(interpolate(qa1, qa2, t).magnitude, 1))
+		
+		slerped = QuaternionArray.slerp(qa1, qa2, t)
+		self.assertTrue(np.allclose(angle_between(slerped, qa1), t*total))
+		self.assertTrue(np.allclose(angle_between(slerped, qa2), (1-t)*total))
+		
+		#broadcasting a single quaternion against many t:
+		q = Quaternion.from_angle_axis(1, Vector3.up)
+		path = QuaternionArray.slerp(Quaternion.identity, q, np.linspace(0, 1, 5))
+		self.assertEqual(path._value.shape, (5,4))
+		for i, step in enumerate(path):
+			self.assertTrue(step == Quaternion.from_angle_axis(i/4, Vector3.up))
+		self.assertEqual(QuaternionArray.nlerp(qa1, q, .5)._value.shape, (40,4))
+		
+		#(nearly) identical quaternions fall back to nlerp instead of dividing by ~0:
+		same = QuaternionArray.slerp(qa1, qa1, t)
+		self.assertTrue(np.all(np.isfinite(same._value)) and same == qa1)
+			
+if __name__ == 'main':
+	unittest.main()
@@ -369,5 +369,73 @@ class QuaternionTests(unittest.TestCase):
 		Quaternion.from_angle_axis(math.pi/2, Vector3(-1,1,-1).normalized)
 		Quaternion.from_angle_axis(30, Vector3(73,-323,29).normalized)
 		
+	def test10_out(self):
+		'''Checks the in place product and out= targets.'''
+		q1 = Quaternion.from_angle_axis(math.pi/2, Vector3(.3,7,2).normalized)
+		q2 = Quaternion.from_angle_axis(math.pi/3, Vector3(4,2,-9).normalized)
+		expected = q1*q2
+		out = Quaternion(0,0,0,1)
+		self.assertTrue(Quaternion.multiply(q1,q2,out=out) is out and out == expected)
+		
+		_ = q1.angle
+		buffer = q1._value
+		q1 *= q2
+		self.assertTrue(q1._value is buffer and q1 == expected)
+		self.assertTrue(math.isclose(q1.angle, expected.angle))
+		
+		v = Vector3(1,2,3)
+		expected = q2*v
+		self.assertTrue(q2.rotate(v, out=v) is v and v == expected)
+	
+	def test11_cached_derived(self):
+		'''Checks every way of changing a quaternion drops its cached angle, axis, matrix and inverse.'''
+		start = Quaternion.from_angle_axis(.7, Vector3(1,2,3))
+		target = Quaternion.from_angle_axis(1.9, Vector3(-3,1,2))
+		v = Vector3(1,-2,5)
+		def mutations():
+			def set_component(q:Quaternion, i:int) -> None:
+				q[i] = target[i]
+			def set_attributes(q:Quaternion) -> None:
+				q.x, q.y, q.z, q.w = target.x, target.y, target.z, target.w
+			def set_value(q:Quaternion) -> None:
+				q.value = target.value
+			def multiply(q:Quaternion) -> None:
+				q *= start.inverse * target
+			def normalize(q:Quaternion) -> None:
+				q.value = target.value * 3
+				_ = q.rotation_matrix
+				q.normalize()
+			def set_items(q:Quaternion) -> None:
+				for i in range(4):
+					set_component(q, i)
+			return (set_attributes, set_value, multiply, normalize, set_items)
+		
+		for backend in (Backend.numpy, Backend.scalar):
+			Backend.set(backend)
+			try:
+				for mutate in mutations():
+					q = Quaternion(start.value)
+					#fill the caches:
+					_ = q.angle_axis, q.rotation_matrix, q.inverse, q*v
+					mutate(q)
+					self.assertTrue(q == target)
+					self.assertTrue(math.isclose(q.angle, target.angle))
+					self.assertTrue(q.axis == target.axis)
+					self.assertTrue(np.allclose(q.rotation_matrix, target.rotation_matrix))
+					self.assertTrue(q.inverse == target.inverse)
+					self.assertTrue(q*v == target*v)
+			finally:
+				Backend.set(Backend.numpy)
+		
+		#cached values are handed out as copies:
+		q = Quaternion.from_angle_axis(.7, Vector3(1,2,3))
+		q.axis.x = 100
+		q.inverse.x = 100
+		q.rotation_matrix[0,0] = 100
+		self.assertTrue(q.axis == Vector3(1,2,3).normalized)
+		self.assertTrue(q.inverse == Quaternion.from_angle_axis(-.7, Vector3(1,2,3)))
+		self.assertTrue(np.allclose(q.rotation_matrix, Transform.Rotate(q).mat[0:3,0:3]))
+		self.assertTrue(np.allclose(QuaternionArray.rotate(q, Vector3Array([v, v]))._value, (q*v)._value))
+		
 if __name__ == 'main':
 	unittest.main()
\ No newline at end of file
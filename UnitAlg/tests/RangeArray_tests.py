@@ -0,0 +1,81 @@
+import unittest
+from UnitAlg import *
+import numpy as np
+
+rng = np.random.default_rng(13)
+mins = rng.uniform(-10, 10, 40)
+maxs = mins + rng.uniform(0, 5, 40)
+other_mins = rng.uniform(-10, 10, 40)
+other_maxs = other_mins + rng.uniform(0, 5, 40)
+values = rng.uniform(-15, 15, 40)
+
+class RangeArrayTests(unittest.TestCase):
+	def test00_matches_range(self):
+		'''Checks every function gives the same results as the Range version.'''
+		ranges = RangeArray(mins, maxs)
+		others = RangeArray([Range(a, b) for a, b in zip(other_mins, other_maxs)])
+		self.assertEqual(len(ranges), 40)
+		overlaps = ranges.overlaps(others)
+		overlapping = ranges.overlapping(others)
+		clamped = ranges.clamp(values)
+		contains = ranges.contains(values)
+		scaled = (2 * ranges) / 3
+		for i in range(40):
+			a, b = ranges[i], others[i]
+			self.assertEqual(overlaps[i], a.overlaps(b))
+			expected = a.overlapping(b)
+			self.assertTrue(overlapping.mins[i] == expected.min and overlapping.maxs[i] == expected.max)
+			self.assertEqual(clamped[i], a.clamp(values[i]))
+			self.assertEqual(contains[i], values[i] in a)
+			self.assertTrue(np.isclose(scaled.mins[i], ((2*a)/3).min) and np.isclose(scaled.maxs[i], ((2*a)/3).max))
+		self.assertTrue(np.allclose(ranges.range, maxs - mins))
+		self.assertTrue(np.any(overlaps) and not np.all(overlaps))
+
+		#single ranges and values broadcast against every range:
+		self.assertTrue(np.array_equal(ranges.overlaps(Range(0, 1)), [r.overlaps(Range(0, 1)) for r in ranges]))
+		self.assertTrue(np.array_equal(ranges.contains(1.5), [1.5 in r for r in ranges]))
+		self.assertTrue(np.array_equal(RangeArray.from_center_delta(values, 2).range, np.full(40, 4.0)))
+
+		#clamping many configurations of joints at once:
+		configurations = rng.uniform(-15, 15, (100,40))
+		clamped = ranges.clamp(configurations)
+		self.assertEqual(clamped.shape, (100,40))
+		self.assertTrue(np.all(ranges.contains(clamped)))
+		self.assertTrue(np.array_equal(clamped[7], ranges.clamp(configurations[7])))
+
+		with self.assertRaises(ValueError):
+			RangeArray(mins, maxs[:3])
+
+	def test01_index(self):
+		'''Checks RangeIndex queries against brute force, with mixed short, long, empty and infinite ranges.'''
+		lengths = rng.exponential(1, 500)**3
+		lengths[:5] = 0
+		lengths[5] = np.inf
+		starts = rng.uniform(-50, 50, 500)
+		ranges = RangeArray(starts, starts + lengths)
+		index = RangeIndex(ranges)
+		self.assertEqual(len(index), 500)
+
+		windows = RangeArray.from_center_delta(rng.uniform(-60, 60, 80), rng.uniform(0, 3, 80))
+		found = index.query(windows)
+		counts = index.count(windows)
+		for i in range(80):
+			expected = np.flatnonzero(ranges.overlaps(windows[i]))
+			self.assertTrue(np.array_equal(found[i], expected))
+			self.assertEqual(counts[i], len(expected))
+		query_index, ids = index.pairs(windows)
+		self.assertEqual(len(ids), sum(len(f) for f in found))
+
+		times = rng.uniform(-50, 50, 30)
+		found = index.query(times)
+		for i in range(30):
+			self.assertTrue(np.array_equal(found[i], np.flatnonzero(ranges.contains(times[i]))))
+		self.assertTrue(np.array_equal(index.query(float(times[0])), found[0]))
+		self.assertEqual(index.count(Range(0, 1)), len(index.query(Range(0, 1))))
+		self.assertEqual(len(RangeIndex([]).query(times)), 30)
+
+		with self.assertRaises(ValueError):
+			RangeIndex([Range(1, 0)])
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+from UnitAlg import *
+import numpy as np
+
+rng = np.random.default_rng(5)
+origins = rng.uniform(-10, 10, (30,3))
+directions = rng.uniform(-1, 1, (30,3))
+directions /= np.linalg.norm(directions, axis=1)[:,None]
+points = rng.uniform(-10, 10, (30,3))
+
+class RayArrayTests(unittest.TestCase):
+	def test00_queries(self):
+		'''Checks at, closest_point and pairwise skew_point match the Ray versions.'''
+		rays = RayArray(origins, directions)
+		self.assertTrue(len(rays) == 30 and isinstance(rays[0], Ray))
+		from_list = RayArray([Ray(Vector3(o), Vector3(d)) for o, d in zip(origins, directions)])
+		self.assertTrue(from_list.origins == rays.origins and from_list.directions == rays.directions)
+
+		others = RayArray(points, np.roll(directions, 1, axis=0))
+		#make a pair parallel:
+		others._directions[3] = directions[3]*-2
+		t = rng.uniform(0, 5, 30)
+		at = rays.at(t)
+		closest = rays.closest_point(Vector3Array(points))
+		skew = rays.skew_point(others)
+		for i in range(30):
+			ray = rays[i]
+			self.assertTrue(at[i] == ray.at(t[i]))
+			self.assertTrue(closest[i] == ray.closest_point(Vector3(points[i])))
+			self.assertTrue(skew[i] == ray.skew_point(others[i]))
+		self.assertTrue(skew[3] == Vector3(origins[3]))
+
+		#single values broadcast against every ray:
+		self.assertTrue(rays.at(2) == RayArray.at(rays, np.full(30, 2.0)))
+		self.assertTrue(rays.closest_point(Vector3(1,2,3))[7] == rays[7].closest_point(Vector3(1,2,3)))
+		self.assertTrue(rays.skew_point(others[5])[9] == rays[9].skew_point(others[5]))
+		self.assertTrue(rays.closest_point(np.array([1.,2,3])) == rays.closest_point(Vector3(1,2,3)))
+
+		with self.assertRaises(ValueError):
+			rays.skew_point(others[:4])
+
+	def test01_nearest_point(self):
+		'''Checks triangulating targets from rays that pass (nearly) through them.'''
+		targets = rng.uniform(-5, 5, (6,3))
+		labels = rng.permutation(np.repeat(np.arange(6)*3, 5))
+		cameras = rng.uniform(-20, 20, (30,3))
+		noise = rng.normal(0, .001, (30,3))
+		rays = RayArray(cameras, targets[labels//3] - cameras + noise)
+
+		nearest = rays.nearest_point(labels)
+		self.assertEqual(len(nearest), 6)
+		self.assertTrue(np.allclose(nearest._value, targets, atol=1e-2))
+
+		#exact rays meet exactly, and the point is where the summed squared distances is least:
+		exact = RayArray(cameras[:4], targets[0] - cameras[:4])
+		self.assertTrue(exact.nearest_point()[0] == Vector3(targets[0]))
+		noisy = rays[labels == 0]
+		#closest_point expects unit directions, like Ray's:
+		noisy.directions = noisy.directions.normalized
+		best = noisy.nearest_point()._value[0]
+		def cost(x:np.ndarray) -> float:
+			return float(np.sum(Vector3Array.sq_distance(noisy.closest_point(Vector3(x)), Vector3(x))))
+		for step in np.identity(3)*1e-4:
+			self.assertTrue(cost(best) <= cost(best + step) and cost(best) <= cost(best - step))
+
+if __name__ == '__main__':
+	unittest.main()
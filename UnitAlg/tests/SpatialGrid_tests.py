@@ -0,0 +1,94 @@
+import unittest
+from UnitAlg import *
+import numpy as np
+
+rng = np.random.default_rng(11)
+points = rng.uniform(-20, 20, (2000,3))
+queries = rng.uniform(-25, 25, (50,3))
+
+def brute_distances(points:np.ndarray, query:np.ndarray) -> np.ndarray:
+	return np.linalg.norm(points - query, axis=1)
+
+class SpatialGridTests(unittest.TestCase):
+	def test00_queries(self):
+		'''Checks nearest, radius and box queries against brute force.'''
+		grid = SpatialGrid(points, cell_size=1.5)
+		self.assertEqual(len(grid), 2000)
+		ids, distances = grid.nearest(queries, k=4)
+		within = grid.radius(queries, 3.0)
+		boxes = grid.box(queries, queries + (4,2,6))
+		for i, q in enumerate(queries):
+			d = brute_distances(points, q)
+			order = np.argsort(d)[:4]
+			self.assertTrue(np.array_equal(ids[i], order))
+			self.assertTrue(np.allclose(distances[i], d[order]))
+			self.assertTrue(np.array_equal(within[i], np.flatnonzero(d <= 3.0)[np.argsort(d[d <= 3.0], kind='stable')]))
+			inside = np.all((points >= q) & (points <= q + (4,2,6)), axis=1)
+			self.assertTrue(np.array_equal(boxes[i], np.flatnonzero(inside)))
+
+		#single Vector3 queries, and lists of Vector3:
+		grid = SpatialGrid([Vector3(p) for p in points[:100]], cell_size=3)
+		q = Vector3(queries[0])
+		ids, distances = grid.nearest(q, k=2)
+		self.assertEqual(ids.shape, (2,))
+		self.assertTrue(np.array_equal(ids, np.argsort(brute_distances(points[:100], queries[0]))[:2]))
+		self.assertTrue(isinstance(grid.radius(q, 10), np.ndarray))
+
+	def test01_insert_remove(self):
+		'''Checks queries stay exact as points are added and removed.'''
+		grid = SpatialGrid(points[:1000], cell_size=2)
+		grid.remove(np.arange(0, 1000, 3))
+		new_ids = grid.insert(Vector3Array(points[1000:]))
+		self.assertTrue(np.array_equal(new_ids, np.arange(1000, 2000)))
+		grid.remove(new_ids[::2])
+		grid.remove(np.arange(1, 1000, 3))
+		self.assertFalse(0 in grid)
+		self.assertTrue(2 in grid)
+
+		alive = grid.ids
+		self.assertEqual(len(grid), len(alive))
+		ids, distances = grid.nearest(queries, k=3)
+		within = grid.radius(queries, 4.0)
+		for i, q in enumerate(queries):
+			d = brute_distances(points[alive], q)
+			self.assertTrue(np.array_equal(ids[i], alive[np.argsort(d)[:3]]))
+			self.assertTrue(set(within[i]) == set(alive[d <= 4.0]))
+
+		#more neighbours asked for than there are points:
+		grid = SpatialGrid(points[:3]*50, cell_size=1)
+		ids, distances = grid.nearest(Vector3(0,0,0), k=5)
+		self.assertTrue(np.array_equal(np.sort(ids[:3]), [0,1,2]) and np.all(ids[3:] == -1))
+		self.assertTrue(np.all(np.isinf(distances[3:])))
+		self.assertTrue(len(SpatialGrid().radius(Vector3(0,0,0), 1)) == 0)
+
+		#queries far outside the points, mixed with near ones:
+		grid = SpatialGrid(points, cell_size=0.5)
+		far = np.concatenate((queries[:5], rng.uniform(5000, 6000, (5,3))))
+		ids, distances = grid.nearest(far, k=2)
+		for i, q in enumerate(far):
+			self.assertTrue(np.array_equal(ids[i], np.argsort(brute_distances(points, q))[:2]))
+
+		#a rejected insert leaves the grid unchanged:
+		with self.assertRaises(ValueError):
+			grid.insert(np.array([[0,0,0], [1e9,0,0]]))
+		self.assertEqual(len(grid), 2000)
+		self.assertEqual(grid.insert(Vector3(0,0,0))[0], 2000)
+
+		#boxes and radii spanning far more cells than there are points (a full
+		#cube of offsets would need billions of cells), mixed with small ones:
+		grid = SpatialGrid(points, cell_size=0.01)
+		lows = np.concatenate((queries[:5], np.full((1,3), -1000.0), queries[5:10]))
+		highs = lows + np.array([[1,2,0.5]]*5 + [[2000,2000,2000]] + [[30,30,30]]*5)
+		boxes = grid.box(lows, highs)
+		for i in range(len(lows)):
+			self.assertTrue(np.array_equal(boxes[i], np.flatnonzero(np.all((points >= lows[i]) & (points <= highs[i]), axis=1))))
+		self.assertEqual(len(boxes[5]), 2000)
+		for r in (0.8, 300):
+			within = grid.radius(queries[:5], r)
+			for i, q in enumerate(queries[:5]):
+				self.assertTrue(set(within[i]) == set(np.flatnonzero(brute_distances(points, q) <= r)))
+		with self.assertRaises(ValueError):
+			grid.radius(queries, -1)
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,91 @@
+import math
+import unittest
+from UnitAlg import *
+import numpy as np
+
+rng = np.random.default_rng(3)
+count = 30
+translations = rng.uniform(-10, 10, (count,3))
+rotations = rng.uniform(-1, 1, (count,4))
+rotations /= np.linalg.norm(rotations, axis=1)[:,None]
+scales = rng.uniform(0.2, 3, (count,3))
+points = rng.uniform(-5, 5, (count,3))
+
+def scalar_transforms():
+	return [Transform.TRS(Vector3(translations[i]), Quaternion(rotations[i]), Vector3(scales[i])) for i in range(count)]
+
+class TransformArrayTests(unittest.TestCase):
+	def test00_constructors(self):
+		'''Checks the vectorized factories against the Transform ones.'''
+		trs = TransformArray.TRS(Vector3Array(translations), QuaternionArray(rotations), Vector3Array(scales))
+		self.assertTrue(trs == TransformArray(scalar_transforms()))
+		
+		tr = TransformArray.TR(Vector3Array(translations), QuaternionArray(rotations))
+		translate = TransformArray.Translate(Vector3Array(translations))
+		rotate = TransformArray.Rotate(QuaternionArray(rotations))
+		scale = TransformArray.Scale(Vector3Array(scales))
+		for i in range(count):
+			self.assertTrue(tr[i] == Transform.TR(Vector3(translations[i]), Quaternion(rotations[i])))
+			self.assertTrue(translate[i] == Transform.Translate(Vector3(translations[i])))
+			self.assertTrue(rotate[i] == Transform.Rotate(Quaternion(rotations[i])))
+			self.assertTrue(scale[i] == Transform.Scale(Vector3(scales[i])))
+		
+		self.assertTrue(TransformArray(np.zeros((2,3,3)))._mat.shape == (2,4,4))
+		self.assertFalse(trs == None)
+
+		#a (3,) array is one point, not 3 scalars:
+		self.assertTrue(TransformArray.Translate(np.array([1.,2,3])) == TransformArray([Transform.Translate(Vector3(1,2,3))]))
+		self.assertTrue(TransformArray.Scale(np.array([1.,2,3])) == TransformArray([Transform.Scale(Vector3(1,2,3))]))
+		self.assertTrue(TransformArray.TRS(np.array([1.,2,3]), Quaternion(rotations[0]), np.array([1.,2,3])) == TransformArray([Transform.TRS(Vector3(1,2,3), Quaternion(rotations[0]), Vector3(1,2,3))]))
+		moved = TransformArray.identity(4)
+		moved.translation = np.array([1.,2,3])
+		self.assertTrue(moved.translation == Vector3Array(np.tile([1.,2,3], (4,1))))
+		self.assertTrue(trs != Vector3Array(translations))
+		with self.assertRaises(ValueError):
+			TransformArray(np.zeros((2,4,3)))
+			
+	def test01_multiply(self):
+		'''Checks one*many, many*one and many*many composition.'''
+		transforms = scalar_transforms()
+		ta = TransformArray(transforms)
+		single = transforms[0]
+		many = ta*ta.transpose
+		left = single*ta
+		right = ta*single
+		for i in range(count):
+			self.assertTrue(many[i] == transforms[i]*Transform(transforms[i].mat.T))
+			self.assertTrue(left[i] == single*transforms[i])
+			self.assertTrue(right[i] == transforms[i]*single)
+			
+	def test02_apply(self):
+		'''Checks transforming point buffers.'''
+		transforms = scalar_transforms()
+		ta = TransformArray(transforms)
+		paired = ta*Vector3Array(points)
+		one = ta[3:4].apply(points)
+		outer = ta.apply_outer(points)
+		for i in range(count):
+			self.assertTrue(paired[i] == transforms[i]*Vector3(points[i]))
+			self.assertTrue(one[i] == transforms[3]*Vector3(points[i]))
+			for j in range(0, count, 7):
+				self.assertTrue(Vector3(outer[i,j]) == transforms[i]*Vector3(points[j]))
+
+		point = np.array([1.,2,3])
+		self.assertTrue(TransformArray.identity(1).apply(point) == Vector3Array([point]))
+		self.assertTrue(ta.apply(point) == Vector3Array([t*Vector3(point) for t in transforms]))
+		self.assertEqual(ta.apply_outer(point).shape, (count,1,3))
+				
+	def test03_decomposition(self):
+		'''Checks batched inverse, translation, rotation and localScale.'''
+		transforms = scalar_transforms()
+		ta = TransformArray(transforms)
+		inverse = ta.inverse
+		for i in range(count):
+			self.assertTrue(inverse[i] == transforms[i].inverse)
+			self.assertTrue(ta.translation[i] == transforms[i].translation)
+			self.assertTrue(ta.localScale[i] == transforms[i].localScale)
+			self.assertTrue(ta.rotation[i] == transforms[i].rotation)
+		self.assertTrue(ta*inverse == TransformArray.identity(count))
+		
+if __name__ == 'main':
+	unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+import numpy as np
+from UnitAlg import *
+
+def random_transforms(count:int, rng:np.random.Generator):
+	return [
+		Transform.TRS(
+			Vector3(rng.uniform(-5,5,3)),
+			Quaternion.from_angle_axis(rng.uniform(0,3), Vector3(rng.uniform(-1,1,3))),
+			Vector3(rng.uniform(.5,2,3)))
+		for _ in range(count)
+	]
+
+def product(transforms):
+	m = Transform()
+	for t in transforms:
+		m = m*t
+	return m
+
+class TransformChainTests(unittest.TestCase):
+	def test00_fuse(self):
+		'''Checks the chain fuses to the product of its transforms.'''
+		rng = np.random.default_rng(0)
+		transforms = random_transforms(8, rng)
+		chain = TransformChain(transforms)
+		self.assertEqual(len(chain), 8)
+		self.assertTrue(chain.transform == product(transforms))
+		self.assertTrue(Transform(chain.mat) == product(transforms))
+		self.assertTrue(TransformChain().transform == Transform())
+		
+		chain = TransformChain()
+		for t in transforms:
+			chain.append(t)
+			self.assertTrue(chain.transform == product(transforms[0:len(chain)]))
+		self.assertTrue(chain[3] == transforms[3])
+		
+		o = Vector3(1,2,3)
+		q = Quaternion.from_angle_axis(1, Vector3(0,0,1))
+		chain = TransformChain([Transform.Translate(o*-1), Transform.Rotate(q), Transform.Translate(o)])
+		self.assertEqual(chain.transform.kind, TransformKind.rigid)
+		self.assertTrue(chain.transform == Transform.Rotate_about(q, o))
+		
+	def test01_update(self):
+		'''Checks changing single transforms, in any order, keeps the fused product right.'''
+		rng = np.random.default_rng(1)
+		transforms = random_transforms(10, rng)
+		chain = TransformChain(transforms)
+		chain.mat
+		for index in (9, 0, 0, 5, 4, 6, 6, 2, 9, -1, 3, 3, 0):
+			t = random_transforms(1, rng)[0]
+			transforms[index] = t
+			chain[index] = t
+			self.assertTrue(chain.transform == product(transforms), index)
+		
+		#updating the same transform only recomputes around it:
+		calls = []
+		class CountingList(list):
+			def __setitem__(self, i, v):
+				calls.append(i)
+				list.__setitem__(self, i, v)
+		chain._prefix = CountingList(chain._prefix)
+		chain._suffix = CountingList(chain._suffix)
+		chain[4] = transforms[4]
+		chain.mat
+		calls.clear()
+		chain[4] = random_transforms(1, rng)[0]
+		chain.mat
+		self.assertEqual(calls, [])
+		
+	def test02_apply(self):
+		'''Checks points are transformed by the whole chain at once.'''
+		rng = np.random.default_rng(2)
+		transforms = random_transforms(5, rng)
+		chain = TransformChain(transforms)
+		points = Vector3Array(rng.uniform(-10,10,(20,3)))
+		expected = product(transforms)
+		result = chain.apply(points)
+		self.assertTrue(isinstance(result, Vector3Array))
+		for i in range(len(points)):
+			self.assertTrue(result[i] == expected*points[i])
+		self.assertTrue(chain*points == result)
+		self.assertTrue(chain.apply(points.value) == result)
+		self.assertTrue(chain*points[3] == expected*points[3])
+		self.assertTrue(chain.apply(points.value[3]) == result[3:4])
+
+if __name__ == 'main':
+	unittest.main()
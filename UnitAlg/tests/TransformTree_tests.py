@@ -0,0 +1,101 @@
+import unittest
+import numpy as np
+from UnitAlg import *
+
+def random_local(rng:np.random.Generator):
+	return (
+		Vector3(rng.uniform(-5,5,3)),
+		Quaternion.from_angle_axis(rng.uniform(0,3), Vector3(rng.uniform(-1,1,3))),
+		Vector3(rng.uniform(.5,2,3)))
+
+def expected_world(node:TransformNode) -> Transform:
+	world = Transform.TRS(node.translation, node.rotation, node.localScale)
+	while node.parent is not None:
+		node = node.parent
+		world = Transform.TRS(node.translation, node.rotation, node.localScale) * world
+	return world
+
+def random_tree(count:int, rng:np.random.Generator) -> TransformTree:
+	tree = TransformTree(capacity=4)
+	for i in range(count):
+		parent = None if i == 0 or rng.uniform() < .1 else tree[int(rng.integers(0, i))]
+		tree.add(parent, *random_local(rng))
+	return tree
+
+class TransformTreeTests(unittest.TestCase):
+	def test00_worlds(self):
+		'''Checks lazy and bulk world matrices match multiplying up the tree.'''
+		rng = np.random.default_rng(0)
+		tree = random_tree(60, rng)
+		self.assertEqual(len(tree), 60)
+		for node in tree:
+			self.assertTrue(node.world == expected_world(node))
+			self.assertTrue(node.local == Transform.TRS(node.translation, node.rotation, node.localScale))
+		
+		tree = random_tree(60, rng)
+		worlds = tree.worlds
+		for node in tree:
+			self.assertTrue(worlds[node.index] == expected_world(node))
+		
+		root = tree.roots[0]
+		self.assertTrue(root.parent is None and root.depth == 0)
+		for child in root.children:
+			self.assertTrue(child.parent is root and child.depth == 1)
+			
+	def test01_dirty(self):
+		'''Checks changes only dirty the changed subtree, and are picked up by both update paths.'''
+		rng = np.random.default_rng(1)
+		tree = TransformTree()
+		a = tree.add()
+		b = tree.add(a)
+		c = tree.add(b)
+		d = tree.add(a)
+		tree.update()
+		self.assertFalse(np.any(tree._world_dirty[:len(tree)]))
+		
+		b.translation = Vector3(1,2,3)
+		self.assertEqual(tree._world_dirty[:len(tree)].tolist(), [False, True, True, False])
+		self.assertTrue(c.world == Transform.Translate(Vector3(1,2,3)))
+		self.assertEqual(tree._world_dirty[:len(tree)].tolist(), [False, False, False, False])
+		
+		a.rotation = Quaternion.from_angle_axis(1, Vector3(0,0,1))
+		a.localScale = Vector3(2,2,2)
+		self.assertTrue(all(tree._world_dirty[:len(tree)]))
+		tree.update()
+		for node in (a, b, c, d):
+			self.assertTrue(node.world == expected_world(node))
+		
+		tree = random_tree(200, rng)
+		tree.update()
+		for i in rng.integers(0, 200, 20):
+			tree[int(i)].local = Transform.TRS(*random_local(rng))
+		worlds = tree.worlds
+		for node in tree:
+			self.assertTrue(worlds[node.index] == expected_world(node))
+			
+	def test02_reparent(self):
+		'''Checks nodes can be moved between parents, but not under themselves.'''
+		tree = TransformTree()
+		a = tree.add(translation=Vector3(1,0,0))
+		b = tree.add(translation=Vector3(0,1,0))
+		c = tree.add(a, translation=Vector3(0,0,1))
+		e = tree.add(c)
+		self.assertTrue(e.world.translation == Vector3(1,0,1))
+		
+		c.parent = b
+		self.assertEqual(a.children, [])
+		self.assertEqual(b.children, [c])
+		self.assertTrue(e.world.translation == Vector3(0,1,1))
+		self.assertEqual(e.depth, 2)
+		
+		c.parent = None
+		self.assertEqual(e.depth, 1)
+		self.assertTrue(e.world.translation == Vector3(0,0,1))
+		
+		with self.assertRaises(ValueError):
+			c.parent = e
+		with self.assertRaises(ValueError):
+			c.parent = c
+
+if __name__ == 'main':
+	unittest.main()
@@ -3,6 +3,8 @@ import unittest
 
 from numpy.core.numeric import identity
 from UnitAlg import *
+import numpy as np
+import numpy.linalg as LA
 
 translations = [
 	Vector3(0,0,0),
@@ -193,5 +195,106 @@ class TransformTests(unittest.TestCase):
 				for t in translations:
 					test(Transform.TRS(t, q, s))
 					
+	def test05_out(self):
+		'''Checks the in place product and out= targets.'''
+		t1 = Transform.TRS(translations[2], rotations[4], scales[1])
+		t2 = Transform.TRS(translations[3], rotations[5], scales[2])
+		expected = t1*t2
+		out = Transform()
+		self.assertTrue(Transform.multiply(t1,t2,out=out) is out and out == expected)
+		
+		buffer = t1._mat
+		t1 *= t2
+		self.assertTrue(t1._mat is buffer and t1 == expected)
+		
+		v = Vector3(3,6,2)
+		expected = t2*v
+		self.assertTrue(t2.apply(v, out=v) is v and v == expected)
+		
+	def test06_cached_decomposition(self):
+		'''Checks the cached scale and rotation, and the directions read from the matrix.'''
+		def check(t:Transform):
+			q = Quaternion.from_rotation_matrix(t.mat[0:3,0:3] / LA.norm(t.mat[0:3,0:3], axis=0)).normalized
+			self.assertTrue(t.rotation == q or t.rotation == q*-1)
+			self.assertTrue(t.localScale == Vector3(LA.norm(t.mat[0:3,0:3], axis=0)))
+			for name in ('forward', 'back', 'up', 'down', 'right', 'left'):
+				self.assertTrue(getattr(t, name) == q*getattr(Vector3, name), name)
+		
+		for s in scales[0:2]:
+			for q in rotations:
+				check(Transform.TRS(translations[3], q, s))
+		
+		t = Transform.TRS(translations[3], rotations[4], scales[1])
+		check(t)
+		t.rotation.x = 5
+		t.localScale.x = 5
+		t.rotation_mat[0,0] = 5
+		check(t)
+		
+		t.rotation = rotations[5]
+		check(t)
+		t.localScale = Vector3(2,3,4)
+		check(t)
+		t.translation = Vector3(1,2,3)
+		check(t)
+		t.localScale = Vector3(2,2,2)
+		check(t)
+		t *= Transform.Rotate(rotations[6])
+		check(t)
+		Transform.multiply(Transform.Rotate(rotations[4]), Transform.Scale(Vector3(5,6,7)), out=t)
+		check(t)
+		t.mat = Transform.Rotate(rotations[6]).mat
+		check(t)
+		
+		CoordinateFrame.set(CoordinateFrame.Unity)
+		try:
+			check(t)
+		finally:
+			CoordinateFrame.set(CoordinateFrame.Normal_Math)
+		
+	def test07_kinds(self):
+		'''Checks the kind of matrix is tracked, and each kind's inverse.'''
+		T = Transform.Translate(translations[3])
+		R = Transform.Rotate(rotations[5])
+		S = Transform.Scale(scales[2])
+		self.assertEqual(Transform().kind, TransformKind.identity)
+		self.assertEqual(T.kind, TransformKind.translation)
+		self.assertEqual(R.kind, TransformKind.rigid)
+		self.assertEqual(Transform.TR(translations[3], rotations[5]).kind, TransformKind.rigid)
+		self.assertEqual(Transform.Rotate_about(rotations[5], translations[2]).kind, TransformKind.rigid)
+		self.assertEqual(S.kind, TransformKind.TRS)
+		self.assertEqual(Transform.TRS(translations[3], rotations[5], scales[2]).kind, TransformKind.TRS)
+		self.assertEqual((T*R*S).kind, TransformKind.TRS)
+		self.assertEqual((S*T).kind, TransformKind.TRS)
+		self.assertEqual((S*R).kind, TransformKind.affine)
+		self.assertEqual(Transform(np.identity(4)).kind, TransformKind.affine)
+		
+		projection = np.identity(4)
+		projection[3,2] = -1
+		P = Transform(projection)
+		self.assertEqual(P.kind, TransformKind.projective)
+		self.assertEqual((P*T).kind, TransformKind.projective)
+		
+		t = Transform()
+		t.translation = translations[2]
+		self.assertEqual(t.kind, TransformKind.translation)
+		t.rotation = rotations[4]
+		self.assertEqual(t.kind, TransformKind.rigid)
+		t *= S
+		self.assertEqual(t.kind, TransformKind.TRS)
+		
+		for t in (Transform(), T, R, S, T*R*S, S*R*T, R*S*R, P*T*R*S):
+			inverse = t.inverse
+			self.assertEqual(inverse.kind, t.kind)
+			self.assertTrue(inverse == Transform(LA.inv(t.mat)))
+			self.assertTrue(t*inverse == Transform())
+		
+		with self.assertRaises(LA.LinAlgError):
+			Transform.Scale(Vector3(1,0,1)).inverse
+		
+		t = Transform.conversion_from_to(CoordinateFrame.ROS_IMU, CoordinateFrame.Unity)
+		self.assertEqual(t.kind, TransformKind.rigid)
+		self.assertTrue(t*Vector3(0,0,-1) == Vector3(0,1,0))
+		
 if __name__ == 'main':
 	unittest.main()
\ No newline at end of file
@@ -0,0 +1,172 @@
+import math
+import unittest
+from UnitAlg import *
+import numpy as np
+
+rng = np.random.default_rng(42)
+a_values = rng.uniform(-10, 10, (50,3))
+b_values = rng.uniform(-10, 10, (50,3))
+axis_values = rng.uniform(-10, 10, (50,3))
+
+class Vector3ArrayTests(unittest.TestCase):
+	def test00_constructors(self):
+		'''
+		Tests that the constructors produce a Vector3Array
+		correctly, and as a copy of any passed data.
+		'''
+		_in = np.array([[1,2,3],[4,5,6]])
+		a = Vector3Array(_in)
+		_in[0,0] = 42
+		self.assertTrue(a._value.dtype == np.float64 and a._value.flags.c_contiguous)
+		self.assertTrue(a[0] == Vector3(1,2,3) and a[1] == Vector3(4,5,6))
+		
+		a = Vector3Array([Vector3(1,2,3), Vector3(4,5,6)])
+		self.assertTrue(a == Vector3Array([[1,2,3],[4,5,6]]))
+		self.assertTrue(len(Vector3Array([])) == 0)
+		
+		with self.assertRaises(ValueError):
+			Vector3Array(np.zeros((3,4)))
+			
+	def test01_indexing(self):
+		'''Checks indexing back to Vector3 and slicing.'''
+		a = Vector3Array(a_values)
+		v = a[3]
+		self.assertTrue(isinstance(v, Vector3) and v == Vector3(a_values[3]))
+		v.x = 1000
+		self.assertFalse(a[3] == v)
+		
+		a[3] = Vector3(1,2,3)
+		self.assertTrue(a[3] == Vector3(1,2,3))
+		self.assertTrue(isinstance(a[1:4], Vector3Array) and len(a[1:4]) == 3)
+		self.assertTrue([v for v in a] == a.to_list())
+		
+	def test02_matches_Vector3(self):
+		'''Checks every batch operation against the scalar Vector3 one.'''
+		a = Vector3Array(a_values)
+		b = Vector3Array(b_values)
+		axis = Vector3Array(axis_values)
+		
+		results = {
+			'add':a+b, 'sub':a-b, 'mul':a*b, 'scale':a*2.5, 'div':a/3, 'neg':-a,
+			'cross':Vector3Array.cross(a,b), 'lerp':Vector3Array.lerp(a,b,0.7),
+			'project':Vector3Array.project_point(a,b), 'normalized':a.normalized
+		}
+		dot = Vector3Array.dot(a,b)
+		angle = Vector3Array.angle(a,b)
+		signed = Vector3Array.signed_angle(a,b,axis)
+		signed2 = Vector3Array.signed_angle2(a,b,axis)
+		for i in range(len(a)):
+			v1, v2, ax = Vector3(a_values[i]), Vector3(b_values[i]), Vector3(axis_values[i])
+			self.assertTrue(results['add'][i] == v1+v2)
+			self.assertTrue(results['sub'][i] == v1-v2)
+			self.assertTrue(results['mul'][i] == v1*v2)
+			self.assertTrue(results['scale'][i] == v1*2.5)
+			self.assertTrue(results['div'][i] == v1/3)
+			self.assertTrue(results['neg'][i] == -v1)
+			self.assertTrue(results['cross'][i] == Vector3.cross(v1,v2))
+			self.assertTrue(results['lerp'][i] == Vector3.lerp(v1,v2,0.7))
+			self.assertTrue(results['project'][i] == Vector3.project_point(v1,v2))
+			self.assertTrue(results['normalized'][i] == v1.normalized)
+			self.assertTrue(math.isclose(dot[i], Vector3.dot(v1,v2)))
+			self.assertTrue(math.isclose(angle[i], Vector3.angle(v1,v2)))
+			self.assertTrue(math.isclose(signed[i], Vector3.signed_angle(v1,v2,ax)))
+			self.assertTrue(math.isclose(signed2[i], Vector3.signed_angle2(v1,v2,ax)))
+			self.assertTrue(math.isclose(a.magnitude[i], v1.magnitude))
+			self.assertTrue(math.isclose(a.sq_magnitude[i], v1.sq_magnitude))
+			self.assertTrue(math.isclose(Vector3Array.distance(a,b)[i], Vector3.distance(v1,v2)))
+			
+	def test03_broadcasting(self):
+		'''Checks mixing a Vector3Array with single Vector3s and per vector scalars.'''
+		a = Vector3Array(a_values)
+		v = Vector3(1,-2,3)
+		scales = np.arange(len(a), dtype=np.float64)
+		self.assertTrue(a+v == Vector3Array(a_values+v._value))
+		self.assertTrue(a*scales == Vector3Array(a_values*scales[:,None]))
+		self.assertTrue(Vector3Array.cross(a,v) == Vector3Array(np.cross(a_values, v._value)))
+		self.assertTrue(np.allclose(Vector3Array.dot(a,v), a_values @ v._value))
+		self.assertTrue(a_values+a == Vector3Array(a_values*2))
+		self.assertTrue(a*np.int64(2) == a*2 and a/np.float32(2) == a/2)
+
+		#comparing with other types is never equal:
+		self.assertFalse(a == None)
+		self.assertTrue(a != 5)
+		self.assertFalse(a == QuaternionArray.identity(len(a)))
+
+		#unsupported operands go through python's operator protocol, ending in a TypeError:
+		with self.assertRaises(TypeError):
+			a + 'a'
+		with self.assertRaises(TypeError):
+			object() * a
+		with self.assertRaises(ValueError):
+			Vector3Array.cross(a, 'a')
+		
+	def test04_in_place(self):
+		'''Checks the in place operators and normalize mutate the buffer.'''
+		a = Vector3Array(a_values)
+		buffer = a._value
+		a += Vector3Array(b_values)
+		a *= 2
+		a -= Vector3.one
+		self.assertTrue(a._value is buffer)
+		self.assertTrue(a == Vector3Array((a_values+b_values)*2-1))
+		a.normalize()
+		self.assertTrue(np.allclose(a.magnitude, 1))
+		
+	def test05_degenerate(self):
+		'''Checks zero normals give nan projections, like Vector3.project_point gives None.'''
+		a = Vector3Array([[1,2,3],[4,5,6]])
+		p = Vector3Array.project_point(a, Vector3Array([[0,0,0],[0,0,1]]))
+		self.assertTrue(np.all(np.isnan(p._value[0])))
+		self.assertTrue(p[1] == Vector3(0,0,6))
+
+	def test06_weld(self):
+		'''Checks welding points within tolerance, against brute force connected groups.'''
+		base = rng.uniform(-10, 10, (300,3))
+		points = np.concatenate([base, base + rng.uniform(-1e-4, 1e-4, (300,3)), base[:100]])
+		#a chain of points each within tolerance of the next, but not of the ends:
+		points = np.concatenate([points, [(20,20,20), (20.0009,20,20), (20.0018,20,20)]])
+		points = points[rng.permutation(len(points))]
+		unique, remap = Vector3Array.weld(points, 1e-3)
+		self.assertEqual(remap.shape, (len(points),))
+		self.assertTrue(np.all(np.abs(unique._value[remap] - points) <= 2e-3))
+
+		close = np.all(np.abs(points[:,None] - points[None]) <= 1e-3, axis=2)
+		groups = np.arange(len(points))
+		for _ in range(5):
+			groups = np.array([groups[row].min() for row in close])
+		self.assertEqual(len(unique), len(np.unique(groups)))
+		self.assertTrue(np.array_equal(remap[:,None] == remap[None], groups[:,None] == groups[None]))
+
+		#unique points are the first of their group, in order:
+		firsts = np.unique(remap, return_index=True)[1]
+		self.assertTrue(np.array_equal(unique._value, points[firsts]) and np.all(np.diff(firsts) > 0))
+
+		averaged, remap_averaged = Vector3Array.weld(points, 1e-3, average=True)
+		self.assertTrue(np.array_equal(remap, remap_averaged))
+		self.assertTrue(np.allclose(averaged._value[remap[0]], points[remap == remap[0]].mean(axis=0)))
+
+		#lists of Vector3, and exact de-duplication:
+		vectors = [Vector3(v) for v in base[:20]]*3
+		unique, remap = Vector3Array.weld(vectors, 0)
+		self.assertTrue(unique == Vector3Array(vectors[:20]))
+		self.assertTrue(np.array_equal(remap, np.tile(np.arange(20), 3)))
+		self.assertEqual(len(Vector3Array.weld(np.empty((0,3)))[0]), 0)
+		with self.assertRaises(ValueError):
+			Vector3Array.weld(points, -1)
+
+		#many points per cell, in two clusters more than tolerance apart:
+		packed = np.concatenate([rng.uniform(0, 2, (3000,3)), rng.uniform(3.5, 5, (3000,3))])
+		unique, remap = Vector3Array.weld(packed, 1.0)
+		self.assertEqual(len(unique), 2)
+		self.assertTrue(np.all(remap[:3000] == 0) and np.all(remap[3000:] == 1))
+
+		#cells on both sides of the origin, (-1,-1,0) and (1,1,0) must stay apart:
+		unique, remap = Vector3Array.weld([Vector3(-0.5,-0.5,0), Vector3(1.5,1.5,0)], 1.0)
+		self.assertEqual(len(unique), 2)
+		mirrored = np.concatenate([points, -points, points*(-1,1,-1)])
+		unique, remap = Vector3Array.weld(mirrored, 1e-3)
+		self.assertTrue(np.array_equal(remap[:len(points)], Vector3Array.weld(points, 1e-3)[1]))
+		self.assertTrue(np.all(np.abs(unique._value[remap] - mirrored) <= 2e-3))
+
+if __name__ == 'main':
+	unittest.main()
@@ -221,6 +221,33 @@ class Vector3Tests(unittest.TestCase):
 		v2 = Vector3(10,3,-12.4)
 		self.assertTrue(lerp(v1,v2,t) == Vector3.lerp(v1,v2,t))
 		
+	def test12_in_place(self):
+		'''Checks the in place operators and out= targets write into the existing vector.'''
+		v = Vector3(1,2,3)
+		buffer = v._value
+		v += Vector3(1,1,1)
+		v -= Vector3(0,1,0)
+		v *= 2
+		v *= Vector3(1,2,1)
+		v /= 4
+		self.assertTrue(v._value is buffer and v == Vector3(1,2,2))
+		
+		v1 = Vector3(3,-1,7)
+		v2 = Vector3(1,2,9)
+		out = Vector3(0,0,0)
+		self.assertTrue(Vector3.cross(v1,v2,out=out) is out and out == Vector3.cross(v1,v2))
+		expected = Vector3.cross(v1,v2)
+		Vector3.cross(v1,v2,out=v1)
+		self.assertTrue(v1 == expected)
+		
+		v1 = Vector3(3,8,-1)
+		v2 = Vector3(10,3,-12.4)
+		self.assertTrue(Vector3.lerp(v1,v2,0.359,out=out) is out and out == Vector3.lerp(v1,v2,0.359))
+		
+		v = Vector3(4,2,-1)
+		self.assertTrue(v.normalize(out=out) is out and out == v.normalized)
+		self.assertTrue(v == Vector3(4,2,-1))
+		
 if __name__ == 'main':
 	unittest.main()
 		
\ No newline at end of file